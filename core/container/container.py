@@ -57,6 +57,7 @@ class Container(DBObject):
         ('size', DBObject.DataType.INT),
     ]
     PRIMARY = 'uuid'
+    INDEXES = ['parent']
 
     class Tag(Flag):
         '''Tag flag values
@@ -98,15 +99,14 @@ class Container(DBObject):
         self._path = path
         self._original_path = original_path
         self._slug = slugify(name)
+        self._magic_file = magic_file
         # computed once
         self._uuid = uuid4()
+        # computed lazily, on first access
         self._size = None
-        guesser = FileTypeGuesser(magic_file=magic_file)
-        self._mime_text = guesser.mime_text(self._path)
-        self._mime_type = guesser.mime_type(self._path)
-        if self._path is not None:
-            stat = self._path.stat()
-            self._size = stat.st_size
+        self._mime_type = None
+        self._mime_text = None
+        self._guessed = False
 
     def __str__(self):
         '''String representation of the object
@@ -140,18 +140,47 @@ class Container(DBObject):
     def uuid(self):
         return self._uuid
 
+    @property
+    def virtual(self):
+        '''True if container content is read from another container instead
+        of a file of its own
+        '''
+        return False
+
     @property
     def size(self):
+        if self._size is None and self._path is not None:
+            self._size = self._path.stat().st_size
         return self._size
 
     @property
     def mime_type(self):
+        self._guess()
         return self._mime_type
 
     @property
     def mime_text(self):
+        self._guess()
         return self._mime_text
 
+    def _guess(self):
+        '''Guesses MIME type and description once
+        '''
+        if not self._guessed:
+            guesser = FileTypeGuesser(magic_file=self._magic_file)
+            (self._mime_type, self._mime_text) = guesser.guess(self._path)
+            self._guessed = True
+
+    def load_metadata(self):
+        '''Computes lazy metadata (size, MIME type and description) now
+
+        Workers call this method once a task is performed so that metadata
+        is computed in parallel rather than when the orchestrator persists
+        the container.
+        '''
+        self._guess()
+        return self.size
+
     def _source(self):
         '''Creates a document (dict) which can be used by any DatabaseConnector
 
@@ -165,10 +194,10 @@ class Container(DBObject):
             'parent': self._parent.urn,
             'path': str(self._path),
             'original_path': str(self._original_path),
-            'mime_type': self._mime_type,
-            'mime_text': self._mime_text,
+            'mime_type': self.mime_type,
+            'mime_text': self.mime_text,
             'slug': self._slug,
-            'size': self._size
+            'size': self.size
         }
 
     def from_db(self, _source):
@@ -185,6 +214,7 @@ class Container(DBObject):
         self._original_path = Path(_source['original_path'])
         self._mime_type = _source['mime_type']
         self._mime_text = _source['mime_text']
+        self._guessed = True
         self._slug = _source['slug']
         self._size = _source['size']
 
@@ -220,3 +250,14 @@ class Container(DBObject):
             [BinFile] -- New instance of binary file
         '''
         return BinFile(self._path, BinFile.OpenMode.READ)
+
+    def shared_bin_file(self):
+        '''Returns the read-only binary file of the container shared by all
+        its users in this process, see BinFile.shared()
+
+        Shared file shall only be read using positional reads.
+
+        Returns:
+            [BinFile] -- Opened shared binary file or None
+        '''
+        return BinFile.shared(self._path)
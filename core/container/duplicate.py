@@ -0,0 +1,109 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: duplicate.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from uuid import UUID
+from core.db.object import DBObject
+from helper.logging.logger import Logger
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Duplicate(DBObject):
+    '''Represents a container whose content is identical to an already
+    processed container
+
+    Dissection and examination results of the original container apply to
+    the duplicate, which is not processed again.
+    '''
+    INDEX = 'duplicate'
+    FIELDS = [
+        ('container_uuid', DBObject.DataType.STRING),
+        ('original_uuid', DBObject.DataType.STRING),
+        ('digest', DBObject.DataType.STRING),
+    ]
+    PRIMARY = 'container_uuid'
+    INDEXES = ['original_uuid']
+
+    def __init__(self, container_uuid=None, original_uuid=None, digest=None):
+        '''Constructs the object
+
+        Keyword Arguments:
+            container_uuid {UUID} -- Duplicate container (default: {None})
+            original_uuid {UUID} -- Processed container (default: {None})
+            digest {str} -- Content digest (default: {None})
+        '''
+        super().__init__()
+        self._container_uuid = container_uuid
+        self._original_uuid = original_uuid
+        self._digest = digest
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "Duplicate(container_uuid={},original_uuid={})".format(self._container_uuid,
+                                                                      self._original_uuid)
+
+    @property
+    def container_uuid(self):
+        return self._container_uuid
+
+    @property
+    def original_uuid(self):
+        return self._original_uuid
+
+    @property
+    def digest(self):
+        return self._digest
+
+    def _source(self):
+        '''Creates a document (dict) which can be used by any DatabaseConnector
+
+        Creates a dict which contains all persistent properties of an object.
+
+        Returns:
+            {dict} -- [description]
+        '''
+        return {
+            'container_uuid': self._container_uuid.urn,
+            'original_uuid': self._original_uuid.urn,
+            'digest': self._digest
+        }
+
+    def from_db(self, _source):
+        '''Loads a document (dict) which is returned by any DatabaseConnector
+
+        Loads all persistent properties of an object from a dict.
+
+        Arguments:
+            _source {dict} -- [description]
+        '''
+        self._container_uuid = UUID(_source['container_uuid'])
+        self._original_uuid = UUID(_source['original_uuid'])
+        self._digest = _source['digest']
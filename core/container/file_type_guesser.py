@@ -27,16 +27,23 @@
 # =============================================================================
 from magic import Magic
 from pathlib import Path
+from threading import local
 from helper.logging.logger import Logger
 # =============================================================================
 #  GLOBALS
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+# Magic handles are expensive to create (magic database is loaded and
+# compiled) and cannot be shared between threads: they are cached per
+# thread and per (magic_file, mime) pair
+HANDLES = local()
 # =============================================================================
 #  CLASSES
 # =============================================================================
 class FileTypeGuesser:
     '''Guess file MIME type from content using a magic file'''
+    HEADER_SIZE = 1024 * 1024
+
     def __init__(self, magic_file=None):
         '''[summary]
 
@@ -50,27 +57,81 @@ class FileTypeGuesser:
 
         self.magic_file = magic_file
 
-    def mime_text(self, path):
-        '''Returns a textual description of the MIME type.
+    def _magic(self, mime):
+        '''Returns the cached Magic handle of the current thread
+        '''
+        handles = getattr(HANDLES, 'handles', None)
+        if handles is None:
+            handles = HANDLES.handles = {}
+
+        key = (self.magic_file, mime)
+        handle = handles.get(key)
+        if handle is None:
+            LGR.debug("Loading magic database: {}".format(key))
+            handle = handles[key] = Magic(magic_file=self.magic_file, mime=mime)
+
+        return handle
+
+    def guess_buffer(self, data):
+        '''Returns MIME type and textual description of given data
+
+        Arguments:
+            data {bytes} -- Beginning of the data to analyze
+
+        Returns:
+            tuple -- (mime_type, mime_text)
+        '''
+        return (self._magic(True).from_buffer(data),
+                self._magic(False).from_buffer(data))
+
+    def guess(self, path):
+        '''Returns MIME type and textual description of a file reading its
+        header only once.
 
         Arguments:
             path {Path} -- Path of the file to analyze
+
+        Returns:
+            tuple -- (mime_type, mime_text), (None, None) if path is not a
+                     regular file
         '''
         if not path.is_file():
-            return None
+            return (None, None)
 
-        magic = Magic(magic_file=self.magic_file)
-        return magic.from_file(str(path))
+        with path.open('rb') as f:
+            data = f.read(FileTypeGuesser.HEADER_SIZE)
 
-    def mime_type(self, path):
-        '''Returns a MIME description of the MIME type.
+        return self.guess_buffer(data)
+
+    def guess_many(self, paths):
+        '''Classifies many files reusing the same magic handles
+
+        Arguments:
+            paths {iterable(Path)} -- Paths of the files to analyze
+
+        Yields:
+            tuple -- (path, mime_type, mime_text)
+        '''
+        for path in paths:
+            try:
+                (mime_type, mime_text) = self.guess(path)
+            except OSError as e:
+                LGR.warning("Failed to read {}: {}".format(path, e))
+                (mime_type, mime_text) = (None, None)
+            yield (path, mime_type, mime_text)
+
+    def mime_text(self, path):
+        '''Returns a textual description of the MIME type.
 
         Arguments:
             path {Path} -- Path of the file to analyze
         '''
-        if not path.is_file():
-            return None
+        return self.guess(path)[1]
 
-        magic = Magic(magic_file=self.magic_file, mime=True)
-        return magic.from_file(str(path))
+    def mime_type(self, path):
+        '''Returns a MIME description of the MIME type.
 
+        Arguments:
+            path {Path} -- Path of the file to analyze
+        '''
+        return self.guess(path)[0]
@@ -0,0 +1,118 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: virtual_container.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from helper.extent_file import ExtentFile
+from helper.logging.logger import Logger
+from core.container.container import Container
+from core.container.file_type_guesser import FileTypeGuesser
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class VirtualContainer(Container):
+    '''VirtualContainer class
+
+    Container whose content is read on demand from its parent container
+    (extents of the parent data) or from a file object given by a dissector,
+    hence it does not need to be extracted to disk.
+
+    Its path is virtual: parent path joined with container name.
+    '''
+    def __init__(self,
+                 name,
+                 parent,
+                 extents=None,
+                 opener=None,
+                 magic_file=None):
+        '''Constructs the object
+
+        Arguments:
+            name {str} -- [description]
+            parent {Container} -- Container holding the data
+
+        Keyword Arguments:
+            extents {list(tuple)} -- (offset, length) extents within parent
+                                     data, see ExtentFile (default: {None})
+            opener {callable} -- Returns a binary file object, used instead
+                                 of parent data, it must be picklable
+                                 (default: {None})
+            magic_file {str} -- [description] (default: {None})
+        '''
+        if extents is None and opener is None:
+            raise ValueError("extents or opener must be given")
+
+        super().__init__(name=name,
+                         path=parent.path.joinpath(name),
+                         parent=parent.uuid,
+                         original_path=parent.original_path.joinpath(name),
+                         magic_file=magic_file)
+        self._container = parent
+        self._extents = extents
+        # containers carved from the same parent read it through a single
+        # file descriptor
+        self._opener = opener or parent.shared_bin_file
+
+    @property
+    def virtual(self):
+        return True
+
+    @property
+    def size(self):
+        if self._size is None:
+            self._size = self.bin_file().size()
+        return self._size
+
+    def _guess(self):
+        '''Guesses MIME type and description once, from the header of the
+        container data
+        '''
+        if not self._guessed:
+            guesser = FileTypeGuesser(magic_file=self._magic_file)
+            with self.bin_file() as bf:
+                data = bf.read(FileTypeGuesser.HEADER_SIZE, 0)
+            (self._mime_type, self._mime_text) = guesser.guess_buffer(data)
+            self._guessed = True
+
+    def bin_file(self):
+        '''Opens a read-only file reading container data
+
+        Returns:
+            [ExtentFile] -- New instance of extent file
+        '''
+        return ExtentFile(self._opener, self._extents)
+
+    def shared_bin_file(self):
+        '''Opens a read-only file reading container data, its source is
+        shared: see Container.shared_bin_file()
+
+        Returns:
+            [ExtentFile] -- New instance of extent file
+        '''
+        return self.bin_file()
@@ -25,15 +25,21 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
-from os import walk
+from os import scandir
+from pathlib import Path
 from asyncio import Lock
 from plugins.plugins import PLUGINS
 from core.db.database import Database
+from core.hash.prefilter import Prefilter
+from core.hash.hash_set import HashSet
+from core.hash.hash_cache import HashCache
 from helper.exception import DatabaseInitializationException
 from helper.logging.logger import Logger
+from helper.block_cache import configure as configure_block_cache
 from core.orchestration.task import Task
 from core.container.container import Container
 from core.orchestration.worker import Worker
+from core.orchestration.local_worker import LocalWorker
 from core.plugin.plugin_selector import PluginSelector
 from helper.filtering.path_filter import PathFilter
 from core.orchestration.orchestrator import Orchestrator
@@ -51,23 +57,53 @@ class Datashark:
     '''
     @staticmethod
     def scan_dir(path, recurse, include, exclude):
-        '''Scans recursively a directory and returns a list of all path
+        '''Scans a directory and yields paths of all files it contains
+
+        Directory entries are read using os.scandir() which gives file type
+        information without any additional system call. Root path is resolved
+        once, only symbolic links need to be resolved individually. Symbolic
+        links to directories are not followed to prevent loops.
 
         Arguments:
-            path {[type]} -- [description]
-            recurse {[type]} -- [description]
+            path {Path} -- directory to scan
+            recurse {bool} -- scan subdirectories as well
+            include {list} -- patterns of paths to keep
+            exclude {list} -- patterns of paths to drop
         '''
         LGR.info("Scanning {} for files...".format(path))
 
         keep = PathFilter(include, exclude)
 
-        if recurse:
-            files = [f.resolve() for f in path.glob('**/*') if f.is_file() and keep(f)]
-        else:
-            files = [f.resolve() for f in path.glob('*') if f.is_file() and keep(f)]
-
-        LGR.info("Scan completed! ({} files)".format(len(files)))
-        return files
+        count = 0
+        stack = [str(path.resolve())]
+        while stack:
+            directory = stack.pop()
+            try:
+                with scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recurse:
+                                    stack.append(entry.path)
+                                continue
+
+                            if not entry.is_file():
+                                continue
+                        except OSError as e:
+                            LGR.warning("Failed to stat {}: {}".format(entry.path, e))
+                            continue
+
+                        file = Path(entry.path)
+                        if entry.is_symlink():
+                            file = file.resolve()
+
+                        if keep(file):
+                            count += 1
+                            yield file
+            except OSError as e:
+                LGR.warning("Failed to scan {}: {}".format(directory, e))
+
+        LGR.info("Scan completed! ({} files)".format(count))
 
     def __init__(self, conf):
         '''[summary]
@@ -79,6 +115,10 @@ class Datashark:
         '''
         self.lock = Lock()
         self.conf = conf
+        self.hash_cache = None
+        self.prefilter = None
+        self.whitelist_index = None
+        self.blacklist_index = None
         self.orchestrator = None
 
     async def _init_db(self, conf_key, read_only):
@@ -98,21 +138,99 @@ class Datashark:
             raise DatabaseInitializationException("Failed to instanciate "
                                                   "connector. Details above.")
 
-        db = Database(conn)
+        db = Database(conn,
+                      batch_size=db_conf.get('batch_size', 1000),
+                      flush_interval=db_conf.get('flush_interval', 1.0))
         if not await db.init():
             raise DatabaseInitializationException("Failed to initialize "
                                                   "database. Details above.")
 
         return db
 
+    def _init_hash_cache(self):
+        '''Creates the hash cache if enabled
+
+        Cache is stored alongside hash database unless hash_cache_path is
+        given.
+        '''
+        if not self.conf.get('hash_cache', False):
+            return None
+
+        path = self.conf.get('hash_cache_path')
+        if path is None:
+            settings = self.conf.get('hash_db_conf', {}).get('settings') or {}
+            if settings.get('path') is None:
+                LGR.warning("hash_cache_path is required when hash database "
+                            "is not file-based, hash cache disabled.")
+                return None
+            path = '{}.cache'.format(settings['path'])
+
+        return HashCache(path, self.conf.get('hash_cache_verify', False))
+
+    def _init_prefilter(self):
+        '''Creates the prefilter used to check containers against blacklist
+        and whitelist databases if an index is configured
+        '''
+        path = self.conf.get('prefilter_index')
+        if path is None or not self.conf.check_black_or_white:
+            return None
+
+        return Prefilter(path, self.hash_cache)
+
+    def _init_hash_set(self, key):
+        '''Loads the index of a blacklist or whitelist database if configured
+        '''
+        settings = self.conf.get(key)
+        if settings is None or not self.conf.check_black_or_white:
+            return None
+
+        return HashSet(settings['path'],
+                       settings.get('field'),
+                       settings.get('source')).load()
+
     async def _process_tasks(self, tasks):
-        '''[summary]
+        '''Processes tasks using the orchestrator
 
-        [description]
+        Arguments:
+            tasks {iterable} -- tasks to process, consumed incrementally by
+                                the orchestrator
         '''
         async with self.lock:
-            await self.orchestrator.schedule_tasks(tasks)
-            await self.orchestrator.process_tasks()
+            await self.orchestrator.process_tasks(tasks)
+
+    def _iter_files(self, path, recurse, include, exclude):
+        '''Yields path itself or files found in it if path is a directory
+        '''
+        if path.is_dir():
+            yield from self.scan_dir(path, recurse, include, exclude)
+        else:
+            yield path
+
+    def _iter_tasks(self, files, category):
+        '''Yields tasks of given category for each file, preceded by a
+        hashing task when containers must be checked against blacklist and
+        whitelist databases first.
+
+        Checked tasks are scheduled by the orchestrator once the hashing task
+        tagged their container.
+        '''
+        for file in files:
+            plugin = self.hash_cache if category == Task.Category.HASHING else None
+            task = Task(category,
+                        plugin,
+                        Container(name=file.name,
+                                  path=file,
+                                  original_path=file))
+
+            if category != Task.Category.HASHING and self.conf.check_black_or_white:
+                task = Task(Task.Category.HASHING,
+                            self.prefilter or self.hash_cache,
+                            Container(name=file.name,
+                                      path=file,
+                                      original_path=file),
+                            then=task)
+
+            yield task
 
     async def init(self):
         '''[summary]
@@ -124,10 +242,20 @@ class Datashark:
         self.conf['max_workers'] = max_workers
         worker_category = self.conf.get('worker_category', 'local')
         self.conf['worker_category'] = Worker.Category(worker_category)
+        local_worker_mode = self.conf.get('local_worker_mode', 'process')
+        self.conf['local_worker_mode'] = LocalWorker.Mode(local_worker_mode)
         dissect_and_examine = self.conf.get('dissect_and_examine', False)
         self.conf['dissect_and_examine'] = dissect_and_examine
         check_black_or_white = self.conf.get('check_black_or_white', False)
         self.conf['check_black_or_white'] = check_black_or_white
+        fused_pipeline = self.conf.get('fused_pipeline', False)
+        self.conf['fused_pipeline'] = fused_pipeline
+        deduplicate = self.conf.get('deduplicate', False)
+        self.conf['deduplicate'] = deduplicate
+        # configure block cache before worker processes are forked
+        configure_block_cache(self.conf.get('block_cache'))
+        max_pending_tasks = self.conf.get('max_pending_tasks', 1024)
+        self.conf['max_pending_tasks'] = max_pending_tasks
         # initialize databases
         try:
             self.hash_db = await self._init_db('hash_db_conf',
@@ -146,6 +274,17 @@ class Datashark:
             LGR.exception("An exception occured while initializing databases. "
                           "Details below.")
             return False
+        # create hash cache
+        self.hash_cache = self._init_hash_cache()
+        self.prefilter = self._init_prefilter()
+        # load blacklist and whitelist indexes
+        try:
+            self.whitelist_index = self._init_hash_set('whitelist_index')
+            self.blacklist_index = self._init_hash_set('blacklist_index')
+        except (OSError, ValueError) as e:
+            LGR.exception("An exception occured while loading hash sets. "
+                          "Details below.")
+            return False
         # create orchestrator
         self.orchestrator = Orchestrator(self.conf,
                                          self.hash_db,
@@ -153,7 +292,9 @@ class Datashark:
                                          self.whitelist_db,
                                          self.blacklist_db,
                                          self.dissection_db,
-                                         self.examination_db)
+                                         self.examination_db,
+                                         self.whitelist_index,
+                                         self.blacklist_index)
         return True
 
     async def term(self):
@@ -181,17 +322,9 @@ class Datashark:
 
         [description]
         '''
-        files = [ path ]
-        if path.is_dir():
-            files = self.scan_dir(path, recurse, include, exclude)
-
-        tasks = [Task(Task.Category.HASHING,
-                      None,
-                      Container(name=file.name,
-                                path=file,
-                                original_path=file)) for file in files]
-
-        await self._process_tasks(tasks)
+        files = self._iter_files(path, recurse, include, exclude)
+        await self._process_tasks(self._iter_tasks(files,
+                                                   Task.Category.HASHING))
 
     async def dissect(self,
                       path,
@@ -202,25 +335,12 @@ class Datashark:
 
         [description]
         '''
-        files = [ path ]
-        if path.is_dir():
-            files = self.scan_dir(path, recurse, include, exclude)
+        category = Task.Category.DISSECTOR_SELECTION
+        if self.conf.fused_pipeline:
+            category = Task.Category.DISSECTION_PIPELINE
 
-        tasks = []
-        if self.conf.check_black_or_white:
-            tasks += [Task(Task.Category.HASHING,
-                           None,
-                           Container(name=file.name,
-                                     path=file,
-                                     original_path=file)) for file in files]
-
-        tasks += [Task(Task.Category.DISSECTOR_SELECTION,
-                       None,
-                       Container(name=file.name,
-                                 path=file,
-                                 original_path=file)) for file in files]
-
-        await self._process_tasks(tasks)
+        files = self._iter_files(path, recurse, include, exclude)
+        await self._process_tasks(self._iter_tasks(files, category))
 
     async def examine(self,
                       path,
@@ -231,22 +351,6 @@ class Datashark:
 
         [description]
         '''
-        files = [ path ]
-        if path.is_dir():
-            files = self.scan_dir(path, recurse, include, exclude)
-
-        tasks = []
-        if self.conf.check_black_or_white:
-            tasks += [Task(Task.Category.HASHING,
-                           None,
-                           Container(name=file.name,
-                                     path=file,
-                                     original_path=file)) for file in files]
-
-        tasks += [Task(Task.Category.EXAMINER_SELECTION,
-                      None,
-                      Container(name=file.name,
-                                path=file,
-                                original_path=file)) for file in files]
-
-        await self._process_tasks(tasks)
+        files = self._iter_files(path, recurse, include, exclude)
+        await self._process_tasks(self._iter_tasks(files,
+                                                   Task.Category.EXAMINER_SELECTION))
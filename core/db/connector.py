@@ -53,6 +53,13 @@ class DatabaseConnector(PluginInstance):
         '''
         return "DatabaseConnector(name={})".format(self.name)
 
+    def __reduce__(self):
+        '''Pickling support
+
+        See PluginInstance.__reduce__() for details
+        '''
+        return (self.__class__, (self.conf, self.read_only))
+
     async def connect(self):
         '''Connects the program to the database
         '''
@@ -83,12 +90,24 @@ class DatabaseConnector(PluginInstance):
         '''Retrieves an object from the database
 
         Arguments:
-            query {dict} -- Dict representation of a query which can be
-                            interpreted by the underlying database connector
-                            subclass to retrieve an object.
+            query {DBQuery} -- Query compiled natively by the underlying
+                               database connector subclass.
         Returns:
-            {list} - list of dicts being retrieved objects
+            {list} - list of dicts mapping selected fields to their values
         '''
         raise NotImplementedError("DatabaseConnector subclasses must implement"
                                   " retrieve() method.")
 
+    async def retrieve_many(self, queries):
+        '''Retrieves objects matching each query
+
+        Subclasses may override this method to pipeline queries, queries are
+        performed one after the other by default.
+
+        Arguments:
+            queries {list} -- DBQuery instances
+        Returns:
+            {list} - list of retrieve() results, in queries order
+        '''
+        return [await self.retrieve(query) for query in queries]
+
@@ -26,6 +26,8 @@
 #  IMPORTS
 # =============================================================================
 from enum import Enum
+from time import time
+from asyncio import Lock, sleep, ensure_future
 from core.db.object import DBObject
 from helper.logging.logger import Logger
 # =============================================================================
@@ -38,18 +40,45 @@ LGR = Logger(Logger.Category.CORE, __name__)
 class Database:
     '''[summary]
 
-    [description]
+    Persisted objects are buffered and handed over to the connector in
+    batches, either when the buffer holds batch_size objects or when
+    flush_interval seconds elapsed since last flush.
     '''
-    def __init__(self, connector):
+    def __init__(self, connector, batch_size=1, flush_interval=None):
         '''[summary]
 
         [description]
 
         Arguments:
             connector {DatabaseConnector} -- [description]
+
+        Keyword Arguments:
+            batch_size {int} -- Number of buffered objects triggering a
+                                flush (default: {1})
+            flush_interval {float} -- Max number of seconds an object stays
+                                      in the buffer (default: {None})
         '''
         self.connector = connector
         self.connected = False
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.lock = Lock()
+        self.flusher = None
+        self.last_flush = time()
+
+    async def _flush_periodically(self):
+        '''Flushes buffered objects every flush_interval seconds
+        '''
+        while True:
+            await sleep(self.flush_interval)
+            if time() - self.last_flush < self.flush_interval:
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                # objects are kept in the buffer, next flush retries
+                LGR.exception("Periodic flush failed.")
 
     async def init(self):
         '''[summary]
@@ -57,6 +86,10 @@ class Database:
         [description]
         '''
         self.connected = await self.connector.connect()
+
+        if self.connected and self.flush_interval and self.batch_size > 1:
+            self.flusher = ensure_future(self._flush_periodically())
+
         return self.connected
 
     async def term(self):
@@ -64,37 +97,89 @@ class Database:
 
         [description]
         '''
-        await self.connector.disconnect()
-        self.connected = False
+        if self.flusher is not None:
+            self.flusher.cancel()
+            self.flusher = None
+
+        try:
+            await self.flush()
+        finally:
+            await self.connector.disconnect()
+            self.connected = False
+
+    async def flush(self):
+        '''Hands buffered objects over to the connector
+
+        Objects are put back in the buffer if persistence fails.
+
+        Returns:
+            {bool} - True if persitence succeeded, False otherwise
+        '''
+        async with self.lock:
+            self.last_flush = time()
+
+            if not self.buffer:
+                return True
+
+            objects, self.buffer = self.buffer, []
+            LGR.debug("Flushing {} objects.".format(len(objects)))
+            persisted = False
+            try:
+                persisted = await self.connector.persist(objects)
+            finally:
+                if not persisted:
+                    # objects buffered while persisting come after these
+                    self.buffer = objects + self.buffer
+            return persisted
 
     async def persist(self, objs):
         '''Persists one or more objects
 
+        Objects are serialized immediately but persisted on next flush.
+
         See DatabaseConnector.persist() for details
         '''
         if not isinstance(objs, list):
             objs = [objs]
 
-        objects = []
         for obj in objs:
             if isinstance(obj, DBObject):
-                objects.append(obj.to_db())
+                self.buffer.append(obj.to_db())
             else:
                 raise ValueError("Database can only persists subclasses of "
                                  "DBObject instances.")
 
-        return await self.connector.persist(objects)
+        if len(self.buffer) >= self.batch_size:
+            return await self.flush()
+
+        return True
 
     async def retrieve(self, query):
         '''Retrieves one or more objects
 
+        Buffered objects are flushed first.
+
         See DatabaseConnector.retrieve() for details
         '''
+        await self.flush()
         return await self.connector.retrieve(query)
 
+    async def retrieve_many(self, queries):
+        '''Retrieves objects matching each query
+
+        Buffered objects are flushed first.
+
+        See DatabaseConnector.retrieve_many() for details
+        '''
+        await self.flush()
+        return await self.connector.retrieve_many(queries)
+
     async def delete(self, query):
         '''Deletes one or more objects
 
+        Buffered objects are flushed first.
+
         See DatabaseConnector.delete() for details
         '''
+        await self.flush()
         return await self.connector.delete(query)
@@ -61,6 +61,9 @@ class DBObject:
         FLOAT = 'float'
         STRING = 'string'
 
+    # fields frequently used to retrieve objects, connectors index them
+    INDEXES = []
+
     def _source(self):
         '''Creates dict which can be used by any DatabaseConnector
 
@@ -91,6 +94,9 @@ class DBObject:
             + INDEX:    object name to be used as index/table name
             + FIELDS:   object fields in source with associated DBObject.DataType
             + PRIMARY:  object primary field (unique key)
+
+        DBObject subclasses may define:
+            + INDEXES:  object fields to be indexed by the database
         '''
         for constant in DBObject.EXPECTED_CONSTANTS:
             if not constant in dir(self):
@@ -101,7 +107,8 @@ class DBObject:
             '_meta': {
                 'index': self.INDEX,
                 'fields': self.FIELDS,
-                'primary': self.PRIMARY
+                'primary': self.PRIMARY,
+                'indexes': self.INDEXES
             },
             '_source': self._source()
         }
@@ -25,6 +25,7 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from enum import Enum
 from helper.logging.logger import Logger
 # =============================================================================
 #  GLOBALS / CONFIG
@@ -34,6 +35,116 @@ LGR = Logger(Logger.Category.CORE, 'query')
 #  CLASSES
 # =============================================================================
 class DBQuery:
+    '''DBQuery class
 
-    def __init__(self):
-        pass
+    Describes a query on objects of a DBObject subclass, independently of the
+    underlying database. Each DatabaseConnector compiles it natively (see
+    core.db.sql for SQL databases).
+
+    Filters are AND-ed, fields are checked against the FIELDS of the queried
+    class. Methods return the query itself so that calls can be chained:
+
+        DBQuery(Container).where(parent=uuid).order_by('size').limit(10)
+    '''
+    class Operator(Enum):
+        '''Filter operators
+        '''
+        EQ = '='
+        IN = 'IN'
+        GE = '>='
+        GT = '>'
+        LE = '<='
+        LT = '<'
+
+    def __init__(self, object_class):
+        '''Constructs the object
+
+        Arguments:
+            object_class {type} -- Queried DBObject subclass
+        '''
+        self.object_class = object_class
+        self.filters = []
+        self.fields = []
+        self.ordering = []
+        self.count = None
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "DBQuery(index={},filters={},fields={},ordering={},count={})".format(
+                    self.index,
+                    [(f, op.value, v) for f, op, v in self.filters],
+                    self.fields,
+                    self.ordering,
+                    self.count)
+
+    @property
+    def index(self):
+        return self.object_class.INDEX
+
+    @property
+    def field_names(self):
+        return [name for name, _ in self.object_class.FIELDS]
+
+    @property
+    def projection(self):
+        '''Returns selected fields, all fields if none were selected
+        '''
+        return self.fields or self.field_names
+
+    def _check(self, field):
+        if field not in self.field_names:
+            raise ValueError("{} has no field named {}".format(self.index,
+                                                               field))
+
+    def where(self, **values):
+        '''Adds equality filters: field=value
+        '''
+        for field, value in values.items():
+            self._check(field)
+            self.filters.append((field, DBQuery.Operator.EQ, value))
+        return self
+
+    def where_in(self, field, values):
+        '''Adds a membership filter: field value is one of values
+        '''
+        self._check(field)
+        self.filters.append((field, DBQuery.Operator.IN, list(values)))
+        return self
+
+    def where_range(self, field, start=None, stop=None, inclusive=False):
+        '''Adds range filters: start <= field < stop
+
+        Keyword Arguments:
+            start {object} -- Lower bound, unbounded if None (default: {None})
+            stop {object} -- Upper bound, unbounded if None (default: {None})
+            inclusive {bool} -- Upper bound is included (default: {False})
+        '''
+        self._check(field)
+        if start is not None:
+            self.filters.append((field, DBQuery.Operator.GE, start))
+        if stop is not None:
+            operator = DBQuery.Operator.LE if inclusive else DBQuery.Operator.LT
+            self.filters.append((field, operator, stop))
+        return self
+
+    def select(self, *fields):
+        '''Restricts retrieved fields
+        '''
+        for field in fields:
+            self._check(field)
+        self.fields = list(fields)
+        return self
+
+    def order_by(self, field, descending=False):
+        '''Sorts retrieved objects, successive calls add sort keys
+        '''
+        self._check(field)
+        self.ordering.append((field, descending))
+        return self
+
+    def limit(self, count):
+        '''Retrieves at most count objects
+        '''
+        self.count = count
+        return self
@@ -0,0 +1,95 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: sql.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from core.db.query import DBQuery
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def select(query, placeholder='?'):
+    '''Compiles a DBQuery into a SELECT statement
+
+    Field and table names come from the queried DBObject subclass, values
+    are always passed as parameters.
+
+    Arguments:
+        query {DBQuery} -- Query to compile
+
+    Keyword Arguments:
+        placeholder {str} -- Parameter placeholder of the database driver
+                             (default: {'?'})
+
+    Returns:
+        tuple -- (statement, parameters)
+    '''
+    params = []
+    clauses = []
+    for field, operator, value in query.filters:
+        if operator == DBQuery.Operator.IN:
+            if not value:
+                clauses.append("1 = 0")
+                continue
+            clauses.append("{} IN ({})".format(field,
+                                               ', '.join([placeholder] *
+                                                         len(value))))
+            params.extend(value)
+
+        elif operator == DBQuery.Operator.EQ and value is None:
+            clauses.append("{} IS NULL".format(field))
+
+        else:
+            clauses.append("{} {} {}".format(field, operator.value,
+                                             placeholder))
+            params.append(value)
+
+    statement = "SELECT {} FROM {}".format(', '.join(query.projection),
+                                           query.index)
+    if clauses:
+        statement += " WHERE {}".format(' AND '.join(clauses))
+
+    if query.ordering:
+        statement += " ORDER BY {}".format(', '.join(
+            "{} {}".format(field, 'DESC' if descending else 'ASC')
+            for field, descending in query.ordering))
+
+    if query.count is not None:
+        statement += " LIMIT {}".format(int(query.count))
+
+    return (statement + ';', params)
+
+def create_indexes(meta):
+    '''Returns statements creating the indexes declared by a DBObject
+
+    Arguments:
+        meta {dict} -- '_meta' part of DBObject.to_db() output
+
+    Returns:
+        list -- CREATE INDEX statements
+    '''
+    return ["CREATE INDEX IF NOT EXISTS {0}_{1}_idx ON {0}({1});".format(
+                meta['index'], field)
+            for field in meta.get('indexes', [])
+            if field != meta['primary']]
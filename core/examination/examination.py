@@ -25,6 +25,7 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from core.db.object import DBObject
 from helper.logging.logger import Logger
 # =============================================================================
 #  GLOBALS
@@ -25,6 +25,7 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from uuid import UUID
 from helper.crypto import Crypto
 from core.db.object import DBObject
 from helper.logging.logger import Logger
@@ -49,10 +50,19 @@ class Hash(DBObject):
         ('container_uuid', DBObject.DataType.STRING)
     ]
     PRIMARY = 'container_uuid'
+    INDEXES = ['md5', 'sha1', 'sha_256', 'sha3_256']
 
     HASHES = ['MD5', 'SHA1', 'SHA-256', 'SHA3-256']
 
-    def __init__(self, container=None):
+    def __init__(self, container=None, digests=None):
+        '''Constructs the object
+
+        Keyword Arguments:
+            container {Container} -- Hashed container (default: {None})
+            digests {tuple} -- Already known (md5, sha1, sha_256, sha3_256)
+                               digests, hashes are computed from the
+                               container if not given (default: {None})
+        '''
         super().__init__()
         self._md5 = None
         self._sha1 = None
@@ -60,7 +70,10 @@ class Hash(DBObject):
         self._sha3_256 = None
         self._container = container
         self._container_uuid = container.uuid
-        self._compute_hashes()
+        if digests is None:
+            self._compute_hashes()
+        else:
+            (self._md5, self._sha1, self._sha_256, self._sha3_256) = digests
 
     @property
     def md5(self):
@@ -78,6 +91,10 @@ class Hash(DBObject):
     def sha3_256(self):
         return self._sha3_256
 
+    @property
+    def container(self):
+        return self._container
+
     @property
     def container_uuid(self):
         return self._container_uuid
@@ -99,7 +116,7 @@ class Hash(DBObject):
             'sha1': self._sha1,
             'sha_256': self._sha_256,
             'sha3_256': self._sha3_256,
-            'container_uuid': self._container._source()['uuid']
+            'container_uuid': self._container_uuid.urn
         }
 
     def from_db(self, _source):
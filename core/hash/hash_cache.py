@@ -0,0 +1,155 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: hash_cache.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import getpid
+from sqlite3 import connect
+from core.hash.hash import Hash
+from helper.logging.logger import Logger
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class HashCache:
+    '''Persistent cache of hashes keyed by file identity
+
+    A cached entry is reused only if (device, inode, size, mtime_ns) of the
+    file at the same path did not change since the entry was stored.
+
+    This object is given to hashing tasks in place of a plugin. It is
+    shipped to other processes as its path and options, each process opens
+    its own connection lazily.
+    '''
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS hash_cache("
+              "path TEXT PRIMARY KEY, "
+              "dev INTEGER, "
+              "ino INTEGER, "
+              "size INTEGER, "
+              "mtime_ns INTEGER, "
+              "md5 TEXT, "
+              "sha1 TEXT, "
+              "sha_256 TEXT, "
+              "sha3_256 TEXT);")
+
+    def __init__(self, path, verify=False):
+        '''Constructs the object
+
+        Arguments:
+            path {str} -- Cache database path
+
+        Keyword Arguments:
+            verify {bool} -- Ignore cached entries and hash every file
+                             again, cache is still updated (default: {False})
+        '''
+        self.path = str(path)
+        self.verify = verify
+        self._conn = None
+        self._pid = None
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "HashCache(path={},verify={})".format(self.path, self.verify)
+
+    def __reduce__(self):
+        '''Pickling support: the connection is not shipped
+        '''
+        return (self.__class__, (self.path, self.verify))
+
+    @property
+    def conn(self):
+        '''Connection of the current process
+        '''
+        if self._pid != getpid():
+            self._conn = connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            self._conn.execute(HashCache.SCHEMA)
+            self._pid = getpid()
+        return self._conn
+
+    @staticmethod
+    def _identity(stat):
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def lookup(self, path, stat):
+        '''Returns cached digests of given file or None
+
+        Arguments:
+            path {Path} -- File path
+            stat {os.stat_result} -- Current file status
+        '''
+        row = self.conn.execute("SELECT dev, ino, size, mtime_ns, md5, sha1, "
+                                "sha_256, sha3_256 FROM hash_cache "
+                                "WHERE path=?;", (str(path),)).fetchone()
+        if row is None:
+            return None
+
+        if tuple(row[:4]) != HashCache._identity(stat):
+            LGR.debug("Stale hash cache entry: {}".format(path))
+            return None
+
+        return tuple(row[4:])
+
+    def store(self, path, stat, digests):
+        '''Stores digests of given file
+
+        Arguments:
+            path {Path} -- File path
+            stat {os.stat_result} -- File status before hashing
+            digests {tuple} -- (md5, sha1, sha_256, sha3_256)
+        '''
+        self.conn.execute("INSERT OR REPLACE INTO hash_cache "
+                          "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);",
+                          (str(path),) + HashCache._identity(stat) + tuple(digests))
+
+    def hash(self, container):
+        '''Returns the Hash of given container, reading the file only if
+        no valid cache entry exists
+
+        Arguments:
+            container {Container} -- Container to hash
+        '''
+        if container.virtual:
+            # virtual containers have no file identity, content is read
+            # from their parent container
+            return Hash(container)
+
+        path = container.path
+        stat = path.stat()
+
+        if not self.verify:
+            digests = self.lookup(path, stat)
+            if digests is not None:
+                LGR.debug("Hash cache hit: {}".format(path))
+                return Hash(container, digests)
+
+        h = Hash(container)
+        self.store(path, stat, (h.md5, h.sha1, h.sha_256, h.sha3_256))
+        return h
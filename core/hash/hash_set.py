@@ -0,0 +1,328 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: hash_set.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import stat, fsync, replace
+from csv import reader
+from heapq import merge
+from array import array
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from helper.logging.logger import Logger
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# digest sizes (in bytes) of Hash fields which can be indexed
+DIGEST_SIZES = {
+    'md5': 16,
+    'sha1': 20,
+    'sha_256': 32,
+    'sha3_256': 32
+}
+# file layout: header, prefix table, sorted records
+MAGIC = b'DSHASHST'
+VERSION = 1
+HEADER = Struct('<8sHH12sQ')
+PREFIXES = 1 << 16
+TABLE = Struct('<{}Q'.format(PREFIXES + 1))
+TABLE_OFFSET = HEADER.size
+RECORDS_OFFSET = TABLE_OFFSET + TABLE.size
+BOUNDS = Struct('<QQ')
+# number of digests sorted in memory at once when building a hash set
+RUN_SIZE = 4 * 1024 * 1024
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def _normalize(name):
+    return name.strip().upper().replace('-', '').replace('_', '')
+
+def _read_run(path, size):
+    '''Yields the records of a sorted run file
+    '''
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(size * 4096)
+            if not chunk:
+                break
+            for offset in range(0, len(chunk), size):
+                yield chunk[offset:offset+size]
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class HashSet:
+    '''HashSet class
+
+    Compact index of the digests listed in a blacklist or whitelist database.
+
+    Hash set file is made of a header, a prefix table giving the bounds of
+    the records starting with each 16-bit prefix and a sorted array of
+    fixed-width binary digests. It is memory mapped and membership is
+    checked using a binary search within the bounds of the digest prefix:
+    only pages which are actually visited are loaded, nothing is parsed but
+    the header.
+    '''
+    def __init__(self, path, field=None, source=None):
+        '''Constructs the object
+
+        Arguments:
+            path {str} -- Hash set file path
+
+        Keyword Arguments:
+            field {str} -- Expected Hash field, any field is accepted if None
+                           (default: {None})
+            source {str} -- Hash list (see HashSet.parse()), hash set is
+                            built from it when missing or outdated
+                            (default: {None})
+        '''
+        if field is not None and field not in DIGEST_SIZES:
+            raise ValueError("unsupported hash set field: {}".format(field))
+
+        self.path = Path(path)
+        self.field = field
+        self.source = None if source is None else Path(source)
+        self.digest_size = None
+        self._mm = None
+        self._count = 0
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "HashSet(path={},field={},count={})".format(self.path,
+                                                           self.field,
+                                                           self._count)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, digest):
+        '''Checks if an hexadecimal digest is listed
+        '''
+        try:
+            key = bytes.fromhex(digest)
+        except (TypeError, ValueError):
+            return False
+
+        if self._count == 0 or len(key) != self.digest_size:
+            return False
+
+        size = self.digest_size
+        prefix = (key[0] << 8) | key[1]
+        lo, hi = BOUNDS.unpack_from(self._mm, TABLE_OFFSET + prefix * 8)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = RECORDS_OFFSET + mid * size
+            value = self._mm[offset:offset+size]
+            if value < key:
+                lo = mid + 1
+            elif value > key:
+                hi = mid
+            else:
+                return True
+
+        return False
+
+    def _outdated(self):
+        '''Checks if hash set must be built again from source
+        '''
+        if self.source is None:
+            return False
+
+        if not self.path.is_file():
+            return True
+
+        return stat(self.source).st_mtime > stat(self.path).st_mtime
+
+    def load(self):
+        '''Maps the hash set in memory, building it first if needed
+
+        Returns:
+            HashSet -- self
+        '''
+        if self._outdated():
+            HashSet.build([self.source], self.path, self.field or 'sha1')
+
+        self.close()
+        with self.path.open('rb') as f:
+            length = stat(f.fileno()).st_size
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError("{} is not a hash set.".format(self.path))
+
+            magic, version, size, field, count = HEADER.unpack(header)
+            field = field.rstrip(b'\0').decode('ascii', errors='replace')
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("{} is not a hash set.".format(self.path))
+
+            if length != RECORDS_OFFSET + count * size:
+                raise ValueError("{} is truncated.".format(self.path))
+
+            if self.field is not None and self.field != field:
+                raise ValueError("{} is a {} hash set, {} "
+                                 "expected.".format(self.path, field,
+                                                    self.field))
+
+            self._mm = mmap(f.fileno(), 0, access=ACCESS_READ)
+
+        self.field = field
+        self.digest_size = size
+        self._count = count
+        LGR.info("Hash set loaded: {}".format(self))
+        return self
+
+    def close(self):
+        '''Unmaps the hash set
+        '''
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._count = 0
+
+    @staticmethod
+    def parse(source, field='sha1', column=None):
+        '''Yields binary digests listed in a hash list
+
+        Hash list may be a text file (one digest per line, as output by
+        md5sum/sha1sum) or a CSV file such as NSRL RDS NSRLFile.txt. Digests
+        are read from given column (index or name), from the column named
+        after the field if the first line is a header or from the first
+        column otherwise. Lines which do not contain a valid digest are
+        skipped.
+        '''
+        size = DIGEST_SIZES[field]
+        index = column if isinstance(column, int) else 0
+        name = _normalize(column if isinstance(column, str) else field)
+        skipped = 0
+        with open(source, 'r', newline='', errors='replace') as f:
+            for line, row in enumerate(reader(f)):
+                if not row:
+                    continue
+
+                if line == 0 and not isinstance(column, int):
+                    names = [_normalize(value) for value in row]
+                    if name in names:
+                        index = names.index(name)
+                        continue
+
+                    if isinstance(column, str):
+                        raise ValueError("column {} not found in "
+                                         "{}".format(column, source))
+
+                try:
+                    digest = bytes.fromhex(row[index].split(maxsplit=1)[0])
+                except (IndexError, ValueError):
+                    skipped += 1
+                    continue
+
+                if len(digest) != size:
+                    skipped += 1
+                    continue
+
+                yield digest
+
+        if skipped > 0:
+            LGR.warning("{} lines skipped in {}".format(skipped, source))
+
+    @staticmethod
+    def build(sources, path, field='sha1', column=None):
+        '''Builds a hash set file from hash lists (see HashSet.parse())
+
+        Digests are sorted by runs of RUN_SIZE digests written to temporary
+        files next to the hash set, runs are then merged into the hash set:
+        lists larger than memory can be compiled. The hash set is written in
+        the same temporary directory and moved into place once complete, an
+        interrupted build leaves any previous hash set untouched.
+
+        Returns:
+            int -- number of distinct digests written
+        '''
+        size = DIGEST_SIZES[field]
+        path = Path(path)
+        with TemporaryDirectory(dir=str(path.parent)) as tmpdir:
+            runs = []
+            digests = []
+            for source in sources:
+                for digest in HashSet.parse(source, field, column):
+                    digests.append(digest)
+                    if len(digests) >= RUN_SIZE:
+                        runs.append(HashSet._write_run(tmpdir, len(runs),
+                                                       digests))
+                        digests = []
+
+            if runs:
+                if digests:
+                    runs.append(HashSet._write_run(tmpdir, len(runs), digests))
+                records = merge(*[_read_run(run, size) for run in runs])
+            else:
+                digests.sort()
+                records = iter(digests)
+
+            count = 0
+            counts = array('Q', bytes(PREFIXES * 8))
+            tmppath = Path(tmpdir).joinpath(path.name)
+            with tmppath.open('wb') as f:
+                f.write(bytes(RECORDS_OFFSET))
+                previous = None
+                batch = []
+                for digest in records:
+                    if digest == previous:
+                        continue
+                    previous = digest
+                    counts[(digest[0] << 8) | digest[1]] += 1
+                    batch.append(digest)
+                    if len(batch) >= 4096:
+                        f.write(b''.join(batch))
+                        batch = []
+                    count += 1
+                f.write(b''.join(batch))
+
+                table = [0]
+                for prefix_count in counts:
+                    table.append(table[-1] + prefix_count)
+
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, VERSION, size,
+                                    field.encode('ascii'), count))
+                f.write(TABLE.pack(*table))
+                f.flush()
+                fsync(f.fileno())
+
+            replace(str(tmppath), str(path))
+
+        LGR.info("Hash set built: {} ({} digests)".format(path, count))
+        return count
+
+    @staticmethod
+    def _write_run(tmpdir, index, digests):
+        '''Writes a sorted run of digests to a temporary file
+        '''
+        run = Path(tmpdir).joinpath('run-{}'.format(index))
+        digests.sort()
+        with run.open('wb') as f:
+            f.write(b''.join(digests))
+        return run
@@ -0,0 +1,214 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: prefilter.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from csv import reader
+from hashlib import blake2b
+from core.hash.hash import Hash
+from helper.logging.logger import Logger
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+PREFIX_SIZE = 64 * 1024
+# indexes are loaded once per process, see Prefilter.__reduce__()
+INDEXES = {}
+# normalized names of hash list columns containing file sizes
+SIZE_COLUMNS = ['FILESIZE', 'SIZE']
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def _normalize(name):
+    return name.strip().upper().replace('-', '').replace('_', '')
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Prefilter:
+    '''Prefilter class
+
+    Dismisses containers which cannot be listed in blacklist or whitelist
+    databases before computing their cryptographic hashes. Listed files are
+    indexed by size and by a digest of their first PREFIX_SIZE bytes: only
+    containers matching an index entry are fully hashed.
+
+    Index file contains one "<size> <prefix digest>" line per listed file, the
+    digest may be omitted when only the size is known (e.g. NSRL entries, see
+    Prefilter.parse_sizes()).
+
+    Warning:
+        the index must cover every file listed in blacklist_db: a blacklisted
+        container matching no entry is dismissed without being hashed, hence
+        it is never reported as blacklisted. Index shall be updated whenever
+        blacklist_db is.
+    '''
+    def __init__(self, path, hasher=None):
+        '''Constructs the object
+
+        Arguments:
+            path {str} -- Index file path
+
+        Keyword Arguments:
+            hasher {HashCache} -- Computes hashes of candidates, hashes are
+                                  computed directly if None (default: {None})
+        '''
+        self.path = str(path)
+        self.hasher = hasher
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "Prefilter(path={},hasher={})".format(self.path, self.hasher)
+
+    def __reduce__(self):
+        '''Pickling support
+
+        Index may be large, it is loaded again by each process instead of
+        being sent along with each task.
+        '''
+        return (self.__class__, (self.path, self.hasher))
+
+    @property
+    def index(self):
+        index = INDEXES.get(self.path)
+        if index is None:
+            index = INDEXES[self.path] = Prefilter.load(self.path)
+        return index
+
+    @staticmethod
+    def load(path):
+        '''Loads an index file
+
+        Returns:
+            dict -- maps size to a set of prefix digests or to None if any
+                    prefix matches
+        '''
+        index = {}
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if not fields or fields[0].startswith('#'):
+                    continue
+
+                size = int(fields[0])
+                if len(fields) == 1:
+                    index[size] = None
+                elif size not in index:
+                    index[size] = {fields[1]}
+                elif index[size] is not None:
+                    index[size].add(fields[1])
+
+        LGR.info("Prefilter index loaded: {} sizes".format(len(index)))
+        return index
+
+    @staticmethod
+    def parse_sizes(source, column=None):
+        '''Yields file sizes listed in a CSV hash list such as NSRL RDS
+        NSRLFile.txt
+
+        Sizes are read from given column (index or name) or from the column
+        named FileSize or Size in the header line. Lines which do not contain
+        a valid size are skipped.
+
+        Raises:
+            ValueError -- size column cannot be found
+        '''
+        index = column if isinstance(column, int) else None
+        names = ([_normalize(column)] if isinstance(column, str)
+                 else SIZE_COLUMNS)
+        skipped = 0
+        with open(source, 'r', newline='', errors='replace') as f:
+            for line, row in enumerate(reader(f)):
+                if not row:
+                    continue
+
+                if line == 0 and index is None:
+                    header = [_normalize(value) for value in row]
+                    for name in names:
+                        if name in header:
+                            index = header.index(name)
+                            break
+                    else:
+                        raise ValueError("size column not found in "
+                                         "{}".format(source))
+                    continue
+
+                try:
+                    size = int(row[index])
+                except (IndexError, ValueError):
+                    skipped += 1
+                    continue
+
+                if size < 0:
+                    skipped += 1
+                    continue
+
+                yield size
+
+        if skipped > 0:
+            LGR.warning("{} lines skipped in {}".format(skipped, source))
+
+    @staticmethod
+    def prefix_digest(container):
+        '''Returns the digest of the first PREFIX_SIZE bytes of a container
+
+        Read bypasses the block cache like the hashing it is meant to avoid.
+        '''
+        with container.bin_file() as bf:
+            data = bf.read(PREFIX_SIZE, 0, cached=False)
+        return blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def entry(container):
+        '''Returns the index line of a container
+        '''
+        return "{} {}".format(container.size, Prefilter.prefix_digest(container))
+
+    def is_candidate(self, container):
+        '''Checks if container may be listed
+
+        Only size is checked unless the index knows prefix digests of files
+        having the same size.
+        '''
+        if container.size not in self.index:
+            return False
+
+        prefixes = self.index[container.size]
+        if prefixes is None:
+            return True
+
+        return Prefilter.prefix_digest(container) in prefixes
+
+    def hash(self, container):
+        '''Returns the Hash of given container or None if it is dismissed
+        '''
+        if not self.is_candidate(container):
+            LGR.debug("Dismissed by prefilter: {}".format(container))
+            return None
+
+        if self.hasher is None:
+            return Hash(container)
+
+        return self.hasher.hash(container)
@@ -0,0 +1,145 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: backpressure.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from helper.logging.logger import Logger
+from core.orchestration.task import Task
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# tasks whose results are turned into new tasks by the orchestrator, a single
+# one may produce an unbounded number of results (e.g. a mailbox dissector
+# extracting every attachment)
+FAN_OUT_CATEGORIES = (Task.Category.DISSECTION,
+                      Task.Category.DISSECTION_PIPELINE)
+# tasks which the last running worker may perform while it holds a result of
+# a fan-out task, their results do not turn into an unbounded number of tasks
+DRAINED_CATEGORIES = (Task.Category.HASHING,
+                      Task.Category.EXAMINATION,
+                      Task.Category.EXAMINER_SELECTION,
+                      Task.Category.DISSECTOR_SELECTION,
+                      Task.Category.DEDUPLICATION)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Backpressure:
+    '''Backpressure class
+
+    Suspends workers performing fan-out tasks before they push their next
+    result while more than max_queued_tasks tasks are queued (results
+    waiting in qout count as they turn into tasks). Workers stop reading
+    results from the dissector generator, child process or worker daemon
+    meanwhile, which suspends the generator itself.
+
+    At most all workers but one are suspended at once. Instead of being
+    suspended, the remaining worker performs queued tasks which do not fan
+    out until the bound is met again, which also bounds queued tasks when the
+    pool has a single worker. It only pushes its result beyond the bound when
+    no such task is queued and no result is waiting to be processed, hence
+    there is no deadlock.
+    '''
+    def __init__(self, qin, qout, max_queued_tasks, event):
+        '''Constructs the object
+
+        Arguments:
+            qin {asyncio.PriorityQueue} -- Tasks queue
+            qout {asyncio.Queue} -- Results queue
+            max_queued_tasks {int} -- Queued tasks bound
+            event {asyncio.Event} -- Event set on each size change of qin
+                                     and qout
+        '''
+        self.qin = qin
+        self.qout = qout
+        self.max_queued_tasks = max_queued_tasks
+        self.event = event
+        self.workers = 0
+        self.suspended = 0
+        self.aborted = False
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "Backpressure(workers={},suspended={})".format(self.workers,
+                                                              self.suspended)
+
+    def _saturated(self):
+        return (self.qin.qsize() + self.qout.qsize() >= self.max_queued_tasks
+                and not self.aborted)
+
+    @staticmethod
+    def drained(task):
+        '''Checks if given queued task may be performed by the last running
+        worker
+        '''
+        return task is not None and task.category in DRAINED_CATEGORIES
+
+    async def admit(self, task, drain=None):
+        '''Waits until a result of given task can be pushed
+
+        Keyword Arguments:
+            drain {coroutine function} -- Performs one queued task matching
+                                          drained() and returns True, returns
+                                          False if there is none
+                                          (default: {None})
+        '''
+        if task is None or task.category not in FAN_OUT_CATEGORIES:
+            return
+
+        if not self._saturated():
+            return
+
+        if self.suspended < self.workers - 1:
+            self.suspended += 1
+            LGR.debug("Fan-out task suspended ({}): {}".format(self, task))
+            try:
+                while self._saturated():
+                    self.event.clear()
+                    await self.event.wait()
+            finally:
+                self.suspended -= 1
+            return
+
+        LGR.debug("Fan-out task draining queued tasks ({}): {}".format(self,
+                                                                      task))
+        while self._saturated():
+            if drain is not None and await drain():
+                continue
+
+            if self.qout.empty():
+                # nothing can be performed nor processed, waiting would
+                # never end
+                return
+
+            # results being processed may queue tasks which can be drained
+            self.event.clear()
+            await self.event.wait()
+
+    def abort(self):
+        '''Resumes suspended workers for good
+        '''
+        self.aborted = True
+        self.event.set()
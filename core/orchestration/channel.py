@@ -0,0 +1,171 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: channel.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from hmac import new as hmac_new, compare_digest
+from enum import Enum
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+from struct import Struct
+from asyncio import Lock
+from hashlib import sha256
+from helper.exception import InvalidMessageException
+from helper.logging.logger import Logger
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Channel:
+    '''Channel class
+
+    Exchanges messages between a RemoteWorker and a WorkerDaemon over an
+    asyncio stream (TCP or Unix socket).
+
+    Each message is framed as follows:
+        +--------+----------------------+-------------------------+
+        | length | HMAC-SHA256(payload) | payload (pickled tuple) |
+        +--------+----------------------+-------------------------+
+          4 bytes        32 bytes              length bytes
+
+    Payloads are pickled: unpickling a forged payload executes arbitrary
+    code, hence a secret shared by both peers is mandatory and messages
+    failing authentication are rejected before being unpickled.
+    '''
+    HEADER = Struct('!I')
+    DIGEST_SIZE = sha256().digest_size
+    MAX_MESSAGE_SIZE = 1024 * 1024 * 1024
+
+    class Message(Enum):
+        '''Channel's message type enumeration
+
+        Variables:
+            SUBMIT {str} -- Worker submits a task to the daemon
+            RESULT {str} -- Daemon sends back a task result
+            DONE {str} -- Daemon notifies that a task is completed
+            CANCEL {str} -- Worker cancels a running task
+            PING {str} -- Worker checks that the daemon is alive
+            PONG {str} -- Daemon answers a PING
+            ERROR {str} -- Daemon notifies an error
+        '''
+        SUBMIT = 'submit'
+        RESULT = 'result'
+        DONE = 'done'
+        CANCEL = 'cancel'
+        PING = 'ping'
+        PONG = 'pong'
+        ERROR = 'error'
+
+    def __init__(self, reader, writer, secret=None):
+        '''Constructs the object
+
+        Arguments:
+            reader {asyncio.StreamReader} -- [description]
+            writer {asyncio.StreamWriter} -- [description]
+
+        Keyword Arguments:
+            secret {str} -- Secret shared by both peers, mandatory
+                            (default: {None})
+
+        Raises:
+            ValueError -- secret is missing or empty
+        '''
+        if not secret:
+            raise ValueError("a secret is required to authenticate channel "
+                             "messages.")
+
+        self.reader = reader
+        self.writer = writer
+        self.secret = secret.encode()
+        self.lock = Lock()
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "Channel(peer={})".format(self.peer)
+
+    @property
+    def peer(self):
+        return self.writer.get_extra_info('peername')
+
+    def _digest(self, payload):
+        '''Computes payload authentication code
+        '''
+        return hmac_new(self.secret, payload, sha256).digest()
+
+    async def send(self, message, uuid=None, data=None):
+        '''Sends a message
+
+        Arguments:
+            message {Channel.Message} -- Message type
+
+        Keyword Arguments:
+            uuid {UUID} -- Task UUID the message refers to (default: {None})
+            data {Typing.Any} -- Picklable data (default: {None})
+        '''
+        payload = dumps((message.value, uuid, data), HIGHEST_PROTOCOL)
+
+        async with self.lock:
+            self.writer.write(Channel.HEADER.pack(len(payload)))
+            self.writer.write(self._digest(payload))
+            self.writer.write(payload)
+            await self.writer.drain()
+
+    async def recv(self):
+        '''Receives a message
+
+        Raises:
+            asyncio.IncompleteReadError -- peer closed the connection
+            InvalidMessageException -- message is invalid
+
+        Returns:
+            tuple -- (Channel.Message, UUID, data)
+        '''
+        header = await self.reader.readexactly(Channel.HEADER.size)
+        (length,) = Channel.HEADER.unpack(header)
+
+        if length > Channel.MAX_MESSAGE_SIZE:
+            raise InvalidMessageException("Message is too large: "
+                                          "{} bytes".format(length))
+
+        digest = await self.reader.readexactly(Channel.DIGEST_SIZE)
+        payload = await self.reader.readexactly(length)
+
+        if not compare_digest(digest, self._digest(payload)):
+            raise InvalidMessageException("Message authentication failed.")
+
+        (message, uuid, data) = loads(payload)
+        return (Channel.Message(message), uuid, data)
+
+    async def close(self):
+        '''Closes underlying stream
+        '''
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception as e:
+            pass
@@ -25,13 +25,55 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from enum import Enum
+from asyncio import get_event_loop
+from multiprocessing import Pipe, Process
+from plugins.plugins import PLUGINS
 from helper.logging.logger import Logger
+from helper.block_cache import block_cache
+from core.orchestration.task import Task
 from core.orchestration.worker import Worker
 # =============================================================================
 #  GLOBALS
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
 # =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def perform_tasks(conn):
+    '''Child process main loop
+
+    Receives tasks from given connection, performs them and sends back each
+    result as soon as it is produced. The performed task is sent after the
+    last result of a task. Receiving None tells the child process to exit
+    after releasing its pooled plugin instances.
+
+    Arguments:
+        conn {multiprocessing.Connection} -- Child end of the pipe
+    '''
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+
+        if task is None:
+            break
+
+        for result in task.perform():
+            try:
+                conn.send(result)
+            except Exception as e:
+                LGR.exception("Failed to send result back to parent process: "
+                              "{}".format(result))
+
+        conn.send(task)
+
+    PLUGINS.release()
+    if block_cache().enabled:
+        LGR.info("Worker process block cache: {}".format(block_cache()))
+    conn.close()
+# =============================================================================
 #  CLASSES
 # =============================================================================
 class LocalWorker(Worker):
@@ -39,6 +81,64 @@ class LocalWorker(Worker):
 
     Represents a worker executing locally in a separate process
     '''
+    class Mode(Enum):
+        '''LocalWorker's mode enumeration
+
+        Variables:
+            INLINE {str} -- Tasks are performed by the event loop thread
+            PROCESS {str} -- Tasks are performed by a child process
+        '''
+        INLINE = 'inline'
+        PROCESS = 'process'
+
+    def __init__(self, num, conf, qin, qout, settings=None):
+        '''Constructs the object
+        '''
+        super().__init__(num, conf, qin, qout, settings)
+        self.mode = LocalWorker.Mode(conf.get('local_worker_mode',
+                                              LocalWorker.Mode.PROCESS))
+        self.process = None
+        self.conn = None
+
+    def _spawn(self):
+        '''Starts a long-lived child process performing tasks
+        '''
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=perform_tasks,
+                               args=(child_conn,),
+                               name='datashark-worker-{}'.format(self.num),
+                               daemon=True)
+        self.process.start()
+        child_conn.close()
+        LGR.debug("Worker n°{}: child process started "
+                  "(pid={}).".format(self.num, self.process.pid))
+
+    def _kill(self):
+        '''Stops child process immediately
+        '''
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    async def _recv(self):
+        '''Waits for the next message from child process without blocking
+        the event loop
+        '''
+        loop = get_event_loop()
+        fd = self.conn.fileno()
+
+        while not self.conn.poll():
+            readable = loop.create_future()
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+
+        return self.conn.recv()
+
     async def initialize(self):
         '''Performs initialization of the worker if needed
 
@@ -48,6 +148,9 @@ class LocalWorker(Worker):
             1. set self.terminated to False
             2. return True on success, False otherwise
         '''
+        if self.mode == LocalWorker.Mode.PROCESS:
+            self._spawn()
+
         self.terminated = False
         return True
 
@@ -60,9 +163,47 @@ class LocalWorker(Worker):
             1. set self.terminated to True
             2. return True on success, False otherwise
         '''
+        if self.process is not None:
+
+            if self.aborted:
+                self._kill()
+            else:
+                self.conn.send(None)
+                self.process.join()
+                self.conn.close()
+                self.process = None
+                self.conn = None
+
         self.terminated = True
         return True
 
+    async def _perform_task_in_process(self, task):
+        '''Ships task to child process and pushes results in self.qout as
+        they are received
+        '''
+        try:
+            self.conn.send(task)
+
+            while True:
+                result = await self._recv()
+
+                if isinstance(result, Task):
+                    return result
+
+                # child process is suspended once the pipe is full while
+                # backpressure holds this result
+                await self._push(task, result)
+
+        except (EOFError, OSError) as e:
+            LGR.exception("Worker n°{}: child process died while performing "
+                          "task: {}".format(self.num, task))
+            self._kill()
+            self._spawn()
+
+        except Exception as e:
+            LGR.exception("Worker n°{}: failed to ship task to child process: "
+                          "{}".format(self.num, task))
+
     async def _perform_task(self, task):
         '''Performs task asynchronously
 
@@ -73,6 +214,7 @@ class LocalWorker(Worker):
             2. put (task,result) tuples in self.qout queue for further
                processing
         '''
-        for result in task.perform():
-            LGR.debug("Pushing result: {}".format(result))
-            await self.qout.put(result)
+        if self.mode == LocalWorker.Mode.PROCESS:
+            return await self._perform_task_in_process(task)
+
+        return await self._perform_task_inline(task)
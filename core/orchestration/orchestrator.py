@@ -25,17 +25,36 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
-from asyncio import PriorityQueue, QueueEmpty, Queue, sleep
+from itertools import islice
+from asyncio import (Event, CancelledError, wait, ensure_future,
+                     get_event_loop, FIRST_COMPLETED)
+from helper.win import WINDOWS
 from core.db.query import DBQuery
 from core.hash.hash import Hash
 from helper.logging.logger import Logger
-from core.orchestration.task import Task
+from core.examination.examination import Examination
+from core.orchestration.task import Task, TaskResult
 from core.container.container import Container
+from core.container.duplicate import Duplicate
 from core.orchestration.worker_pool import WorkerPool
+from core.orchestration.backpressure import Backpressure
+from core.orchestration.watched_queue import WatchedQueue, WatchedPriorityQueue
 # =============================================================================
 #  GLOBALS
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+FEED_BATCH_SIZE = 256
+DEDUPLICATED_CATEGORIES = (Task.Category.DISSECTOR_SELECTION,
+                           Task.Category.EXAMINER_SELECTION,
+                           Task.Category.DISSECTION_PIPELINE)
+# Hash computed by hashing tasks reused as deduplication content key
+HASHING_DEDUPLICATION_HASH = 'SHA-256'
+# Hash field looked up in blacklist_db/whitelist_db when they are not indexed
+DEFAULT_LIST_FIELD = 'sha1'
+# Max number of queued hashing results checked against lists at once
+LIST_BATCH_SIZE = 64
+if not WINDOWS:
+    from resource import getrusage, RUSAGE_SELF, RUSAGE_CHILDREN
 # =============================================================================
 #  CLASSES
 # =============================================================================
@@ -54,8 +73,16 @@ class Orchestrator:
                  whitelist_db,
                  blacklist_db,
                  dissection_db,
-                 examination_db):
+                 examination_db,
+                 whitelist_index=None,
+                 blacklist_index=None):
         '''Constructs the object
+
+        Keyword Arguments:
+            whitelist_index {HashSet} -- Index of whitelist_db digests
+                                         (default: {None})
+            blacklist_index {HashSet} -- Index of blacklist_db digests
+                                         (default: {None})
         '''
         self.conf = conf
 
@@ -65,49 +92,231 @@ class Orchestrator:
         self.blacklist_db = blacklist_db
         self.dissection_db = dissection_db
         self.examination_db = examination_db
-
-        self.qin = PriorityQueue()
-        self.qout = Queue()
+        self.whitelist_index = whitelist_index
+        self.blacklist_index = blacklist_index
+
+        self.max_queued_tasks = conf.get('max_queued_tasks', 1024)
+        self.max_queued_results = conf.get('max_queued_results', 1024)
+        self.high_water = {'qin': 0, 'qout': 0, 'pending': 0}
+
+        self.changed = Event()
+        self.qin = WatchedPriorityQueue(self.changed)
+        self.qout = WatchedQueue(self.changed, self.max_queued_results)
+        self.pending = 0
+        self.digests = {}
+        self.content_keys = {}
+        self.feeding = False
+        self.admission = Event()
         self.aborted = False
+        self.stopped = Event()
         self.worker_group = None
+        self.backpressure = None
+
+    async def _listed(self, db, index, hashes):
+        '''Checks which hashes are listed in given blacklist or whitelist
+        database
+
+        Database is only queried to confirm index hits, unlisted hashes are
+        dismissed by the index alone. Remaining lookups are pipelined, see
+        Database.retrieve_many().
+
+        Returns:
+            list(bool) -- True for each listed hash, in hashes order
+        '''
+        field = DEFAULT_LIST_FIELD if index is None else index.field
+        listed = [False] * len(hashes)
+        candidates = [k for (k, hash) in enumerate(hashes)
+                      if index is None or getattr(hash, field) in index]
+        if not candidates:
+            return listed
+
+        queries = [DBQuery(Hash).where(**{field: getattr(hashes[k], field)})
+                                .limit(1)
+                   for k in candidates]
+        for (k, rows) in zip(candidates, await db.retrieve_many(queries)):
+            listed[k] = bool(rows)
+        return listed
+
+    async def _list_tags(self, hashes):
+        '''Returns the tag of each hash: BLACKLISTED, WHITELISTED or None
+
+        Only hashes which are not blacklisted are checked against whitelist.
+        '''
+        tags = [None] * len(hashes)
+        blacklisted = await self._listed(self.blacklist_db,
+                                         self.blacklist_index,
+                                         hashes)
+        remaining = []
+        for (k, listed) in enumerate(blacklisted):
+            if listed:
+                tags[k] = Container.Tag.BLACKLISTED
+            else:
+                remaining.append(k)
+
+        whitelisted = await self._listed(self.whitelist_db,
+                                         self.whitelist_index,
+                                         [hashes[k] for k in remaining])
+        for (k, listed) in zip(remaining, whitelisted):
+            if listed:
+                tags[k] = Container.Tag.WHITELISTED
+
+        return tags
+
+    @staticmethod
+    def _is_hashing_result(item):
+        return (isinstance(item, TaskResult) and
+                item.task.category == Task.Category.HASHING)
+
+    @staticmethod
+    def _is_hashing_item(item):
+        '''Checks if item is a result or the completion of a hashing task
+        '''
+        if isinstance(item, TaskResult):
+            item = item.task
+        return (isinstance(item, Task) and
+                item.category == Task.Category.HASHING)
+
+    async def _process_hashing_results(self, results):
+        '''Checks hashes of several hashing results against blacklist and
+        whitelist databases at once, then processes each result
+        '''
+        for result in results:
+            if result.data is not None and not isinstance(result.data, Hash):
+                raise RuntimeError("result.data must be a Hash instance here!")
 
-    async def _process_hashing_result(self, result):
+        tags = [None] * len(results)
+        if self.conf.check_black_or_white:
+            checked = [k for (k, result) in enumerate(results)
+                       if result.data is not None]
+            hashes = [results[k].data for k in checked]
+            for (k, tag) in zip(checked, await self._list_tags(hashes)):
+                tags[k] = tag
+
+        for (result, tag) in zip(results, tags):
+            await self._process_hashing_result(result, tag)
+
+    async def _process_hashing_result(self, result, tag=None):
         '''Treats all hashing result as final results and persist them into
         given database
+
+        Result is None when the container has been dismissed by the
+        prefilter: it is neither listed nor hashed. Task following the check
+        against blacklist and whitelist databases, if any, is scheduled once
+        its container is tagged.
+
+        Keyword Arguments:
+            tag {Container.Tag} -- Tag given by blacklist and whitelist
+                                   checks, see _process_hashing_results()
+                                   (default: {None})
         '''
-        if not isinstance(result.data, Hash):
-            raise RuntimeError("result.data must be a Hash instance here!")
+        hash = result.data
+        then = result.task.then
 
-        if self.conf.check_black_or_white:
+        if hash is not None:
 
-            if self.blacklist_db.retrieve(DBQuery(result.data)) is not None:
-                result.data.container.add_tag(Container.Tag.BLACKLISTED)
+            if tag is not None:
+                hash.container.add_tag(tag)
+                if then is not None:
+                    then.container.add_tag(tag)
 
-            elif self.whitelist_db.retrieve(DBQuery(result.data)) is not None:
-                result.data.container.add_tag(Container.Tag.WHITELISTED)
+            if (then is not None and hash.sha_256 and
+                    self.conf.get('deduplicate', False) and
+                    then.category in DEDUPLICATED_CATEGORIES):
+                # spares the deduplication task of then a second read
+                self.content_keys[then.container.uuid] = Task.content_key(
+                    then.container, HASHING_DEDUPLICATION_HASH, hash.sha_256)
 
-        await self.hash_db.persist(result.data)
+            await self.hash_db.persist(hash)
+
+        if then is not None:
+            await self.schedule_tasks([then])
 
     async def _process_dissection_result(self, result):
         '''Treats all dissection result as intermediary results and inject new
         "dissector selection" and "examiner selection" tasks into processing
-        queue and persists container
+        queue
+
+        Dissected container is persisted once these tasks are completed.
+        '''
+        if not isinstance(result.data, Container):
+            raise RuntimeError("result.data must be a Container instance here!")
+
+        await self._schedule_container_processing(result.data,
+                                                  result.task.depth + 1)
+
+    async def _process_dissection_pipeline_result(self, result):
+        '''Treats dissection pipeline results: dissected containers are
+        scheduled for processing and examinations are persisted
         '''
-        if not isinstance(result.data, Dissection):
-            raise RuntimeError("result.data must be a Dissection instance here!")
+        if result.data is None:
+            # task was not executed which means the container is blacklisted
+            # or whitelisted here. Persist container again to ensure tag is
+            # up-to-date in DB.
+            await self.container_db.persist(result.task.container)
+            return
 
-        ds_task = Task(Task.Category.DISSECTOR_SELECTION,
-                       self.conf.dissector_selector, result.data.container)
+        if isinstance(result.data, Examination):
+            await self._process_examination_result(result)
+            return
 
-        await self.schedule_tasks([ds_task])
+        await self._process_dissection_result(result)
 
-        if self.conf.dissect_and_examine:
-            es_task = Task(Task.Category.EXAMINER_SELECTION,
-                           self.conf.examiner_selector, result.data.container)
+    async def _schedule_container_processing(self, container, depth):
+        '''Schedules dissection (and examination if dissect_and_examine is
+        set) of given container
 
-            await self.schedule_tasks([es_task])
+        Using the fused pipeline, selection and processing are performed by a
+        single task instead of a selection task followed by one task per
+        selected plugin.
+        '''
+        if self.conf.get('fused_pipeline', False):
+            tasks = [Task(Task.Category.DISSECTION_PIPELINE,
+                          None, container, depth,
+                          examine=self.conf.dissect_and_examine)]
+        else:
+            tasks = [Task(Task.Category.DISSECTOR_SELECTION,
+                          None, container, depth)]
+
+            if self.conf.dissect_and_examine:
+                tasks.append(Task(Task.Category.EXAMINER_SELECTION,
+                                  None, container, depth))
+
+        await self.schedule_tasks(tasks)
+
+    async def _process_deduplication_result(self, result):
+        '''Schedules the task following deduplication unless the container is
+        a duplicate of an already processed container
+
+        A duplicate is persisted as a Duplicate object linking it to the
+        original container, in the database(s) where results of the skipped
+        task would have been persisted.
+        '''
+        task = result.task
+        digest = result.data
+
+        if digest is None:
+            await self.schedule_tasks(task.then, deduplicate=False)
+            return
+
+        original = self.digests.setdefault(digest, task.container.uuid)
+        if original == task.container.uuid:
+            await self.schedule_tasks(task.then, deduplicate=False)
+            return
 
-        await self.dissection_db.persist(result.data)
+        LGR.debug("Duplicate of {} skipped: {}".format(original,
+                                                       task.container))
+        duplicate = Duplicate(task.container.uuid, original, digest)
+
+        if any(then.category != Task.Category.EXAMINER_SELECTION
+               for then in task.then):
+            await self.dissection_db.persist(duplicate)
+
+        if any(then.category == Task.Category.EXAMINER_SELECTION or then.examine
+               for then in task.then):
+            await self.examination_db.persist(duplicate)
+
+        await self.container_db.persist(task.container)
+        task.container.add_tag(Container.Tag.PERSISTED)
 
     async def _process_examination_result(self, result):
         '''Treats all examination result as final results and persist them into
@@ -127,7 +336,7 @@ class Orchestrator:
             # task was not executed which means the container is blacklisted
             # or whitelisted here. Persist container again to ensure tag is
             # up-to-date in DB.
-            await self.container_db.persist(container)
+            await self.container_db.persist(result.task.container)
             return
 
         if not isinstance(result.data, list):
@@ -135,7 +344,8 @@ class Orchestrator:
 
         exam_tasks = [Task(Task.Category.EXAMINATION,
                            examiner,
-                           result.task.container) for examiner in result.data]
+                           result.task.container,
+                           result.task.depth) for examiner in result.data]
 
         await self.schedule_tasks(exam_tasks)
 
@@ -148,7 +358,7 @@ class Orchestrator:
             # task was not executed which means the container is blacklisted
             # or whitelisted here. Persist container again to ensure tag is
             # up-to-date in DB.
-            self.container_db.persist(container)
+            await self.container_db.persist(result.task.container)
             return
 
         if not isinstance(result.data, list):
@@ -156,7 +366,8 @@ class Orchestrator:
 
         diss_tasks = [Task(Task.Category.DISSECTION,
                            dissector,
-                           result.task.container) for dissector in result.data]
+                           result.task.container,
+                           result.task.depth) for dissector in result.data]
 
         await self.schedule_tasks(diss_tasks)
 
@@ -167,7 +378,7 @@ class Orchestrator:
 
         task = result.task
         if task.category == Task.Category.HASHING:
-            await self._process_hashing_result(result)
+            await self._process_hashing_results([result])
 
         elif task.category == Task.Category.DISSECTION:
             await self._process_dissection_result(result)
@@ -181,6 +392,12 @@ class Orchestrator:
         elif task.category == Task.Category.DISSECTOR_SELECTION:
             await self._process_dissector_selection_result(result)
 
+        elif task.category == Task.Category.DISSECTION_PIPELINE:
+            await self._process_dissection_pipeline_result(result)
+
+        elif task.category == Task.Category.DEDUPLICATION:
+            await self._process_deduplication_result(result)
+
     @property
     def processing(self):
         return (self.worker_group is not None)
@@ -190,56 +407,270 @@ class Orchestrator:
         '''
         LGR.debug("Processing abortion requested.")
         self.aborted = True
-        await self.worker_group
+        # wake up feeder, processing loop and suspended workers
+        self.admission.set()
+        if self.backpressure is not None:
+            self.backpressure.abort()
+        await self.qout.put(None)
+        await self.stopped.wait()
+
+    def _deduplicated(self, tasks):
+        '''Returns given tasks, those deduplication applies to are preceded
+        by a single deduplication task per container if deduplication is
+        enabled
+        '''
+        if not self.conf.get('deduplicate', False):
+            return tasks
 
-    async def schedule_tasks(self, tasks):
+        deduplications = {}
+        deduplicated = []
+        for task in tasks:
+            if task.category not in DEDUPLICATED_CATEGORIES:
+                deduplicated.append(task)
+                continue
+
+            dedup = deduplications.get(task.container.uuid)
+            if dedup is None:
+                # containers are hashed before being processed when they are
+                # checked, use the same algorithm for all content keys
+                hash_name = None
+                if self.conf.get('check_black_or_white', False):
+                    hash_name = HASHING_DEDUPLICATION_HASH
+                dedup = Task(Task.Category.DEDUPLICATION,
+                             hash_name,
+                             task.container,
+                             task.depth,
+                             then=[])
+                deduplications[task.container.uuid] = dedup
+                deduplicated.append(dedup)
+
+            dedup.then.append(task)
+
+        return deduplicated
+
+    async def schedule_tasks(self, tasks, deduplicate=True):
         '''Schedules more tasks for processing
+
+        Deduplication tasks of containers whose content key is already known
+        are processed right away instead of being scheduled.
+
+        Keyword Arguments:
+            deduplicate {bool} -- Precede tasks processing containers by a
+                                  deduplication task if enabled
+                                  (default: {True})
         '''
+        if deduplicate:
+            tasks = self._deduplicated(tasks)
+
         for task in tasks:
+            if task.category == Task.Category.DEDUPLICATION:
+                key = self.content_keys.pop(task.container.uuid, None)
+                if key is not None:
+                    await self._process_deduplication_result(TaskResult(task,
+                                                                        key))
+                    continue
             LGR.debug("Pushing task into processing queue: {}".format(task))
+            self.pending += 1
             await self.qin.put(task)
 
-            if not task.container.has_tag(Container.Tag.PERSISTED):
-                LGR.debug("Persisting container: {}".format(task.container))
-                await self.container_db.persist(task.container)
-                task.container.add_tag(Container.Tag.PERSISTED)
+    async def _feed(self, tasks):
+        '''Schedules tasks from given iterable keeping the number of pending
+        tasks below max_pending_tasks
+
+        Iterable is consumed by batches in the default executor because it
+        might perform blocking I/O (e.g. directory scanning).
+        '''
+        loop = get_event_loop()
+        max_pending = self.conf.get('max_pending_tasks', 1024)
+        tasks = iter(tasks)
+        try:
+            while not self.aborted:
+                await self.admission.wait()
+                if self.aborted:
+                    break
+
+                size = max(1, min(FEED_BATCH_SIZE, max_pending - self.pending))
+                batch = await loop.run_in_executor(None, list,
+                                                   islice(tasks, size))
+                if not batch:
+                    break
+
+                await self.schedule_tasks(batch)
+
+                if self.pending >= max_pending:
+                    self.admission.clear()
+
+        except CancelledError:
+            self.feeding = False
+            raise
+        except Exception as e:
+            LGR.exception("An exception occured while feeding tasks, "
+                          "remaining tasks are dropped.")
+
+        LGR.debug("Feeding completed.")
+        self.feeding = False
+        # wake up processing loop
+        await self.qout.put(None)
+
+    async def _drain(self, joined):
+        '''Drops results until workers are joined
+
+        Workers suspended on a full qout would never receive ABORT task.
+        '''
+        getter = None
+        while not joined.done():
+            getter = ensure_future(self.qout.get())
+            await wait([joined, getter], return_when=FIRST_COMPLETED)
+
+        if getter is not None:
+            getter.cancel()
+
+    def _update_high_water(self):
+        '''Keeps track of queues and pending tasks maximum sizes
+        '''
+        for (key, value) in (('qin', self.qin.qsize()),
+                             ('qout', self.qout.qsize()),
+                             ('pending', self.pending)):
+            if value > self.high_water[key]:
+                self.high_water[key] = value
+
+    def _report_high_water(self):
+        '''Logs queues and memory high-water marks of the last processing
+        '''
+        report = ', '.join('{}={}'.format(key, value)
+                           for (key, value) in self.high_water.items())
+        if not WINDOWS:
+            # ru_maxrss is given in kilobytes on Linux
+            report += ', maxrss={}kB, children_maxrss={}kB'.format(
+                getrusage(RUSAGE_SELF).ru_maxrss,
+                getrusage(RUSAGE_CHILDREN).ru_maxrss)
+
+        LGR.info("Processing high-water marks: {}".format(report))
 
-    async def process_tasks(self):
-        '''Processes all tasks until the input queue is empty or abort()
-        is called
+    async def _process_completion(self, task):
+        '''Persists task container once the task is completed
+
+        Container metadata has been computed by the worker which performed
+        the task, persisting it does not require any I/O on the container.
+        '''
+        self.pending -= 1
+        LGR.debug("Task completed ({} pending): {}".format(self.pending, task))
+
+        if self.pending < self.conf.get('max_pending_tasks', 1024):
+            self.admission.set()
+
+        if task.category == Task.Category.DEDUPLICATION:
+            # container is persisted by the task following deduplication or
+            # as a duplicate. Process the container anyway if deduplication
+            # failed.
+            if not task.succeeded:
+                await self.schedule_tasks(task.then, deduplicate=False)
+            return
+
+        if task.category == Task.Category.HASHING:
+            # process the container unchecked if hashing failed
+            if task.then is not None and not task.succeeded:
+                await self.schedule_tasks([task.then])
+
+        if task.category in (Task.Category.DISSECTION,
+                             Task.Category.EXAMINATION):
+            # containers of these tasks are persisted when the selection
+            # task they come from is completed. Tags cannot be relied on as
+            # tasks performed in other processes come back as copies.
+            return
+
+        if not task.container.has_tag(Container.Tag.PERSISTED):
+            LGR.debug("Persisting container: {}".format(task.container))
+            await self.container_db.persist(task.container)
+            task.container.add_tag(Container.Tag.PERSISTED)
+
+    async def process_tasks(self, tasks=()):
+        '''Processes all tasks until every scheduled task is completed or
+        abort() is called
+
+        Given tasks are scheduled incrementally while processing, as long as
+        pending tasks count stays below max_pending_tasks, which keeps memory
+        usage flat whatever the number of tasks.
+
+        Workers push results of a task followed by the task itself in qout.
+        Results may schedule new tasks, hence processing is over when the
+        last pending task completion is received and all given tasks have
+        been scheduled. Tasks producing many results are suspended by
+        workers while more than max_queued_tasks are queued (see
+        Backpressure).
         '''
         self.aborted = False
+        self.stopped.clear()
+        self.high_water = {'qin': 0, 'qout': 0, 'pending': 0}
+        self.feeding = True
+        self.admission.set()
         # create a worker pool
-        async with WorkerPool(self.conf, self.qin, self.qout) as pool:
+        self.backpressure = Backpressure(self.qin, self.qout,
+                                         self.max_queued_tasks, self.changed)
+        async with WorkerPool(self.conf, self.qin, self.qout,
+                              self.backpressure) as pool:
+            self.worker_group = pool
             # start workers
             LGR.debug("Starting workers in the pool.")
             await pool.start()
-            # Note:
-            #   process results until the queue is empty
+            # start feeding workers
+            feeder = ensure_future(self._feed(tasks))
             # Warning:
             #   this loop must not contain a blocking function call
             LGR.debug("Entering processing loop.")
-            while True:
+            while (self.pending > 0 or self.feeding) and not self.aborted:
 
-                if self.qin.empty() and self.qout.empty():
-                    # everything has been consumed and no operation remains
-                    # send EXIT tasks
-                    LGR.debug("Exiting processing loop.")
-                    await pool.exit()
-                    break
+                items = [await self.qout.get()]
+                self._update_high_water()
+
+                # hashing results already queued are checked against
+                # blacklist and whitelist databases together. Results of a
+                # task precede its completion in qout, processing results
+                # first keeps this order for every task.
+                while (len(items) < LIST_BATCH_SIZE and
+                       self._is_hashing_item(items[-1]) and
+                       not self.qout.empty()):
+                    items.append(self.qout.get_nowait())
+
+                results = [item for item in items
+                           if self._is_hashing_result(item)]
+                if results:
+                    await self._process_hashing_results(results)
+
+                for item in items:
+                    if isinstance(item, Task):
+                        await self._process_completion(item)
+
+                    elif (item is not None and
+                          not self._is_hashing_result(item)):
+                        await self._process_result(item)
 
-                try:
-                    result = self.qout.get_nowait()
-                    await self._process_result(result)
                     self.qout.task_done()
-                except QueueEmpty as e:
-                    await sleep(0.1)
 
-                if self.aborted:
-                    LGR.debug("Abort processing loop.")
-                    await pool.abort()
-                    break
+            if self.aborted:
+                LGR.debug("Abort processing loop.")
+                feeder.cancel()
+                await pool.abort()
+            else:
+                # everything has been consumed and no operation remains
+                # send EXIT tasks
+                LGR.debug("Exiting processing loop.")
+                await pool.exit()
 
             # wait for workers' group to stop, this is a kind of join
             LGR.debug("Waiting for pool to terminate terminate workers.")
-            await pool.join()
+            joined = ensure_future(pool.join())
+            if self.aborted:
+                await self._drain(joined)
+            await joined
+            self.worker_group = None
+
+        if self.aborted:
+            # drop remaining tasks and results
+            self.qin = WatchedPriorityQueue(self.changed)
+            self.qout = WatchedQueue(self.changed, self.max_queued_results)
+            self.pending = 0
+            self.feeding = False
+
+        self._report_high_water()
+        self.stopped.set()
@@ -25,8 +25,15 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from time import time
+from asyncio import (sleep, ensure_future, current_task, open_connection,
+                     open_unix_connection, IncompleteReadError,
+                     get_event_loop)
+from helper.exception import InvalidMessageException
 from helper.logging.logger import Logger
+from core.orchestration.task import Task
 from core.orchestration.worker import Worker
+from core.orchestration.channel import Channel
 # =============================================================================
 #  GLOBALS
 # =============================================================================
@@ -38,7 +45,126 @@ class RemoteWorker(Worker):
     '''RemoteWorker class
 
     Represents a worker distributed on a cluster of servers
+
+    Tasks are submitted to a WorkerDaemon (see datashark-worker) listening
+    on the host/port or Unix socket path given in worker's settings.
     '''
+    def __init__(self, num, conf, qin, qout, settings=None):
+        '''Constructs the object
+        '''
+        super().__init__(num, conf, qin, qout, settings)
+        self.channel = None
+        self.task = None
+        self.pending = None
+        self.last_seen = None
+        self.reader_coro = None
+        self.heartbeat_coro = None
+        self.stalled = False
+        self.heartbeat = self.settings.get('heartbeat', 5)
+        self.timeout = self.settings.get('timeout', 3 * self.heartbeat)
+
+    def _is_connected(self):
+        '''Returns true if underlying channel is opened, False otherwise
+        '''
+        return (self.channel is not None)
+
+    async def _connect(self):
+        '''Opens a channel with the WorkerDaemon
+        '''
+        if not self.settings.get('secret'):
+            LGR.error("Worker n°{}: a secret shared with the worker daemon "
+                      "is required.".format(self.num))
+            return False
+
+        path = self.settings.get('path')
+
+        try:
+            if path is not None:
+                reader, writer = await open_unix_connection(path)
+            else:
+                reader, writer = await open_connection(self.settings.get('host', '127.0.0.1'),
+                                                       self.settings.get('port', 9443))
+        except OSError as e:
+            LGR.exception("Worker n°{}: failed to connect to worker "
+                          "daemon.".format(self.num))
+            return False
+
+        self.channel = Channel(reader, writer, self.settings.get('secret'))
+        self.last_seen = time()
+        self.reader_coro = ensure_future(self._read())
+        self.heartbeat_coro = ensure_future(self._beat())
+        LGR.debug("Worker n°{}: connected to {}".format(self.num, self.channel))
+        return True
+
+    async def _disconnect(self, reason=None):
+        '''Closes the channel and fails pending task if any
+        '''
+        if not self._is_connected():
+            return
+
+        channel = self.channel
+        self.channel = None
+
+        for coro in (self.reader_coro, self.heartbeat_coro):
+            if coro is not None and coro is not current_task():
+                coro.cancel()
+
+        if self.pending is not None and not self.pending.done():
+            self.pending.set_result(False)
+
+        if reason is not None:
+            LGR.error("Worker n°{}: connection lost: {}".format(self.num,
+                                                                reason))
+
+        await channel.close()
+
+    async def _read(self):
+        '''Dispatches messages received from the WorkerDaemon
+        '''
+        try:
+            while True:
+                (message, uuid, data) = await self.channel.recv()
+                self.last_seen = time()
+
+                if message == Channel.Message.RESULT:
+                    # reading is suspended while qout is full or
+                    # backpressure holds the result, heartbeat answers
+                    # cannot be received meanwhile
+                    self.stalled = True
+                    await self._push(self.task, data)
+                    self.stalled = False
+                    self.last_seen = time()
+
+                elif message == Channel.Message.DONE:
+                    if self.pending is not None and not self.pending.done():
+                        self.pending.set_result(data or True)
+
+                elif message == Channel.Message.ERROR:
+                    LGR.error("Worker n°{}: daemon error: {}".format(self.num,
+                                                                     data))
+                    if self.pending is not None and not self.pending.done():
+                        self.pending.set_result(False)
+
+        except (IncompleteReadError, InvalidMessageException, OSError) as e:
+            await self._disconnect(reason=repr(e))
+
+    async def _beat(self):
+        '''Sends PING messages periodically and checks that the daemon
+        answers in time
+        '''
+        while True:
+            await sleep(self.heartbeat)
+
+            if not self.stalled and time() - self.last_seen > self.timeout:
+                await self._disconnect(reason="heartbeat timeout")
+                return
+
+            try:
+                await self.channel.send(Channel.Message.PING)
+            except OSError as e:
+                await self._disconnect(reason=repr(e))
+                return
+
     async def initialize(self):
         '''Performs initialization of the worker if needed
 
@@ -48,7 +174,11 @@ class RemoteWorker(Worker):
             1. set self.terminated to False
             2. return True on success, False otherwise
         '''
-        LGR.todo("implement RemoteWorker.initialize()!")
+        if not await self._connect():
+            return False
+
+        self.terminated = False
+        return True
 
     async def terminate(self):
         '''Performs cleanup of the worker if needed
@@ -59,7 +189,25 @@ class RemoteWorker(Worker):
             1. set self.terminated to True
             2. return True on success, False otherwise
         '''
-        LGR.todo("implement RemoteWorker.terminate()!")
+        await self._disconnect()
+        self.terminated = True
+        return True
+
+    async def cancel(self):
+        '''Cancels the task running on the WorkerDaemon if any
+        '''
+        if self.pending is None or self.pending.done():
+            return
+
+        LGR.debug("Worker n°{}: cancelling task: {}".format(self.num,
+                                                            self.task))
+        try:
+            await self.channel.send(Channel.Message.CANCEL, self.task.uuid)
+        except OSError as e:
+            await self._disconnect(reason=repr(e))
+
+        if self.pending is not None and not self.pending.done():
+            self.pending.set_result(False)
 
     async def _perform_task(self, task):
         '''Performs task asynchronously
@@ -71,4 +219,23 @@ class RemoteWorker(Worker):
             2. put (task,result) tuples in self.qout queue for further
                processing
         '''
-        LGR.todo("implement RemoteWorker._perform_task()!")
+        if not self._is_connected() and not await self._connect():
+            LGR.error("Worker n°{}: task dropped, worker daemon is "
+                      "unreachable: {}".format(self.num, task))
+            return None
+
+        self.task = task
+        self.pending = get_event_loop().create_future()
+        try:
+            await self.channel.send(Channel.Message.SUBMIT, task.uuid, task)
+        except OSError as e:
+            await self._disconnect(reason=repr(e))
+
+        performed = await self.pending
+        if not performed:
+            LGR.error("Worker n°{}: task failed on worker daemon: "
+                      "{}".format(self.num, task))
+
+        self.task = None
+        self.pending = None
+        return performed if isinstance(performed, Task) else None
@@ -29,6 +29,7 @@ from time import time
 from enum import Enum
 from uuid import uuid4
 from core.hash.hash import Hash
+from helper.crypto import Crypto
 from helper.exception import InvalidPluginTypeException
 from helper.logging.logger import Logger
 from core.container.container import Container
@@ -39,6 +40,8 @@ from core.plugin.plugin_selector import PluginSelector
 #  GLOBALS
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+# Default algorithm of deduplication content keys
+DEDUPLICATION_HASH = 'BLAKE2b'
 # =============================================================================
 #  CLASSES
 # =============================================================================
@@ -71,6 +74,10 @@ class Task:
             HASHING {str} -- Hashing task
             DISSECTION {str} -- Dissection task
             EXAMINATION {str} -- Examination task
+            DISSECTION_PIPELINE {str} -- Dissector selection and dissection
+                                         (and optionally examination) task
+            DEDUPLICATION {str} -- Content digest computation preceding
+                                   another task
         '''
         EXIT = 'exit'
         ABORT = 'abort'
@@ -79,8 +86,11 @@ class Task:
         EXAMINATION = 'examination'
         EXAMINER_SELECTION = 'examiner_selection'
         DISSECTOR_SELECTION = 'dissector_selection'
+        DISSECTION_PIPELINE = 'dissection_pipeline'
+        DEDUPLICATION = 'deduplication'
 
-    def __init__(self, category, plugin, container):
+    def __init__(self, category, plugin, container, depth=0, examine=False,
+                 then=None):
         '''[summary]
 
         [description]
@@ -89,26 +99,44 @@ class Task:
             category {Task.Category} -- [description]
             plugin {Plugin} -- [description]
             container {Container} -- [description]
+
+        Keyword Arguments:
+            depth {int} -- Dissection depth of the container (default: {0})
+            examine {bool} -- Dissection pipeline examines the container as
+                              well (default: {False})
+            then {Task} -- Task to schedule once hashing checked the
+                           container against blacklist and whitelist
+                           databases, list of tasks to schedule once
+                           deduplication found the container is not a
+                           duplicate (default: {None})
         '''
         self.uuid = uuid4()
         self.category = category
         self.plugin = plugin
         self.container = container
+        self.depth = depth
+        self.examine = examine
+        self.then = then
         self.priority = self._set_priority()
         self.start_time = None
         self.stop_time = None
         self.succeeded = None
 
     def __str__(self):
-        return "Task(uuid={},category={},priority={},container={})".format(self.uuid,
-                                                                           self.category,
-                                                                           self.priority,
-                                                                           self.container)
+        return "Task(uuid={},category={},priority={},depth={},container={})".format(self.uuid,
+                                                                                    self.category,
+                                                                                    self.priority,
+                                                                                    self.depth,
+                                                                                    self.container)
 
     def __lt__(self, other):
-        '''Comparison operator is defined on priority: lowest priority first
+        '''Comparison operator is defined on priority: lowest priority first,
+        then on depth: deepest task first
+
+        Performing tasks of deepest containers first processes dissected
+        containers depth-first which keeps processing queue short.
         '''
-        return (self.priority < other.priority)
+        return ((self.priority, -self.depth) < (other.priority, -other.depth))
 
     @property
     def execution_time(self):
@@ -128,13 +156,22 @@ class Task:
 
         return priority
 
+    def _listed(self):
+        '''Checks if container is either blacklisted or whitelisted
+        '''
+        return (self.container.has_tag(Container.Tag.BLACKLISTED) or
+                self.container.has_tag(Container.Tag.WHITELISTED))
+
     def _perform_hashing(self):
         '''[summary]
         '''
         ## Note:
-        ##    no need to check plugin as it is not really a plugin
+        ##    no need to check plugin as it is not really a plugin, it is
+        ##    an optional HashCache or Prefilter
         LGR.info("Hash computation begins for {}".format(self.container))
-        return Hash(self.container)
+        if self.plugin is None:
+            return Hash(self.container)
+        return self.plugin.hash(self.container)
 
     def _perform_dissection(self):
         '''Generator of Container instances
@@ -146,12 +183,11 @@ class Task:
                                              "invalid plugin: "
                                              "{}".format(self.plugin))
 
-        if not self.plugin.initialized:
-            raise UninitializedPluginException("Uninitialized Dissector given "
-                                               "to task.")
+        # pooled instances are set up once, by the first task using them
+        self.plugin.initialize()
 
         LGR.info("Dissection begins for {}".format(self.container))
-        return self.plugin.dissect(self.container)
+        return self.plugin.containers(self.container)
 
     def _perform_examination(self):
         '''Generator of Examination instances
@@ -163,9 +199,8 @@ class Task:
                                              "invalid plugin: "
                                              "{}".format(self.plugin))
 
-        if not self.plugin.initialized:
-            raise UninitializedPluginException("Uninitialized Examiner given "
-                                               "to task.")
+        # pooled instances are set up once, by the first task using them
+        self.plugin.initialize()
 
         LGR.info("Examination begins for {}".format(self.container))
         return self.plugin.examine(self.container)
@@ -188,6 +223,58 @@ class Task:
         LGR.info("Dissector selection begins for {}".format(self.container))
         return PluginSelector.select_dissectors_for(self.container)
 
+    def _perform_dissection_pipeline(self):
+        '''Generator of Container and Examination instances
+
+        Selects plugins and performs them right away in this worker instead
+        of scheduling one task per selected plugin. A failing plugin does not
+        prevent other plugins from being performed.
+        '''
+        LGR.info("Dissection pipeline begins for {}".format(self.container))
+
+        if self.examine:
+            for examiner in PluginSelector.select_examiners_for(self.container):
+                try:
+                    examiner.initialize()
+                    yield examiner.examine(self.container)
+                except Exception as e:
+                    LGR.exception("Examiner {} failed to examine {}".format(examiner,
+                                                                          self.container))
+
+        for dissector in PluginSelector.select_dissectors_for(self.container):
+            try:
+                dissector.initialize()
+                yield from dissector.containers(self.container)
+            except Exception as e:
+                LGR.exception("Dissector {} failed to dissect {}".format(dissector,
+                                                                       self.container))
+
+    @staticmethod
+    def content_key(container, hash_name, digest):
+        '''Returns the deduplication key of a container: its size and its
+        digest truncated to 128 bits
+
+        Arguments:
+            container {Container} -- Container
+            hash_name {str} -- Algorithm of digest, see Crypto
+            digest {str} -- Hexadecimal digest of container content
+        '''
+        return '{}:{}:{}'.format(hash_name, container.size, digest[:32])
+
+    def _perform_deduplication(self):
+        '''Returns the content key of the container
+
+        Plugin, if any, is the name of the hash algorithm to use.
+        '''
+        ## Note:
+        ##    no need to check plugin as it is not really a plugin
+        LGR.info("Deduplication begins for {}".format(self.container))
+        hash_name = self.plugin or DEDUPLICATION_HASH
+        digest = Crypto.hash(hash_name, self.container)
+        if digest is None:
+            return None
+        return Task.content_key(self.container, hash_name, digest)
+
     def perform(self):
         '''Generator of results
 
@@ -200,6 +287,9 @@ class Task:
             if self.category == Task.Category.HASHING:
                 yield TaskResult(self, self._perform_hashing())
 
+            elif self.category == Task.Category.DEDUPLICATION:
+                yield TaskResult(self, self._perform_deduplication())
+
             elif self.category == Task.Category.DISSECTION:
                 for container in self._perform_dissection():
                     yield TaskResult(self, container)
@@ -209,17 +299,25 @@ class Task:
 
             elif self.category == Task.Category.EXAMINER_SELECTION:
 
-                if self.container.has_tag(Container.Tag.BLACKLISTED|Container.Tag.WHITELISTED):
+                if self._listed():
                     yield TaskResult(self, None)
-
-                yield TaskResult(self, self._perform_examiner_selection())
+                else:
+                    yield TaskResult(self, self._perform_examiner_selection())
 
             elif self.category == Task.Category.DISSECTOR_SELECTION:
 
-                if self.container.has_tag(Container.Tag.BLACKLISTED|Container.Tag.WHITELISTED):
+                if self._listed():
                     yield TaskResult(self, None)
+                else:
+                    yield TaskResult(self, self._perform_dissector_selection())
 
-                yield TaskResult(self, self._perform_dissector_selection())
+            elif self.category == Task.Category.DISSECTION_PIPELINE:
+
+                if self._listed():
+                    yield TaskResult(self, None)
+                else:
+                    for data in self._perform_dissection_pipeline():
+                        yield TaskResult(self, data)
 
             self.succeeded = True
 
@@ -229,4 +327,11 @@ class Task:
             self.succeeded = False
 
         finally:
+            try:
+                # container is persisted once task is completed, compute
+                # its metadata here while we are in a worker
+                self.container.load_metadata()
+            except OSError as e:
+                LGR.warning("Failed to compute container metadata: "
+                            "{}".format(e))
             self.stop_time = time()
@@ -0,0 +1,84 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: watched_queue.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from heapq import heapify
+from asyncio import Queue, PriorityQueue
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class WatchedQueue(Queue):
+    '''WatchedQueue class
+
+    Queue which sets an asyncio.Event each time an item is put or removed,
+    allowing a consumer to wait for a change of its size.
+    '''
+    def __init__(self, event, maxsize=0):
+        '''Constructs the object
+
+        Arguments:
+            event {asyncio.Event} -- Event set on each size change
+
+        Keyword Arguments:
+            maxsize {int} -- Queue bound, 0 means unbounded (default: {0})
+        '''
+        super().__init__(maxsize)
+        self.event = event
+
+    def _put(self, item):
+        super()._put(item)
+        self.event.set()
+
+    def _get(self):
+        item = super()._get()
+        self.event.set()
+        return item
+
+class WatchedPriorityQueue(WatchedQueue, PriorityQueue):
+    '''WatchedPriorityQueue class
+
+    PriorityQueue variant of WatchedQueue.
+    '''
+    def get_first_nowait(self, predicate):
+        '''Removes and returns the first item, in priority order, matching
+        given predicate
+
+        Arguments:
+            predicate {callable} -- Returns True if an item matches
+
+        Returns:
+            Any or None -- None if no queued item matches
+        '''
+        items = [item for item in self._queue if predicate(item)]
+        if not items:
+            return None
+
+        item = min(items)
+        self._queue.remove(item)
+        heapify(self._queue)
+        self._wakeup_next(self._putters)
+        self.event.set()
+        return item
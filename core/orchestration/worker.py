@@ -52,13 +52,25 @@ class Worker:
         LOCAL = 'local'
         REMOTE = 'remote'
 
-    def __init__(self, num, conf, qin, qout):
+    def __init__(self, num, conf, qin, qout, settings=None):
         '''Constructs the object
+
+        Arguments:
+            num {int} -- Worker's number in the pool
+            conf {Configuration} -- Global configuration
+            qin {asyncio.PriorityQueue} -- Tasks queue
+            qout {asyncio.Queue} -- Results queue
+
+        Keyword Arguments:
+            settings {dict} -- Worker's own settings (default: {None})
         '''
         self.num = num
         self.conf = conf
+        self.settings = settings or {}
         self.qin = qin
         self.qout = qout
+        self.backpressure = None
+        self.aborted = False
         self.terminated = None
 
     async def initialize(self):
@@ -85,6 +97,69 @@ class Worker:
         raise NotImplementedError("Worker subclasses must implement "
                                   "terminate() method.")
 
+    async def cancel(self):
+        '''Cancels the task being performed if the worker supports it
+
+        Subclasses may override this method.
+        '''
+        pass
+
+    async def _push(self, task, result):
+        '''Pushes a result of given task in self.qout
+
+        Waits for backpressure admission first, if any. This worker may
+        perform queued tasks meanwhile (see _drain()).
+        '''
+        if self.backpressure is not None:
+            await self.backpressure.admit(task, self._drain)
+        LGR.debug("Pushing result: {}".format(result))
+        await self.qout.put(result)
+
+    async def _perform_task_inline(self, task):
+        '''Performs task in the event loop thread and pushes its results in
+        self.qout
+        '''
+        for result in task.perform():
+            await self._push(task, result)
+
+        return task
+
+    async def _complete(self, task, perform):
+        '''Performs task using given coroutine function then notifies the
+        orchestrator of its completion
+        '''
+        performed = None
+        try:
+            performed = await perform(task)
+        except Exception as e:
+            LGR.exception("Worker n°{}: an exception occured while "
+                          "performing a task. Details below.".format(self.num))
+        finally:
+            # task completion notification, all results of this task
+            # have been pushed before it
+            await self.qout.put(performed or task)
+
+        self.qin.task_done()
+
+    async def _drain(self):
+        '''Performs the first queued task which does not fan out in the event
+        loop thread
+
+        Backpressure calls this method instead of suspending the last running
+        worker, task being performed by this worker is suspended meanwhile.
+
+        Returns:
+            bool -- False if no such task is queued
+        '''
+        task = self.qin.get_first_nowait(self.backpressure.drained)
+        if task is None:
+            return False
+
+        LGR.debug("Worker n°{}: performing queued task: {}".format(self.num,
+                                                                  task))
+        await self._complete(task, self._perform_task_inline)
+        return True
+
     async def _perform_task(self, task):
         '''Performs task asynchronously
 
@@ -92,8 +167,16 @@ class Worker:
 
         This method shall:
             1. perform actual task work
-            2. put (task,result) tuples in self.qout queue for further
-               processing
+            2. push results in self.qout queue for further processing using
+               _push()
+
+        This method may return the performed task when it differs from
+        given task (i.e. a copy performed by another process).
+
+        Note:
+            do_work() pushes the performed task in self.qout once this
+            method returns to notify the orchestrator that the task is
+            completed.
         '''
         raise NotImplementedError("Worker subclasses must implement "
                                   "_perform_task() method.")
@@ -118,6 +201,7 @@ class Worker:
 
             if task.category == Task.Category.ABORT:
                 debug("aborting.")
+                self.aborted = True
                 break
 
             if task.category == Task.Category.EXIT:
@@ -125,10 +209,8 @@ class Worker:
                 break
 
             debug("processing next task: {}".format(task))
-            await self._perform_task(task)
-
+            await self._complete(task, self._perform_task)
             debug("task completed.")
-            self.qin.task_done()
 
         debug("leaving working loop.")
 
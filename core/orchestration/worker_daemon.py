@@ -0,0 +1,182 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: worker_daemon.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from asyncio import (Queue, IncompleteReadError, CancelledError,
+                     ensure_future, start_server, start_unix_server)
+from helper.exception import InvalidMessageException
+from helper.logging.logger import Logger
+from helper.block_cache import configure as configure_block_cache
+from core.orchestration.channel import Channel
+from core.orchestration.local_worker import LocalWorker
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class WorkerDaemon:
+    '''WorkerDaemon class
+
+    Serves RemoteWorker instances. Each connection is bound to a dedicated
+    LocalWorker performing submitted tasks, results are streamed back to the
+    RemoteWorker as they are produced.
+    '''
+    def __init__(self, conf):
+        '''Constructs the object
+
+        Arguments:
+            conf {Configuration} -- [description]
+        '''
+        self.conf = conf
+        self.settings = conf.get('worker_daemon', {})
+        configure_block_cache(conf.get('block_cache'))
+        self.server = None
+        self.connections = 0
+
+    async def _relay(self, channel, task, qout):
+        '''Sends results pushed by the worker until None is received
+        '''
+        while True:
+            result = await qout.get()
+
+            if result is None:
+                break
+
+            await channel.send(Channel.Message.RESULT, task.uuid, result)
+
+    async def _perform_task(self, channel, worker, task):
+        '''Performs a task and streams results back to the RemoteWorker
+        '''
+        LGR.debug("Performing task for {}: {}".format(channel, task))
+        relay = ensure_future(self._relay(channel, task, worker.qout))
+
+        try:
+            performed = await worker._perform_task(task)
+
+        except CancelledError:
+            LGR.info("Task cancelled by {}: {}".format(channel, task))
+            if worker.process is not None:
+                # child process might still be performing the task
+                worker._kill()
+                worker._spawn()
+            raise
+
+        finally:
+            await worker.qout.put(None)
+            await relay
+
+        await channel.send(Channel.Message.DONE, task.uuid, performed)
+
+    async def _handle(self, reader, writer):
+        '''Handles a connection from a RemoteWorker
+        '''
+        channel = Channel(reader, writer, self.settings.get('secret'))
+        LGR.info("Remote worker connected: {}".format(channel))
+
+        self.connections += 1
+        # bounded results queue: a stalled RemoteWorker stops reading the
+        # channel which eventually suspends the task producing results
+        worker = LocalWorker(self.connections, self.conf, None,
+                             Queue(self.conf.get('max_queued_results', 1024)))
+        await worker.initialize()
+
+        running = {}
+        try:
+            while True:
+                (message, uuid, data) = await channel.recv()
+
+                if message == Channel.Message.PING:
+                    await channel.send(Channel.Message.PONG)
+
+                elif message == Channel.Message.SUBMIT:
+                    if running:
+                        # a connection is bound to a single worker which
+                        # performs one task at a time
+                        await channel.send(Channel.Message.ERROR, uuid,
+                                           "a task is already running.")
+                        continue
+
+                    future = ensure_future(self._perform_task(channel,
+                                                              worker,
+                                                              data))
+                    future.add_done_callback(lambda f, u=uuid: running.pop(u, None))
+                    running[uuid] = future
+
+                elif message == Channel.Message.CANCEL:
+                    future = running.get(uuid)
+                    if future is not None:
+                        future.cancel()
+
+                else:
+                    LGR.warning("Unexpected message from {}: "
+                                "{}".format(channel, message))
+
+        except (IncompleteReadError, OSError) as e:
+            LGR.info("Remote worker disconnected: {}".format(channel))
+
+        except InvalidMessageException as e:
+            LGR.exception("Invalid message received from {}, closing "
+                          "connection.".format(channel))
+
+        finally:
+            for future in list(running.values()):
+                future.cancel()
+            worker.aborted = bool(running)
+            await worker.terminate()
+            await channel.close()
+
+    async def start(self):
+        '''Starts listening for RemoteWorker connections
+
+        Listens on a Unix socket if 'path' setting is given, on a TCP socket
+        otherwise.
+
+        Raises:
+            ValueError -- 'secret' setting is missing
+        '''
+        if not self.settings.get('secret'):
+            raise ValueError("worker daemon requires a secret shared with "
+                             "remote workers.")
+
+        path = self.settings.get('path')
+
+        if path is not None:
+            self.server = await start_unix_server(self._handle, path=path)
+            LGR.info("Worker daemon listening on {}".format(path))
+        else:
+            host = self.settings.get('host', '127.0.0.1')
+            port = self.settings.get('port', 9443)
+            self.server = await start_server(self._handle, host, port)
+            LGR.info("Worker daemon listening on {}:{}".format(host, port))
+
+    async def serve(self):
+        '''Serves RemoteWorker connections until cancelled
+        '''
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
@@ -27,7 +27,9 @@
 # =============================================================================
 from enum import Enum
 from asyncio import gather, PriorityQueue, Queue
+from plugins.plugins import PLUGINS
 from helper.logging.logger import Logger
+from helper.block_cache import block_cache
 from core.orchestration.task import Task
 from core.orchestration.worker import Worker
 from core.orchestration.local_worker import LocalWorker
@@ -44,7 +46,7 @@ class WorkerPool:
 
     Represents a pool of workers.
     '''
-    def __init__(self, conf, qin, qout):
+    def __init__(self, conf, qin, qout, backpressure=None):
         '''Constructs the object
 
         Arguments:
@@ -53,10 +55,16 @@ class WorkerPool:
             qin {asyncio.PriorityQueue} -- [description]
             qout {asyncio.Queue} -- [description]
             configuration {Configuration} -- [description]
+
+        Keyword Arguments:
+            backpressure {Backpressure} -- Shared by workers of the pool to
+                                           suspend fan-out tasks
+                                           (default: {None})
         '''
         self.conf = conf
         self.qin = qin
         self.qout = qout
+        self.backpressure = backpressure
         self.workers = []
         self.workers_coro = None
 
@@ -87,31 +95,55 @@ class WorkerPool:
 
         self.workers = []
 
-        category = self.conf.worker_category
-        if category == Worker.Category.LOCAL:
-            worker_cls = LocalWorker
-        elif category == Worker.Category.REMOTE:
-            worker_cls = RemoteWorker
-        else:
-            ValueError("Configuration value for worker_category does not "
-                       "match any known value: {}".format(category))
+        settings = self.conf.get('workers') or []
 
         for k in range(self.conf.max_workers):
+            # each worker may override worker_category in its own settings
+            # which allows mixing local and remote workers in the pool
+            worker_settings = settings[k] if k < len(settings) else {}
+            category = Worker.Category(worker_settings.get('category',
+                                                           self.conf.worker_category))
+            if category == Worker.Category.LOCAL:
+                worker_cls = LocalWorker
+            elif category == Worker.Category.REMOTE:
+                worker_cls = RemoteWorker
+            else:
+                raise ValueError("Configuration value for worker_category "
+                                 "does not match any known value: "
+                                 "{}".format(category))
 
             worker = worker_cls(k,
                                 self.conf,
                                 self.qin,
-                                self.qout)
+                                self.qout,
+                                worker_settings)
+
+            if not await worker.initialize():
+                LGR.error("Worker n°{} initialization failed, it won't be "
+                          "part of the pool.".format(k))
+                continue
 
-            await worker.initialize()
+            worker.backpressure = self.backpressure
             self.workers.append(worker)
 
+        if not self.workers:
+            raise RuntimeError("No worker could be initialized!")
+
+        if self.backpressure is not None:
+            self.backpressure.workers = len(self.workers)
+
     async def free(self):
         '''Frees workers used by the pool
+
+        Plugin instances pooled by this process (i.e. used by inline workers)
+        are released as well.
         '''
         for worker in self.workers:
             await worker.terminate()
         self.workers = []
+        PLUGINS.release()
+        if block_cache().enabled:
+            LGR.info("Block cache: {}".format(block_cache()))
 
     async def start(self):
         '''Starts workers in the pool
@@ -142,6 +174,8 @@ class WorkerPool:
         for _ in self.workers:
             await self.qin.put(Task(Task.Category.ABORT, None, None))
         LGR.debug("ABORT tasks injected.")
+        for worker in self.workers:
+            await worker.cancel()
 
     async def join(self):
         '''Gives worker the order to start consuming tasks
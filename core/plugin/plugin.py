@@ -33,6 +33,21 @@ from helper.logging.logger import Logger
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
 # =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def pooled_instance(category, name):
+    '''Returns pooled instance of a plugin from the registry of current process
+
+    Used to unpickle pooled plugin instances.
+
+    Arguments:
+        category {Plugin.Category} -- Plugin's category
+        name {str} -- Plugin's name
+    '''
+    # plugins.plugins imports this module, import registry lazily
+    from plugins.plugins import PLUGINS
+    return PLUGINS.pooled_instance(category, name)
+# =============================================================================
 #  CLASSES
 # =============================================================================
 class Plugin:
@@ -91,3 +106,47 @@ class PluginInstance:
         self.conf = conf
         self.logger = Logger(Logger.Category.PLUGIN,
                              self.__class__.__name__)
+        self.initialized = False
+        self.pool_key = None
+
+    def __reduce__(self):
+        '''Pickling support
+
+        Plugin instances may hold handles which cannot be pickled (parsers,
+        file objects, ...). They are shipped to other processes as their
+        class and configuration and instanciated again on the other side.
+        Pooled instances are shipped as their pool key and resolved to the
+        pooled instance of the other side.
+        '''
+        if self.pool_key is not None:
+            return (pooled_instance, self.pool_key)
+        return (self.__class__, (self.conf,))
+
+    def setup(self):
+        '''Performs heavyweight initialization (handles, parser tables, ...)
+
+        Subclasses may override this method. It is called once before the
+        first task using this instance is performed.
+        '''
+        pass
+
+    def teardown(self):
+        '''Releases resources allocated by setup()
+
+        Subclasses may override this method.
+        '''
+        pass
+
+    def initialize(self):
+        '''Calls setup() if it has not been called yet
+        '''
+        if not self.initialized:
+            self.setup()
+            self.initialized = True
+
+    def finalize(self):
+        '''Calls teardown() if setup() has been called
+        '''
+        if self.initialized:
+            self.initialized = False
+            self.teardown()
@@ -49,47 +49,56 @@ class PluginSelector:
         return conn
 
     @staticmethod
-    def select_examiners_for(container):
-        '''[summary]
+    def _select_for(container, category, check):
+        '''Selects pooled plugin instances of given category able to process
+        given container
+
+        Candidates are looked up in the MIME type index of the registry, only
+        their check method is called.
 
         Arguments:
-            container {[type]} -- [description]
+            container {Container} -- [description]
+            category {Plugin.Category} -- [description]
+            check {str} -- name of the instance method checking container
         '''
-        count = 0
-        examiners = []
+        selected = []
 
-        for name, plugin in PLUGINS.plugins(Plugin.Category.EXAMINER):
-            count += 1
-            examiner = plugin.instance(None)
+        for name in PLUGINS.candidates(category, container.mime_type):
+            instance = PLUGINS.pooled_instance(category, name)
 
-            if examiner.can_examine(container):
-                LGR.debug("Examiner selected: {}".format(name))
-                examiners.append(examiner)
+            try:
+                if getattr(instance, check)(container):
+                    LGR.debug("{} selected: {}".format(category.value, name))
+                    selected.append(instance)
+            except NotImplementedError as e:
+                LGR.debug("{} skipped: {}".format(category.value, e))
 
-        if count == 0:
-            LGR.warning("No examiner plugin registered.")
-
-        return examiners
+        return selected
 
     @staticmethod
-    def select_dissectors_for(container):
+    def select_examiners_for(container):
         '''[summary]
 
         Arguments:
             container {[type]} -- [description]
         '''
-        count = 0
-        dissectors = []
+        if not PLUGINS.plugins(Plugin.Category.EXAMINER):
+            LGR.warning("No examiner plugin registered.")
 
-        for name, plugin in PLUGINS.plugins(Plugin.Category.DISSECTOR):
-            count += 1
-            dissector = plugin.instance(None)
+        return PluginSelector._select_for(container,
+                                          Plugin.Category.EXAMINER,
+                                          'can_examine')
 
-            if dissectors.can_dissect(container):
-                LGR.debug("Dissector selected: {}".format(name))
-                dissectors.append(dissector)
+    @staticmethod
+    def select_dissectors_for(container):
+        '''[summary]
 
-        if count == 0:
+        Arguments:
+            container {[type]} -- [description]
+        '''
+        if not PLUGINS.plugins(Plugin.Category.DISSECTOR):
             LGR.warning("No dissector plugin registered.")
 
-        return dissectors
+        return PluginSelector._select_for(container,
+                                          Plugin.Category.DISSECTOR,
+                                          'can_dissect')
@@ -32,6 +32,8 @@ from helper.formatting.formatter import Formatter
 #  GLOBALS
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+WILDCARD = '*/*'
+INDEXED_CATEGORIES = (Plugin.Category.DISSECTOR, Plugin.Category.EXAMINER)
 # =============================================================================
 #  CLASSES
 # =============================================================================
@@ -45,6 +47,9 @@ class Registry:
         '''
         super(Registry, self).__init__()
         self._plugins = {}
+        self._pool = {}
+        self._mime_index = {}
+        self._candidates = {}
 
     def list(self):
         '''Prints a human readable list of plugins
@@ -67,6 +72,73 @@ class Registry:
         # register an instance of the plugin
         self._plugins[plugin.category][plugin.name] = plugin
 
+        if plugin.category in INDEXED_CATEGORIES:
+            self._index(plugin)
+
+    def _index(self, plugin):
+        '''Adds plugin to the MIME type index of its category
+
+        Plugins which do not implement supported_mime_types() or return None
+        are indexed as supporting any MIME type.
+
+        Arguments:
+            plugin {Plugin} -- [description]
+        '''
+        try:
+            mime_types = plugin.instance(None).supported_mime_types()
+        except NotImplementedError as e:
+            mime_types = None
+
+        if mime_types is None:
+            mime_types = [WILDCARD]
+
+        index = self._mime_index.setdefault(plugin.category, {})
+        for mime_type in mime_types:
+            mime_type = mime_type.lower()
+            if mime_type == '*':
+                mime_type = WILDCARD
+            names = index.setdefault(mime_type, [])
+            if plugin.name not in names:
+                names.append(plugin.name)
+
+        self._candidates = {}
+
+    def candidates(self, category, mime_type):
+        '''Returns names of plugins supporting given MIME type
+
+        Plugins indexed for the exact MIME type come first, then plugins
+        indexed for its major type (e.g. "text/*") and then plugins indexed
+        for any MIME type. Results are cached per MIME type.
+
+        Arguments:
+            category {Plugin.Category} -- [description]
+            mime_type {str} -- MIME type or None if unknown
+
+        Returns:
+            list -- [description]
+        '''
+        key = (category, mime_type)
+        names = self._candidates.get(key)
+
+        if names is None:
+            index = self._mime_index.get(category, {})
+            keys = [WILDCARD]
+            if mime_type is not None:
+                mime_type = mime_type.lower()
+                keys = [mime_type,
+                        '{}/*'.format(mime_type.split('/', 1)[0]),
+                        WILDCARD]
+
+            names = []
+            for k in keys:
+                for name in index.get(k, []):
+                    if name not in names:
+                        names.append(name)
+
+            self._candidates[key] = names
+
+        return names
+
     def plugins(self, category):
         '''[summary]
 
@@ -98,3 +170,41 @@ class Registry:
             return None
 
         return plugin.instance(conf, **kwargs)
+
+    def pooled_instance(self, category, name):
+        '''Returns the pooled instance of a plugin
+
+        Pooled instances are created once per process and reused until
+        release() is called. They are instanciated without configuration.
+
+        Arguments:
+            category {Plugin.Category} -- [description]
+            name {str} -- [description]
+
+        Returns:
+            PluginInstance or None -- [description]
+        '''
+        key = (category, name)
+        instance = self._pool.get(key)
+
+        if instance is None:
+            instance = self.instanciate(category, name, None)
+            if instance is None:
+                return None
+
+            instance.pool_key = key
+            self._pool[key] = instance
+
+        return instance
+
+    def release(self):
+        '''Finalizes and drops all pooled instances
+        '''
+        for (key, instance) in self._pool.items():
+            try:
+                instance.finalize()
+            except Exception as e:
+                LGR.exception("Failed to finalize plugin instance: "
+                              "{}".format(instance))
+
+        self._pool = {}
@@ -25,16 +25,38 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+import os
 from io import SEEK_SET
 from enum import Enum
 from pathlib import Path
+from threading import Lock
 from helper.memory_map import MemoryMap
+from helper.block_cache import block_cache
 from helper.logging.logger import Logger
 from helper.formatting.formatter import Formatter
 # =============================================================================
 #  GLOBALS / CONFIG
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+# positional reads do not use (nor move) the shared file position, they are
+# not available on every platform
+PREAD = hasattr(os, 'pread')
+PREADV = hasattr(os, 'preadv')
+SHARED_MAX = 64
+SHARED_LOCK = Lock()
+SHARED = {}
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def _reset_shared():
+    '''Drops shared handles inherited from parent process
+    '''
+    global SHARED_LOCK, SHARED
+    SHARED_LOCK = Lock()
+    SHARED = {}
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_shared)
 # =============================================================================
 #  CLASSES
 # =============================================================================
@@ -63,6 +85,46 @@ class BinFile:
         '''
         return path.is_file()
 
+    @staticmethod
+    def shared(path):
+        '''Returns an opened read-only BinFile shared by all users of given
+        path in this process
+
+        Shared instances must be read using positional reads (i.e. giving
+        seek argument) as their file position is shared. Calling close()
+        releases the instance, idle instances are kept opened for reuse until
+        more than SHARED_MAX files are shared.
+
+        Arguments:
+            path {Path} -- path of the file
+
+        Returns:
+            BinFile or None -- None if the file cannot be opened
+        '''
+        key = str(Path(path).resolve())
+
+        with SHARED_LOCK:
+            bf = SHARED.get(key)
+
+            if bf is None:
+                bf = BinFile(Path(key))
+                if not bf.open():
+                    return None
+
+                bf.users = 0
+                SHARED[key] = bf
+
+                if len(SHARED) > SHARED_MAX:
+                    for (other_key, other) in list(SHARED.items()):
+                        if other.users == 0 and other is not bf:
+                            other.users = None
+                            BinFile.close(other)
+                            del SHARED[other_key]
+
+            bf.users += 1
+
+        return bf
+
     def __init__(self, path, mode=OpenMode.READ):
         '''Constructs an object
 
@@ -71,6 +133,9 @@ class BinFile:
             mode {[type]} -- [description]
         '''
         self.fp = None
+        self.identity = None
+        self.lock = Lock()
+        self.users = None
         self.path = path if isinstance(path, Path) else Path(path)
         self.mode = BinFile.OpenMode(mode)
         self.dirname = path.parent
@@ -80,10 +145,13 @@ class BinFile:
     def __enter__(self):
         '''Context manager __enter__ to enable the use of "with" statement
 
+        Shared instances are already opened.
+
         Returns:
             BinFile -- Instance of binary file
         '''
-        self.open()
+        if self.users is None:
+            self.open()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -120,6 +188,11 @@ class BinFile:
             self.fp = None
             return False
 
+        if self.mode == BinFile.OpenMode.READ:
+            # identifies file content for the block cache
+            st = os.fstat(self.fp.fileno())
+            self.identity = (st.st_dev, st.st_ino, st.st_mtime_ns)
+
         return True
 
     def close(self):
@@ -128,12 +201,19 @@ class BinFile:
         Returns:
             bool -- [description]
         '''
+        if self.users is not None:
+            # shared instance: release it, it remains opened for reuse
+            with SHARED_LOCK:
+                self.users = max(0, self.users - 1)
+            return True
+
         if self.fp is None:
             LGR.warning("File is already closed: {}".format(self))
             return False
 
         self.fp.close()
         self.fp = None
+        self.identity = None
         return True
 
     def stat(self):
@@ -177,32 +257,80 @@ class BinFile:
         Returns:
             [type] -- [description]
         '''
-        return self.read(n, seek).decode(encoding)
+        return self.read(size, seek).decode(encoding)
 
-    def read(self, size=-1, seek=None):
-        '''[summary]
+    def read(self, size=-1, seek=None, cached=True):
+        '''Reads size bytes from current position or from seek offset
+
+        Reads from seek offset are positional: they do not depend on nor
+        move the file position, hence they can be performed concurrently
+        by several threads. Small positional reads of files opened for
+        reading go through the block cache of this process unless cached
+        is False.
 
         Keyword Arguments:
             size {number} -- [description] (default: {-1})
             seek {[type]} -- [description] (default: {None})
+            cached {bool} -- Use the block cache, sequential reads of a
+                             whole file (e.g. hashing) shall not
+                             (default: {True})
 
         Returns:
             [type] -- [description]
         '''
-        if isinstance(seek, int):
-            self.seek(seek)
-        return self.fp.read(size)
+        if not isinstance(seek, int):
+            return self.fp.read(size)
 
-    def readinto(self, b):
-        '''[summary]
+        if size < 0:
+            size = max(0, self.size() - seek)
+
+        if cached and self.identity is not None:
+            return block_cache().read(self.identity, self._pread, size, seek)
+
+        return self._pread(size, seek)
+
+    def _pread(self, size, seek):
+        '''Reads size bytes from seek offset without using file position
+        '''
+        if PREAD:
+            return os.pread(self.fp.fileno(), size, seek)
+
+        with self.lock:
+            self.fp.seek(seek)
+            return self.fp.read(size)
+
+    def readinto(self, b, seek=None, cached=True):
+        '''Reads bytes into a pre-allocated, writable bytes-like object from
+        current position or from seek offset
+
+        See read() for details about reads from seek offset and cached.
 
         Arguments:
             b {[type]} -- [description]
 
+        Keyword Arguments:
+            seek {[type]} -- [description] (default: {None})
+            cached {bool} -- Use the block cache (default: {True})
+
         Returns:
-            [type] -- [description]
+            int -- number of bytes read
         '''
-        return self.fp.readinto(b)
+        if not isinstance(seek, int):
+            return self.fp.readinto(b)
+
+        view = memoryview(b).cast('B')
+        if (cached and self.identity is not None and
+                len(view) <= block_cache().max_read):
+            data = self.read(len(view), seek)
+            view[:len(data)] = data
+            return len(data)
+
+        if PREADV:
+            return os.preadv(self.fp.fileno(), [b], seek)
+
+        with self.lock:
+            self.fp.seek(seek)
+            return self.fp.readinto(b)
 
     def write_text(self, text, encoding='utf-8'):
         '''[summary]
@@ -238,7 +366,9 @@ class BinFile:
         self.fp.flush()
 
     def mmap(self, start, size, unit=1):
-        '''[summary]
+        '''Maps a region of the file in memory, file must be opened
+
+        MemoryMap shall be closed once it is not needed anymore.
 
         Arguments:
             start {int} -- Start offset (in units)
@@ -0,0 +1,180 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: block_cache.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+import os
+from threading import Lock
+from collections import OrderedDict
+from helper.logging.logger import Logger
+from helper.formatting.formatter import Formatter
+# =============================================================================
+#  GLOBALS / CONFIG
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_MAX_READ = 1024 * 1024
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class BlockCache:
+    '''BlockCache class
+
+    LRU cache of fixed-size blocks read from files, keyed by file identity
+    (device, inode, modification time) and block index. Reads larger than
+    max_read bypass the cache so that large reads do not evict metadata
+    blocks read repeatedly by dissectors. Sequential reads of whole files
+    (e.g. hashing) bypass it explicitly, see BinFile.read(cached=False).
+    '''
+    def __init__(self,
+                 size=0,
+                 block_size=DEFAULT_BLOCK_SIZE,
+                 max_read=DEFAULT_MAX_READ):
+        '''Constructs the object
+
+        Keyword Arguments:
+            size {int} -- Cache size in bytes, 0 disables the cache
+                          (default: {0})
+            block_size {int} -- Size of a block in bytes
+                                (default: {DEFAULT_BLOCK_SIZE})
+            max_read {int} -- Reads larger than this size bypass the cache
+                              (default: {DEFAULT_MAX_READ})
+        '''
+        self.block_size = block_size
+        self.max_read = max_read
+        self.capacity = max(0, size // block_size)
+        self.lock = Lock()
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "BlockCache(blocks={}/{},block_size={},hit_rate={:.1%})".format(
+            len(self.blocks),
+            self.capacity,
+            Formatter.format_size(self.block_size),
+            self.hit_rate)
+
+    @property
+    def enabled(self):
+        return (self.capacity > 0)
+
+    @property
+    def hit_rate(self):
+        '''Ratio of blocks read from cache
+        '''
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def clear(self):
+        '''Drops all cached blocks and resets statistics
+        '''
+        self.lock = Lock()
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _block(self, identity, idx, loader):
+        '''Returns block idx of given file, loading it on cache miss
+        '''
+        key = (identity, idx)
+
+        with self.lock:
+            data = self.blocks.get(key)
+            if data is not None:
+                self.blocks.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = loader(self.block_size, idx * self.block_size)
+
+        with self.lock:
+            self.blocks[key] = data
+            while len(self.blocks) > self.capacity:
+                self.blocks.popitem(last=False)
+
+        return data
+
+    def read(self, identity, loader, size, seek):
+        '''Reads size bytes from seek offset of a file
+
+        Arguments:
+            identity {tuple} -- Identity of the file
+            loader {callable} -- loader(size, seek) reads from the file
+            size {int} -- Number of bytes to read
+            seek {int} -- Offset of the first byte to read
+
+        Returns:
+            bytes -- [description]
+        '''
+        if not self.enabled or size > self.max_read or size <= 0:
+            return loader(size, seek)
+
+        first = seek // self.block_size
+        last = (seek + size - 1) // self.block_size
+
+        chunks = []
+        for idx in range(first, last + 1):
+            data = self._block(identity, idx, loader)
+            chunks.append(data)
+            if len(data) < self.block_size:
+                # end of file
+                break
+
+        start = seek - first * self.block_size
+        data = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+        return data[start:start + size]
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+BLOCK_CACHE = BlockCache()
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def configure(settings):
+    '''Configures the block cache of this process
+
+    Arguments:
+        settings {dict} -- block_cache configuration section or None
+    '''
+    global BLOCK_CACHE
+    settings = settings or {}
+    BLOCK_CACHE = BlockCache(settings.get('size', 0),
+                             settings.get('block_size', DEFAULT_BLOCK_SIZE),
+                             settings.get('max_read', DEFAULT_MAX_READ))
+
+def block_cache():
+    '''Returns the block cache of this process
+    '''
+    return BLOCK_CACHE
+
+if hasattr(os, 'register_at_fork'):
+    # cached blocks and lock state are not inherited
+    os.register_at_fork(after_in_child=lambda: BLOCK_CACHE.clear())
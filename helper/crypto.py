@@ -25,6 +25,10 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from os import getpid
+from time import time
+from hashlib import new as hashlib_new, algorithms_available
+from concurrent.futures import ThreadPoolExecutor
 from Crypto.Hash import MD2, MD4, MD5, SHA1
 from Crypto.Hash import SHA224, SHA256, SHA384, SHA512
 from Crypto.Hash import SHA3_224, SHA3_256, SHA3_384, SHA3_512
@@ -47,13 +51,130 @@ HASH_CLASSES = {
     'SHA3-384': SHA3_384,
     'SHA3-512': SHA3_512,
 }
+# hashlib implementations are preferred when available as they release the
+# GIL while hashing large buffers
+HASHLIB_NAMES = {
+    'MD4': 'md4',
+    'MD5': 'md5',
+    'SHA1': 'sha1',
+    'SHA-224': 'sha224',
+    'SHA-256': 'sha256',
+    'SHA-384': 'sha384',
+    'SHA-512': 'sha512',
+    'SHA3-224': 'sha3_224',
+    'SHA3-256': 'sha3_256',
+    'SHA3-384': 'sha3_384',
+    'SHA3-512': 'sha3_512',
+    'BLAKE2b': 'blake2b',
+}
+EXECUTOR = None
+EXECUTOR_PID = None
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def executor():
+    '''Returns the thread pool used to update digests in parallel
+
+    The pool is created lazily by each process using it because threads do
+    not survive a fork.
+    '''
+    global EXECUTOR, EXECUTOR_PID
+    if EXECUTOR_PID != getpid():
+        EXECUTOR = ThreadPoolExecutor(max_workers=len(HASH_CLASSES))
+        EXECUTOR_PID = getpid()
+    return EXECUTOR
 # =============================================================================
 #  CLASSES
 # =============================================================================
+class MultiHasher:
+    '''Computes several digests of a file in a single pass
+
+    Data is read using large readinto() calls in two alternating buffers:
+    digests are updated in parallel threads from one buffer while the next
+    chunk is read into the other one.
+    '''
+    BUFFER_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, hash_names, buffer_size=BUFFER_SIZE):
+        '''Constructs the object
+
+        Arguments:
+            hash_names {list(str)} -- Names of the hashes to compute, see
+                                      HASH_CLASSES keys
+
+        Keyword Arguments:
+            buffer_size {int} -- Size of a read (default: {BUFFER_SIZE})
+        '''
+        self.hashes = [Crypto._instanciate_hash(h) for h in hash_names]
+        self.buffer_size = buffer_size
+        self.processed = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        '''Hashing throughput in MB/s
+        '''
+        if self.elapsed == 0:
+            return 0.0
+        return self.processed / self.elapsed / (1024 * 1024)
+
+    def _update(self, view):
+        '''Updates all digests with given data
+        '''
+        if len(self.hashes) == 1 or len(view) < self.buffer_size:
+            for h in self.hashes:
+                h.update(view)
+            return []
+
+        return [executor().submit(h.update, view) for h in self.hashes]
+
+    def update_from(self, bf, size):
+        '''Updates all digests with the content of an opened file
+
+        File is read using positional reads, bf may be a shared BinFile.
+        Reads bypass the block cache whatever the size of the file: content
+        is read once and would only evict blocks read by dissectors.
+
+        Arguments:
+            bf {BinFile} -- Opened binary file
+            size {int} -- Expected size of the file
+        '''
+        start = time()
+        # size is unknown (0) for block devices and may be outdated
+        length = min(size, self.buffer_size) if size > 0 else self.buffer_size
+        buffers = [bytearray(length)]
+        if length == self.buffer_size:
+            buffers.append(bytearray(length))
+
+        k = 0
+        offset = 0
+        count = bf.readinto(buffers[k], offset, cached=False)
+        while count:
+            futures = self._update(memoryview(buffers[k])[:count])
+            self.processed += count
+            offset += count
+            # read next chunk while digests are being updated
+            k = (k + 1) % len(buffers)
+            count = bf.readinto(buffers[k], offset, cached=False)
+            for future in futures:
+                future.result()
+
+        self.elapsed += time() - start
+
+    def hexdigests(self):
+        '''Returns the list of hexadecimal digests
+        '''
+        return [h.hexdigest() for h in self.hashes]
+
 class Crypto:
     '''Provides high-level cryptographic pimitives for Datashark
     '''
     def _instanciate_hash(hash_name):
+        hashlib_name = HASHLIB_NAMES.get(hash_name)
+
+        if hashlib_name in algorithms_available:
+            return hashlib_new(hashlib_name)
+
         hash_cls = HASH_CLASSES.get(hash_name)
 
         if hash_cls is None:
@@ -67,8 +188,14 @@ class Crypto:
 
         Arguments:
             container {Container} -- Container to hash
+
+        Returns:
+            str or None -- None if the container cannot be read
         '''
-        return Crypto.multihash([hash_name], container)[0]
+        digests = Crypto.multihash([hash_name], container)
+        if digests is None:
+            return None
+        return digests[0]
 
     @staticmethod
     def multihash(hash_names, container):
@@ -80,21 +207,20 @@ class Crypto:
             hashes {[type]} -- [description]
             container {[type]} -- [description]
         '''
-        hashes = [Crypto._instanciate_hash(h) for h in hash_names]
+        hasher = MultiHasher(hash_names)
 
         bf = container.bin_file()
-        remaining = bf.size()
+        size = bf.size()
 
         if not bf.open():
             LGR.error("Failed to open file for hashing.")
             return None
 
-        while remaining > 0:
-            data = bf.read(10240)
-            remaining -= len(data)
-            for h in hashes:
-                h.update(data)
-
-        bf.close()
+        try:
+            hasher.update_from(bf, size)
+        finally:
+            bf.close()
 
-        return [h.hexdigest() for h in hashes]
+        LGR.debug("Hashed {} bytes at {:.1f} MB/s".format(hasher.processed,
+                                                          hasher.throughput))
+        return hasher.hexdigests()
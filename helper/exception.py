@@ -40,3 +40,6 @@ class DatabaseInitializationException(Exception):
 class MSWindowsSpecificFeatureException(Exception):
     pass
 
+class InvalidMessageException(Exception):
+    pass
+
@@ -0,0 +1,243 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: extent_file.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from io import SEEK_END
+from bisect import bisect_right
+from threading import Lock
+from helper.logging.logger import Logger
+from helper.formatting.formatter import Formatter
+# =============================================================================
+#  GLOBALS / CONFIG
+# =============================================================================
+LGR = Logger(Logger.Category.CORE, __name__)
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class ExtentFile:
+    '''Read-only file made of extents of a source file
+
+    Source is opened by calling opener, it can be a BinFile (or another
+    ExtentFile), read using positional reads, or any binary file object,
+    read using seek() and read() under a lock. Without extents, the whole
+    source is the content of the file.
+
+    Exposes the reading interface of BinFile.
+    '''
+    def __init__(self, opener, extents=None):
+        '''Constructs an object
+
+        Arguments:
+            opener {callable} -- Returns the source, it must be picklable
+                                 as containers are sent to other processes
+
+        Keyword Arguments:
+            extents {list(tuple)} -- (offset, length) extents within the
+                                     source, offset None denotes a sparse
+                                     extent reading as zeros (default: {None})
+        '''
+        self.opener = opener
+        self.extents = extents
+        self.src = None
+        self.lock = Lock()
+        self.position = 0
+        self._size = None
+        self._starts = None
+
+        if extents is not None:
+            self._starts = []
+            self._size = 0
+            for (offset, length) in extents:
+                self._starts.append(self._size)
+                self._size += length
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return "ExtentFile(opener={},extents={})".format(self.opener,
+                                                         self.extents)
+
+    def __enter__(self):
+        '''Context manager __enter__ to enable the use of "with" statement
+        '''
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''Context manager __exit__ to enable the use of "with" statement
+        '''
+        if exc_type:
+            LGR.exception("An exception occured within caller with statement.")
+        self.close()
+
+    def is_valid(self):
+        '''
+        '''
+        return (self.src is not None)
+
+    def open(self):
+        '''Opens the source
+
+        Returns:
+            bool -- [description]
+        '''
+        if self.src is not None:
+            LGR.warning("File is already opened: {}".format(self))
+            return False
+
+        try:
+            src = self.opener()
+            if src is None:
+                return False
+            if hasattr(src, 'is_valid') and not src.is_valid():
+                if not src.open():
+                    return False
+        except Exception as e:
+            LGR.exception("File open operation failed: {}".format(self))
+            return False
+
+        self.src = src
+        self.position = 0
+        return True
+
+    def close(self):
+        '''Closes the source
+
+        Returns:
+            bool -- [description]
+        '''
+        if self.src is None:
+            LGR.warning("File is already closed: {}".format(self))
+            return False
+
+        self.src.close()
+        self.src = None
+        return True
+
+    def size(self):
+        '''Returns the size of the file
+
+        Without extents, source is opened temporarily if needed.
+        '''
+        if self._size is None and self.src is None:
+            with self:
+                return self.size()
+
+        if self._size is None:
+            if hasattr(self.src, 'size'):
+                self._size = self.src.size()
+            else:
+                with self.lock:
+                    self._size = self.src.seek(0, SEEK_END)
+
+        return self._size
+
+    def _read_src(self, size, offset, cached=True):
+        '''Reads size bytes from offset of the source
+        '''
+        if offset is None:
+            return bytes(size)
+
+        if hasattr(self.src, 'is_valid'):
+            return self.src.read(size, offset, cached)
+
+        with self.lock:
+            self.src.seek(offset)
+            return self.src.read(size)
+
+    def read(self, size=-1, seek=None, cached=True):
+        '''Reads size bytes from current position or from seek offset
+
+        Reads from seek offset do not move the position.
+
+        Keyword Arguments:
+            size {number} -- [description] (default: {-1})
+            seek {[type]} -- [description] (default: {None})
+            cached {bool} -- Use the block cache when reading the source,
+                             see BinFile.read() (default: {True})
+
+        Returns:
+            bytes -- [description]
+        '''
+        position = seek if isinstance(seek, int) else self.position
+        end = self.size()
+        if size >= 0:
+            end = min(end, position + size)
+
+        if end <= position:
+            data = b''
+        elif self.extents is None:
+            data = self._read_src(end - position, position, cached)
+        else:
+            chunks = []
+            k = bisect_right(self._starts, position) - 1
+            cursor = position
+            while cursor < end:
+                (offset, length) = self.extents[k]
+                skip = cursor - self._starts[k]
+                count = min(length - skip, end - cursor)
+                chunk = self._read_src(count,
+                                       None if offset is None else offset + skip,
+                                       cached)
+                chunks.append(chunk)
+                if len(chunk) < count:
+                    # source is shorter than expected
+                    break
+                cursor += count
+                k += 1
+            data = b''.join(chunks)
+
+        if not isinstance(seek, int):
+            self.position += len(data)
+
+        return data
+
+    def readinto(self, b, seek=None, cached=True):
+        '''Reads bytes into a pre-allocated, writable bytes-like object from
+        current position or from seek offset
+
+        Returns:
+            int -- number of bytes read
+        '''
+        view = memoryview(b).cast('B')
+        data = self.read(len(view), seek, cached)
+        view[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        '''Moves current position, see io.IOBase.seek()
+        '''
+        if whence == 1:
+            offset += self.position
+        elif whence == 2:
+            offset += self.size()
+        self.position = max(0, offset)
+        return self.position
+
+    def dump(self, size=-1, seek=None):
+        '''Prints an hexdump of `size` bytes from `seek` offset.
+        '''
+        return Formatter.hexdump(self.read(size, seek))
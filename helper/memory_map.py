@@ -25,12 +25,17 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+import mmap as mmap_module
+from struct import calcsize
+from mmap import mmap, ACCESS_READ, ALLOCATIONGRANULARITY, PAGESIZE
 from helper.logging.logger import Logger
 from helper.formatting.formatter import Formatter
 # =============================================================================
 #  GLOBALS / CONFIG
 # =============================================================================
 LGR = Logger(Logger.Category.CORE, __name__)
+# madvise() is not available on every platform
+MADV_WILLNEED = getattr(mmap_module, 'MADV_WILLNEED', None)
 # =============================================================================
 #  CLASSES
 # =============================================================================
@@ -39,14 +44,19 @@ class MemoryMap:
     '''Memory map class
 
     Represents a memory map of N units mapped from a BinFile.
+
+    Region is mapped in memory using mmap, reads return memoryview slices of
+    the mapping, no data is copied. Slices are valid until close() is called
+    and shall be converted to bytes if they must outlive the map.
     '''
     def __init__(self, bf, start, size, unit=1):
         '''Constructs the object.
 
         If you want a memory map of sectors (512 bytes), just use unit=512.
+        Region exceeding the end of the file is not mapped.
 
         Arguments:
-            bf {BinFile} -- underlying BinFile
+            bf {BinFile} -- underlying BinFile, opened for reading
             start {int} -- Offset within the BinFile (in units)
             size {[type]} -- Size of the map (in units)
 
@@ -58,7 +68,50 @@ class MemoryMap:
         self.start = start
         self.size = size
         self.unit = unit
-        self.type = type
+        self._mm = None
+        self._delta = 0
+        self._view = memoryview(b'')
+
+        offset = unit * start
+        length = min(unit * size, max(0, bf.size() - offset))
+        if length > 0:
+            # mmap offset must be a multiple of the allocation granularity
+            delta = offset % ALLOCATIONGRANULARITY
+            self._delta = delta
+            self._mm = mmap(bf.fp.fileno(),
+                            delta + length,
+                            access=ACCESS_READ,
+                            offset=offset - delta)
+            self._view = memoryview(self._mm)[delta:delta + length]
+
+    def __enter__(self):
+        '''Context manager __enter__ to enable the use of "with" statement
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''Context manager __exit__ to enable the use of "with" statement
+        '''
+        self.close()
+
+    def close(self):
+        '''Unmaps the region
+
+        Mapping remains until garbage collection if slices are still
+        referenced.
+        '''
+        if self._mm is None:
+            return
+
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError as e:
+            LGR.debug("Memory map slices still referenced, unmapping "
+                      "deferred: {}".format(self))
+
+        self._view = memoryview(b'')
+        self._mm = None
 
     def read_one(self, idx):
         '''Reads one unit from the memory map
@@ -67,37 +120,119 @@ class MemoryMap:
             idx {int} -- Index of the unit to read, 0-based.
 
         Returns:
-            bytes -- A buffer having a size of at most <unit>.
+            memoryview -- A buffer having a size of at most <unit>.
         '''
         if idx >= self.size:
-            LGR.warn("reading after end of map => None returned.")
+            LGR.warning("reading after end of map => None returned.")
             return None
 
-        return self._bf.read(self.unit,
-                             self.unit * (self.start + idx))
+        offset = self.unit * idx
+        return self._view[offset:offset + self.unit]
+
+    @staticmethod
+    def runs(indices, gap=0):
+        '''Coalesces indices into runs of contiguous or nearby indices
+
+        Arguments:
+            indices {iterable(int)} -- Indices, in any order
+
+        Keyword Arguments:
+            gap {int} -- Max number of missing indices between two indices
+                         of the same run (default: {0})
+
+        Returns:
+            list(tuple(int,int)) -- Sorted list of (first, last) indices
+        '''
+        runs = []
+        for idx in sorted(set(indices)):
+            if runs and idx - runs[-1][1] <= gap + 1:
+                runs[-1][1] = idx
+            else:
+                runs.append([idx, idx])
+        return [tuple(run) for run in runs]
+
+    def prefetch(self, first, last):
+        '''Tells the kernel that units from first to last (included) will be
+        read soon so that they are paged in using large reads
+
+        Does nothing where madvise() is not available.
+        '''
+        if self._mm is None or MADV_WILLNEED is None:
+            return
+
+        begin = self._delta + self.unit * first
+        end = min(self._delta + self.unit * (last + 1), len(self._mm))
+        if end <= begin:
+            return
 
-    def read_many(self, indices):
+        aligned = begin - begin % PAGESIZE
+        self._mm.madvise(MADV_WILLNEED, aligned, end - aligned)
+
+    def read_many(self, indices, gap=64):
         '''Reads many, possible not contiguous, units from the memory map
 
+        Indices are coalesced into runs which are prefetched before units
+        are yielded, in given order.
+
         Arguments:
             indices {list(int)} -- List of indices
 
+        Keyword Arguments:
+            gap {int} -- Max number of unread units between two units
+                         prefetched at once (default: {64})
+
         Yields:
-            bytes -- [description]
+            memoryview -- [description]
         '''
+        indices = list(indices)
+        for (first, last) in self.runs(indices, gap):
+            self.prefetch(first, min(last, self.size - 1))
+
         for idx in indices:
             yield self.read_one(idx)
 
+    def read_array(self, fmt):
+        '''Returns the memory map as an array of fixed-size items
+
+        Trailing bytes which do not make a complete item are ignored.
+
+        Arguments:
+            fmt {str} -- struct module native format of an item (e.g. 'I'
+                         for 32-bit unsigned integers)
+
+        Returns:
+            memoryview -- Items view, no data is copied
+        '''
+        view = self._view.cast('B')
+        itemsize = calcsize(fmt)
+        return view[:len(view) - len(view) % itemsize].cast(fmt)
+
+    def read_ndarray(self, dtype):
+        '''Returns the memory map as a read-only NumPy array
+
+        Requires numpy to be installed.
+
+        Arguments:
+            dtype {numpy.dtype or str} -- Type of an item (e.g. '<u4')
+
+        Returns:
+            numpy.ndarray -- Array view, no data is copied
+        '''
+        import numpy
+        dtype = numpy.dtype(dtype)
+        count = len(self._view) // dtype.itemsize
+        return numpy.frombuffer(self._view, dtype=dtype, count=count)
+
     def read_all(self):
         '''Reads all the memory map.
 
-        Be careful not to load to many data in memory.
+        Data is paged in on access, converting it to bytes loads it all in
+        memory.
 
         Returns:
-            bytes -- Full memory map data
+            memoryview -- Full memory map data
         '''
-        return self._bf.read(self.unit * self.size,
-                             self.unit * self.start)
+        return self._view
 
     def __str__(self):
         '''String representation of the object
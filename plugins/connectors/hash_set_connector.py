@@ -0,0 +1,122 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: hash_set_connector.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from core.db.query import DBQuery
+from core.hash.hash_set import HashSet
+from core.db.connector import DatabaseConnector
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class HashSetConnector(DatabaseConnector):
+    '''HashSetConnector
+
+    Connects to a hash set compiled using datashark-cli compile-hashset. It
+    is a read-only database meant to serve blacklist or whitelist lookups.
+
+    Queries shall have a single equality or IN filter on the hash set field,
+    listed digests are returned as {field: digest} dicts.
+
+    Settings:
+        path {str} -- Hash set file path
+        field {str} -- Expected Hash field (default: {None})
+    '''
+    def __init__(self, conf, read_only):
+        '''Constructs the object
+        '''
+        super().__init__(conf, read_only)
+        self.hash_set = None
+
+    def __str__(self):
+        '''String representation of the object
+        '''
+        return str(super())
+
+    def _is_connected(self):
+        '''Returns true if hash set is mapped, False otherwise
+        '''
+        return (self.hash_set is not None)
+
+    async def connect(self):
+        '''Maps the hash set in memory
+        '''
+        if self._is_connected():
+            self.logger.warning("called on an opened connection!")
+            return False
+
+        try:
+            self.hash_set = HashSet(self.conf.path,
+                                    self.conf.get('field')).load()
+        except (OSError, ValueError) as e:
+            self.logger.error("cannot load hash set: {}".format(e))
+            return False
+
+        return True
+
+    async def disconnect(self):
+        '''Unmaps the hash set
+        '''
+        if not self._is_connected():
+            self.logger.warning("called on a closed connection!")
+            return
+
+        self.hash_set.close()
+        self.hash_set = None
+
+    async def persist(self, objects):
+        '''Hash sets cannot be written, use datashark-cli compile-hashset
+        '''
+        self.logger.error("persist() called on a hash set!")
+        return False
+
+    async def retrieve(self, query):
+        '''Retrieves listed digests
+
+        Returns:
+            {list} -- {field: digest} dicts of listed digests
+        '''
+        if not self._is_connected():
+            self.logger.warning("retrieve() called on a closed connection!")
+            return False
+
+        field = self.hash_set.field
+        if len(query.filters) != 1:
+            self.logger.warning("hash set queries shall have a single filter")
+            return []
+
+        name, operator, digests = query.filters[0]
+        if name != field or operator not in (DBQuery.Operator.EQ,
+                                             DBQuery.Operator.IN):
+            self.logger.warning("hash set can only be queried on its field: "
+                                "{}".format(field))
+            return []
+
+        if operator == DBQuery.Operator.EQ:
+            digests = [digests]
+
+        listed = [{field: digest}
+                  for digest in digests if digest in self.hash_set]
+        return listed[:query.count]
@@ -25,21 +25,53 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
-from aiomysql import create_pool
+from aiomysql import create_pool, SSDictCursor, ProgrammingError
+from core.db import sql
+from core.db.object import DBObject
 from core.db.connector import DatabaseConnector
 # =============================================================================
+#  GLOBALS
+# =============================================================================
+ER_NO_SUCH_TABLE = 1146
+# number of rows fetched at once when streaming results
+FETCH_SIZE = 1000
+# =============================================================================
 #  CLASSES
 # =============================================================================
 class MySQLConnector(DatabaseConnector):
     '''MySQLConnector
 
     Connects to a MySQL database
+
+    Persisted batches are inserted using executemany() which aiomysql turns
+    into multi-row INSERT ... ON DUPLICATE KEY UPDATE statements. Retrieved
+    rows are streamed from a server-side cursor (see iterate()).
+
+    Settings:
+        host {str} -- Server host (default: {localhost})
+        port {int} -- Server port (default: {3306})
+        database {str} -- Database name
+        user {str} -- User name
+        password {str} -- User password
+        min_size {int} -- Min number of pooled connections (default: {1})
+        max_size {int} -- Max number of pooled connections (default: {10})
     '''
-    def __init__(self, conf):
+    TYPE_MAPPING = {
+        DBObject.DataType.INT: 'BIGINT',
+        DBObject.DataType.BOOL: 'BOOLEAN',
+        DBObject.DataType.BYTES: 'LONGBLOB',
+        DBObject.DataType.FLOAT: 'DOUBLE',
+        DBObject.DataType.STRING: 'TEXT'
+    }
+    # TEXT columns cannot be used as keys without a prefix length
+    KEY_STRING = 'VARCHAR(255)'
+
+    def __init__(self, conf, read_only):
         '''Constructs the object
         '''
-        super().__init__(conf)
-        self.conn = None
+        super().__init__(conf, read_only)
+        self.pool = None
+        self.tables = set()
 
     def __str__(self):
         '''String representation of the object
@@ -49,40 +81,209 @@ class MySQLConnector(DatabaseConnector):
     def _is_connected(self):
         '''Returns true if underlying connection is opened, False otherwise
         '''
-        return (self.conn is not None)
+        return (self.pool is not None)
+
+    async def _execute(self, query, params=()):
+        '''Executes a single query
+        '''
+        self.logger.debug("Querying database: {}".format(query))
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
 
     async def connect(self):
-        '''Opens underlying connection
+        '''Opens underlying connection pool
         '''
         if self._is_connected():
             self.logger.warning("connect() called on an opened connection!")
             return False
-        self.logger.todo("implement MySQLConnector.connect() method.")
+
+        kwargs = {}
+        if self.read_only:
+            kwargs['init_command'] = "SET SESSION TRANSACTION READ ONLY"
+
+        try:
+            self.pool = await create_pool(minsize=self.conf.get('min_size', 1),
+                                          maxsize=self.conf.get('max_size', 10),
+                                          host=self.conf.get('host',
+                                                             'localhost'),
+                                          port=self.conf.get('port', 3306),
+                                          user=self.conf.get('user'),
+                                          password=self.conf.get('password',
+                                                                 ''),
+                                          db=self.conf.database,
+                                          charset='utf8mb4',
+                                          autocommit=True,
+                                          **kwargs)
+        except Exception as e:
+            self.logger.error("cannot connect to database: {}".format(e))
+            return False
+
+        return True
 
     async def disconnect(self):
-        '''Closes underlying connection
+        '''Closes underlying connection pool
         '''
         if not self._is_connected():
             self.logger.warning("disconnect() called on a closed connection!")
             return
-        self.logger.todo("implement MySQLConnector.disconnect() method.")
+
+        self.pool.close()
+        await self.pool.wait_closed()
+        self.pool = None
+        self.tables.clear()
+
+    async def _create_table(self, meta):
+        '''Creates the table and its indexes if they do not exist
+
+        MySQL has no CREATE INDEX IF NOT EXISTS, indexes are declared along
+        with the table.
+        '''
+        keys = set(meta.get('indexes', []))
+        keys.add(meta['primary'])
+        columns = []
+        for name, data_type in meta['fields']:
+            column_type = MySQLConnector.TYPE_MAPPING[data_type]
+            if name in keys and data_type == DBObject.DataType.STRING:
+                column_type = MySQLConnector.KEY_STRING
+            column = "{} {}".format(name, column_type)
+            if name == meta['primary']:
+                column += " PRIMARY KEY"
+            columns.append(column)
+
+        for name in meta.get('indexes', []):
+            if name != meta['primary']:
+                columns.append("INDEX {}_{}_idx ({})".format(meta['index'],
+                                                             name, name))
+
+        await self._execute("CREATE TABLE IF NOT EXISTS {}({});".format(
+                            meta['index'], ', '.join(columns)))
+        self.tables.add(meta['index'])
+
+    async def _insert_many(self, cursor, meta, sources):
+        '''Inserts (or updates) many objects of the same index
+        '''
+        names = [name for name, _ in meta['fields']]
+        query = "INSERT INTO {}({}) VALUES ({})".format(meta['index'],
+                                                        ', '.join(names),
+                                                        ', '.join(['%s'] *
+                                                                  len(names)))
+        updates = ["{0} = VALUES({0})".format(name)
+                   for name in names if name != meta['primary']]
+        if meta['primary'] in names and updates:
+            query += " ON DUPLICATE KEY UPDATE " + ', '.join(updates)
+        rows = [tuple(source.get(name) for name in names)
+                for source in sources]
+
+        self.logger.debug("Querying database: {} "
+                          "({} rows)".format(query, len(rows)))
+        await cursor.executemany(query, rows)
 
     async def persist(self, objects):
-        '''[summary]
+        '''Inserts (or updates) DBObjects into underlying database creating
+        tables if needed
 
-        [description]
+        Objects are grouped by index and inserted using one executemany()
+        call per index and a single commit.
         '''
         if not self._is_connected():
             self.logger.warning("persist() called on a closed connection!")
             return False
-        self.logger.todo("implement MySQLConnector.persist() method.")
+
+        if self.read_only:
+            self.logger.error("persist() called on a read-only database!")
+            return False
+
+        groups = {}
+        for obj in objects:
+            index = obj['_meta']['index']
+            if index not in groups:
+                groups[index] = (obj['_meta'], [])
+            groups[index][1].append(obj['_source'])
+
+        for index, (meta, _) in groups.items():
+            if meta['fields'] and index not in self.tables:
+                await self._create_table(meta)
+
+        async with self.pool.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor() as cursor:
+                    for index, (meta, sources) in groups.items():
+                        if not meta['fields']:
+                            self.logger.warning("cannot persist objects "
+                                                "without fields: "
+                                                "{}".format(index))
+                            continue
+
+                        await self._insert_many(cursor, meta, sources)
+
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+        return True
+
+    async def iterate(self, query):
+        '''Yields objects matching given query as they are received
+
+        Rows are read from a server-side cursor: large results are never
+        buffered entirely by the client. Remaining rows are read and dropped
+        if the consumer stops early (aclose()).
+
+        Arguments:
+            query {DBQuery} -- Query compiled to a SELECT statement
+
+        Yields:
+            {dict} -- dict mapping selected fields to their values
+        '''
+        if not self._is_connected():
+            self.logger.warning("iterate() called on a closed connection!")
+            return
+
+        statement, params = sql.select(query, placeholder='%s')
+        self.logger.debug("Querying database: {}".format(statement))
+        async with self.pool.acquire() as conn:
+            cursor = await conn.cursor(SSDictCursor)
+            try:
+                try:
+                    await cursor.execute(statement, params)
+                except ProgrammingError as e:
+                    if e.args[0] != ER_NO_SUCH_TABLE:
+                        raise
+                    # nothing was ever persisted in this index
+                    self.logger.debug("cannot retrieve from {}: {}".format(
+                                      query.index, e))
+                    return
+
+                while True:
+                    rows = await cursor.fetchmany(FETCH_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+            finally:
+                # consumer may stop early: unread rows must be read before
+                # the connection is used again
+                try:
+                    await cursor.close()
+                except BaseException:
+                    # pool drops closed connections
+                    conn.close()
+                    raise
 
     async def retrieve(self, query):
-        '''[summary]
+        '''Retrieves objects matching given query
 
-        [description]
+        Arguments:
+            query {DBQuery} -- Query compiled to a SELECT statement
+
+        Returns:
+            {list} -- dicts mapping selected fields to their values
         '''
         if not self._is_connected():
             self.logger.warning("retrieve() called on a closed connection!")
             return False
-        self.logger.todo("implement MySQLConnector.retrieve) method.")
+
+        return [row async for row in self.iterate(query)]
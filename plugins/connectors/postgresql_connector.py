@@ -25,21 +25,90 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from io import BytesIO
+from struct import Struct
+from asyncio import gather, get_event_loop
 from aiopg import create_pool
+from psycopg2 import ProgrammingError
+from psycopg2.pool import ThreadedConnectionPool
+from core.db import sql
+from core.db.object import DBObject
 from core.db.connector import DatabaseConnector
 # =============================================================================
+#  GLOBALS
+# =============================================================================
+# binary COPY format, see PostgreSQL documentation of COPY
+COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + Struct('!ii').pack(0, 0)
+COPY_TRAILER = Struct('!h').pack(-1)
+FIELD_COUNT = Struct('!h')
+FIELD_SIZE = Struct('!i')
+NULL = FIELD_SIZE.pack(-1)
+INT8 = Struct('!q')
+FLOAT8 = Struct('!d')
+UNDEFINED_TABLE = '42P01'
+# number of rows fetched at once when streaming results
+FETCH_SIZE = 1000
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def _encode_bool(value):
+    return b'\x01' if value else b'\x00'
+
+def _encode_bytes(value):
+    return bytes(value)
+
+def _encode_string(value):
+    return str(value).encode('utf-8')
+# =============================================================================
 #  CLASSES
 # =============================================================================
 class PostgreSQLConnector(DatabaseConnector):
     '''PostgreSQLConnector
 
     Connects to a PostgreSQL database
+
+    Queries are performed using a pool of asynchronous connections (aiopg).
+    Persisted batches are sent using binary COPY into a temporary staging
+    table and upserted from it, COPY being unavailable in asynchronous mode
+    it is performed by a regular connection in a thread. Flushes being
+    serialized by Database, this connection counts as one of max_size
+    connections when the database is writable (max_size must be at least 2).
+    Large results are streamed from a server-side cursor (see iterate()),
+    independent queries are pipelined on pooled connections (see
+    retrieve_many()).
+
+    Settings:
+        host {str} -- Server host (default: {localhost})
+        port {int} -- Server port (default: {5432})
+        database {str} -- Database name
+        user {str} -- User name
+        password {str} -- User password
+        min_size {int} -- Min number of pooled connections (default: {1})
+        max_size {int} -- Max number of connections, COPY connection included
+                          (default: {10})
     '''
-    def __init__(self, conf):
+    TYPE_MAPPING = {
+        DBObject.DataType.INT: 'BIGINT',
+        DBObject.DataType.BOOL: 'BOOLEAN',
+        DBObject.DataType.BYTES: 'BYTEA',
+        DBObject.DataType.FLOAT: 'DOUBLE PRECISION',
+        DBObject.DataType.STRING: 'TEXT'
+    }
+    ENCODERS = {
+        DBObject.DataType.INT: INT8.pack,
+        DBObject.DataType.BOOL: _encode_bool,
+        DBObject.DataType.BYTES: _encode_bytes,
+        DBObject.DataType.FLOAT: FLOAT8.pack,
+        DBObject.DataType.STRING: _encode_string
+    }
+
+    def __init__(self, conf, read_only):
         '''Constructs the object
         '''
-        super().__init__(conf)
-        self.conn = None
+        super().__init__(conf, read_only)
+        self.pool = None
+        self.copy_pool = None
+        self.tables = set()
 
     def __str__(self):
         '''String representation of the object
@@ -49,40 +118,301 @@ class PostgreSQLConnector(DatabaseConnector):
     def _is_connected(self):
         '''Returns true if underlying connection is opened, False otherwise
         '''
-        return (self.conn is not None)
+        return (self.pool is not None)
+
+    def _connection_kwargs(self):
+        '''Returns connection parameters common to both pools
+        '''
+        kwargs = {
+            'host': self.conf.get('host', 'localhost'),
+            'port': self.conf.get('port', 5432),
+            'dbname': self.conf.database,
+            'user': self.conf.get('user'),
+            'password': self.conf.get('password')
+        }
+        if self.read_only:
+            kwargs['options'] = '-c default_transaction_read_only=on'
+        return kwargs
+
+    async def _execute(self, query, params=()):
+        '''Executes a single query
+        '''
+        self.logger.debug("Querying database: {}".format(query))
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
 
     async def connect(self):
-        '''Opens underlying connection
+        '''Opens underlying connection pools
         '''
         if self._is_connected():
             self.logger.warning("connect() called on an opened connection!")
             return False
-        self.logger.todo("implement PostgreSQLConnector.connect() method.")
+
+        max_size = self.conf.get('max_size', 10)
+        if not self.read_only:
+            # one connection is dedicated to COPY
+            max_size -= 1
+        if max_size < 1:
+            self.logger.error("max_size must be at least 2 for a writable "
+                              "database.")
+            return False
+        min_size = min(self.conf.get('min_size', 1), max_size)
+
+        kwargs = self._connection_kwargs()
+        try:
+            self.pool = await create_pool(minsize=min_size,
+                                          maxsize=max_size,
+                                          **kwargs)
+            if not self.read_only:
+                self.copy_pool = await get_event_loop().run_in_executor(
+                    None, lambda: ThreadedConnectionPool(1, 1, **kwargs))
+        except Exception as e:
+            self.logger.error("cannot connect to database: {}".format(e))
+            await self.disconnect()
+            return False
+
+        return True
 
     async def disconnect(self):
-        '''Closes underlying connection
+        '''Closes underlying connection pools
         '''
         if not self._is_connected():
             self.logger.warning("disconnect() called on a closed connection!")
             return
-        self.logger.todo("implement PostgreSQLConnector.disconnect() method.")
+
+        self.pool.close()
+        await self.pool.wait_closed()
+        self.pool = None
+        if self.copy_pool is not None:
+            self.copy_pool.closeall()
+            self.copy_pool = None
+        self.tables.clear()
+
+    async def _create_table(self, meta):
+        '''Creates the table and its indexes if they do not exist
+        '''
+        query = "CREATE TABLE IF NOT EXISTS {}(".format(meta['index'])
+        for name, data_type in meta['fields']:
+            query += "{} {}".format(name,
+                                    PostgreSQLConnector.TYPE_MAPPING[data_type])
+            if name == meta['primary']:
+                query += " PRIMARY KEY"
+            query += ", "
+        query = query[:-2] + ");"
+
+        await self._execute(query)
+        for query in sql.create_indexes(meta):
+            await self._execute(query)
+        self.tables.add(meta['index'])
+
+    @staticmethod
+    def _copy_data(meta, sources):
+        '''Encodes sources using COPY binary format
+        '''
+        encoders = [(name, PostgreSQLConnector.ENCODERS[data_type])
+                    for name, data_type in meta['fields']]
+        count = FIELD_COUNT.pack(len(encoders))
+        data = BytesIO()
+        data.write(COPY_HEADER)
+        for source in sources:
+            data.write(count)
+            for name, encode in encoders:
+                value = source.get(name)
+                if value is None:
+                    data.write(NULL)
+                    continue
+                value = encode(value)
+                data.write(FIELD_SIZE.pack(len(value)))
+                data.write(value)
+        data.write(COPY_TRAILER)
+        data.seek(0)
+        return data
+
+    def _copy_many(self, meta, sources):
+        '''Copies sources into a staging table and upserts them into their
+        table in a single transaction
+
+        Called in a thread as psycopg2 performs COPY synchronously.
+        '''
+        index = meta['index']
+        staging = 'staging_{}'.format(index)
+        names = [name for name, _ in meta['fields']]
+        columns = ', '.join(names)
+        upsert = "INSERT INTO {}({}) SELECT {} FROM {}".format(index, columns,
+                                                             columns, staging)
+        primary = meta['primary']
+        if primary in names:
+            updates = ["{0} = EXCLUDED.{0}".format(name)
+                       for name in names if name != primary]
+            upsert += " ON CONFLICT ({}) DO ".format(primary)
+            upsert += ("UPDATE SET " + ', '.join(updates) if updates
+                       else "NOTHING")
+            # a row cannot be upserted twice by the same statement, last
+            # persisted version of an object wins
+            sources = list({source.get(primary): source
+                            for source in sources}.values())
+
+        conn = self.copy_pool.getconn()
+        try:
+            with conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS {} (LIKE "
+                                   "{}) ON COMMIT DELETE ROWS;".format(staging,
+                                                                       index))
+                    cursor.copy_expert("COPY {}({}) FROM STDIN WITH (FORMAT "
+                                       "binary);".format(staging, columns),
+                                       PostgreSQLConnector._copy_data(meta,
+                                                                      sources))
+                    cursor.execute(upsert + ';')
+        finally:
+            self.copy_pool.putconn(conn)
 
     async def persist(self, objects):
-        '''[summary]
+        '''Inserts (or updates) DBObjects into underlying database creating
+        tables if needed
 
-        [description]
+        Objects are grouped by index, each group is copied in a single
+        transaction.
         '''
         if not self._is_connected():
             self.logger.warning("persist() called on a closed connection!")
             return False
-        self.logger.todo("implement PostgreSQLConnector.persist() method.")
+
+        if self.read_only:
+            self.logger.error("persist() called on a read-only database!")
+            return False
+
+        groups = {}
+        for obj in objects:
+            index = obj['_meta']['index']
+            if index not in groups:
+                groups[index] = (obj['_meta'], [])
+            groups[index][1].append(obj['_source'])
+
+        loop = get_event_loop()
+        for index, (meta, sources) in groups.items():
+            if not meta['fields']:
+                self.logger.warning("cannot persist objects without fields: "
+                                    "{}".format(index))
+                continue
+
+            if index not in self.tables:
+                await self._create_table(meta)
+
+            self.logger.debug("Copying {} rows into {}".format(len(sources),
+                                                               index))
+            await loop.run_in_executor(None, self._copy_many, meta, sources)
+
+        return True
+
+    async def _fetch(self, query):
+        '''Retrieves a bounded result in a single round-trip
+        '''
+        statement, params = sql.select(query, placeholder='%s')
+        fields = query.projection
+        self.logger.debug("Querying database: {}".format(statement))
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                try:
+                    await cursor.execute(statement, params)
+                except ProgrammingError as e:
+                    if e.pgcode != UNDEFINED_TABLE:
+                        raise
+                    # nothing was ever persisted in this index
+                    self.logger.debug("cannot retrieve from {}: {}".format(
+                                      query.index, e))
+                    return []
+                rows = await cursor.fetchall()
+
+        return [dict(zip(fields, row)) for row in rows]
+
+    async def iterate(self, query):
+        '''Yields objects matching given query as they are received
+
+        Rows are read FETCH_SIZE at a time from a server-side cursor declared
+        in a read-only transaction: large results are never buffered
+        entirely by the client. Transaction is rolled back, closing the
+        cursor, if the consumer stops early (aclose()).
+
+        Arguments:
+            query {DBQuery} -- Query compiled to a SELECT statement
+
+        Yields:
+            {dict} -- dict mapping selected fields to their values
+        '''
+        if not self._is_connected():
+            self.logger.warning("iterate() called on a closed connection!")
+            return
+
+        statement, params = sql.select(query, placeholder='%s')
+        fields = query.projection
+        self.logger.debug("Querying database: {}".format(statement))
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("BEGIN READ ONLY;")
+                try:
+                    try:
+                        await cursor.execute("DECLARE datashark_cursor NO "
+                                             "SCROLL CURSOR FOR " + statement,
+                                             params)
+                    except ProgrammingError as e:
+                        if e.pgcode != UNDEFINED_TABLE:
+                            raise
+                        # nothing was ever persisted in this index
+                        self.logger.debug("cannot retrieve from {}: {}".format(
+                                          query.index, e))
+                        return
+
+                    while True:
+                        await cursor.execute("FETCH FORWARD {} FROM "
+                                             "datashark_cursor;".format(
+                                             FETCH_SIZE))
+                        rows = await cursor.fetchall()
+                        if not rows:
+                            break
+                        for row in rows:
+                            yield dict(zip(fields, row))
+                finally:
+                    # pool closes connections left in a transaction
+                    await cursor.execute("ROLLBACK;")
 
     async def retrieve(self, query):
-        '''[summary]
+        '''Retrieves objects matching given query
+
+        Results of queries limited to FETCH_SIZE objects (e.g. lookups) are
+        fetched in a single round-trip, others are streamed (see iterate()).
 
-        [description]
+        Arguments:
+            query {DBQuery} -- Query compiled to a SELECT statement
+
+        Returns:
+            {list} -- dicts mapping selected fields to their values
         '''
         if not self._is_connected():
             self.logger.warning("retrieve() called on a closed connection!")
             return False
-        self.logger.todo("implement PostgreSQLConnector.retrieve) method.")
+
+        if query.count is not None and query.count <= FETCH_SIZE:
+            return await self._fetch(query)
+
+        return [row async for row in self.iterate(query)]
+
+    async def retrieve_many(self, queries):
+        '''Retrieves objects matching each query
+
+        Queries are sent concurrently on pooled connections, each one does
+        not wait for the result of the previous one.
+
+        Arguments:
+            queries {list} -- DBQuery instances
+        Returns:
+            {list} - list of retrieve() results, in queries order
+        '''
+        if not self._is_connected():
+            self.logger.warning("retrieve_many() called on a closed "
+                                "connection!")
+            return False
+
+        return list(await gather(*[self.retrieve(query)
+                                   for query in queries]))
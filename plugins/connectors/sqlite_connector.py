@@ -25,8 +25,10 @@
 # =============================================================================
 #  IMPORTS
 # =============================================================================
+from sqlite3 import OperationalError
 from pathlib import Path
 from aiosqlite3 import connect
+from core.db import sql
 from core.db.object import DBObject
 from core.db.connector import DatabaseConnector
 # =============================================================================
@@ -36,6 +38,11 @@ class SQLiteConnector(DatabaseConnector):
     '''SQLiteConnector
 
     Connects to a SQLite database
+
+    Settings:
+        path {str} -- Database file path
+        synchronous {str} -- SQLite synchronous pragma value, one of OFF,
+                             NORMAL, FULL or EXTRA (default: {NORMAL})
     '''
     TYPE_MAPPING = {
         DBObject.DataType.INT: 'INTEGER',
@@ -44,12 +51,14 @@ class SQLiteConnector(DatabaseConnector):
         DBObject.DataType.FLOAT: 'REAL',
         DBObject.DataType.STRING: 'TEXT'
     }
+    SYNCHRONOUS = ['OFF', 'NORMAL', 'FULL', 'EXTRA']
 
     def __init__(self, conf, read_only):
         '''Constructs the object
         '''
         super().__init__(conf, read_only)
         self.conn = None
+        self.tables = set()
 
     def __str__(self):
         '''String representation of the object
@@ -61,6 +70,21 @@ class SQLiteConnector(DatabaseConnector):
         '''
         return (self.conn is not None)
 
+    async def _execute(self, query, params=()):
+        '''Executes a single query
+        '''
+        self.logger.debug("Querying database: {}".format(query))
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(query, params)
+
+    async def _fetchall(self, query, params=()):
+        '''Executes a single query and returns all rows
+        '''
+        self.logger.debug("Querying database: {}".format(query))
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
     async def connect(self):
         '''Opens underlying connection
         '''
@@ -68,6 +92,13 @@ class SQLiteConnector(DatabaseConnector):
             self.logger.warning("called on an opened connection!")
             return False
 
+        synchronous = self.conf.get('synchronous', 'NORMAL').upper()
+        if synchronous not in SQLiteConnector.SYNCHRONOUS:
+            self.logger.error("invalid synchronous setting: {} (expected one "
+                              "of {})".format(synchronous,
+                                              SQLiteConnector.SYNCHRONOUS))
+            return False
+
         try:
             Path(self.conf.path).parent.joinpath('perm-test.ds').touch()
         except Exception as e:
@@ -80,6 +111,13 @@ class SQLiteConnector(DatabaseConnector):
             uri += '?mode=ro'
 
         self.conn = await connect(uri, uri=True)
+
+        if not self.read_only:
+            # WAL lets readers proceed while a batch is being written and
+            # turns commits into sequential appends
+            await self._execute("PRAGMA journal_mode=WAL;")
+            await self._execute("PRAGMA synchronous={};".format(synchronous))
+
         return True
 
     async def disconnect(self):
@@ -91,73 +129,133 @@ class SQLiteConnector(DatabaseConnector):
 
         await self.conn.close()
         self.conn = None
+        self.tables.clear()
 
-    async def _table_exists(self, obj):
-        '''Checks if table exists
+    async def _create_table(self, meta):
+        '''Creates the table if it does not exist
         '''
-        query = "SELECT * FROM sqlite_master "
-        query += "WHERE name='{}' ".format(obj['_meta']['index'])
-        query += "AND type='table';"
+        query = "CREATE TABLE IF NOT EXISTS {}(".format(meta['index'])
+        for name, data_type in meta['fields']:
+            query += "{} {}".format(name,
+                                    SQLiteConnector.TYPE_MAPPING[data_type])
+            if name == meta['primary']:
+                query += " PRIMARY KEY"
+            query += ", "
+        query = query[:-2] + ");"
 
-        self.logger.debug("Querying database: {}".format(query))
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query)
-            r = await cursor.fetchall()
+        await self._execute(query)
+        if meta['primary']:
+            await self._migrate_primary_key(meta)
+        for query in sql.create_indexes(meta):
+            await self._execute(query)
+        self.tables.add(meta['index'])
 
-        return (len(r) != 0)
+    async def _migrate_primary_key(self, meta):
+        '''Adds a unique index on the primary field of tables created
+        without PRIMARY KEY constraint (databases of previous versions)
 
-    async def _create_table(self, obj):
-        '''Creates the table if it does not exist
+        INSERT OR REPLACE only replaces rows violating a uniqueness
+        constraint, without it duplicate rows would be appended. Existing
+        duplicates are removed, the most recent row is kept.
         '''
-        query = "CREATE TABLE IF NOT EXISTS {}(".format(obj['_meta']['index'])
-        for name, data_type in obj['_meta']['fields']:
-            query += "{} {}, ".format(name,
-                                      SQLiteConnector.TYPE_MAPPING[data_type])
-        query = query[:-2] + ");"
-
-        self.logger.debug("Querying database: {}".format(query))
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(query)
+        index, primary = meta['index'], meta['primary']
+        # table_info rows: (cid, name, type, notnull, dflt_value, pk)
+        columns = await self._fetchall("PRAGMA table_info({});".format(index))
+        if any(column[5] for column in columns):
+            return
+        # index_list rows: (seq, name, unique, origin, partial)
+        for row in await self._fetchall("PRAGMA index_list({});".format(index)):
+            if not row[2]:
+                continue
+            info = await self._fetchall("PRAGMA index_info({});".format(row[1]))
+            if [column[2] for column in info] == [primary]:
+                return
 
-    async def _insert_one(self, obj):
-        '''Inserts a single object into the database
+        self.logger.warning("table {} has no PRIMARY KEY on {}, removing "
+                            "duplicate rows and adding a unique index.".format(
+                            index, primary))
+        await self._execute("DELETE FROM {0} WHERE rowid NOT IN (SELECT "
+                            "MAX(rowid) FROM {0} GROUP BY {1});".format(
+                            index, primary))
+        await self._execute("CREATE UNIQUE INDEX IF NOT EXISTS {0}_{1}_pk ON "
+                            "{0}({1});".format(index, primary))
+        await self.conn.commit()
 
-        Notes:
-            it might be interesting to optimize the execution inserting
-            multiple records in a single call
+    async def _insert_many(self, meta, sources):
+        '''Inserts (or replaces) many objects of the same index using a
+        single prepared statement
         '''
-        query = "INSERT INTO {} VALUES (".format(obj['_meta']['index'])
-        for _, value in obj['_source'].items():
-            query += "'{}', ".format(value)
-        query = query[:-2] + ");"
+        names = [name for name, _ in meta['fields']]
+        query = "INSERT OR REPLACE INTO {}({}) VALUES ({});".format(
+                    meta['index'],
+                    ', '.join(names),
+                    ', '.join(['?'] * len(names)))
+        rows = [tuple(source.get(name) for name in names)
+                for source in sources]
 
-        self.logger.debug("Querying database: {}".format(query))
+        self.logger.debug("Querying database: {} "
+                          "({} rows)".format(query, len(rows)))
         async with self.conn.cursor() as cursor:
-            await cursor.execute(query)
+            await cursor.executemany(query, rows)
 
     async def persist(self, objects):
-        '''Inserts a DBObject into underlying database creating a table if
+        '''Inserts DBObjects into underlying database creating tables if
         needed
 
-        Notes:
-            it might be interesting to optimize the execution inserting
-            multiple records in a single call
+        Objects are grouped by index and inserted using one executemany()
+        call per index and a single commit.
         '''
         if not self._is_connected():
             self.logger.warning("persist() called on a closed connection!")
             return False
 
+        groups = {}
         for obj in objects:
-            if not await self._table_exists(obj):
-                await self._create_table(obj)
-            await self._insert_one(obj)
+            index = obj['_meta']['index']
+            if index not in groups:
+                groups[index] = (obj['_meta'], [])
+            groups[index][1].append(obj['_source'])
+
+        for index, (meta, sources) in groups.items():
+            if not meta['fields']:
+                self.logger.warning("cannot persist objects without fields: "
+                                    "{}".format(index))
+                continue
+
+            if index not in self.tables:
+                await self._create_table(meta)
+
+            await self._insert_many(meta, sources)
 
         await self.conn.commit()
+        return True
 
     async def retrieve(self, query):
-        '''Retrieves an object from the database using given query
+        '''Retrieves objects matching given query
+
+        Arguments:
+            query {DBQuery} -- Query compiled to a SELECT statement
+
+        Returns:
+            {list} -- dicts mapping selected fields to their values
         '''
         if not self._is_connected():
             self.logger.warning("retrieve() called on a closed connection!")
             return False
-        self.logger.todo("implement SQLiteConnector.retrieve) method.")
+
+        statement, params = sql.select(query)
+        fields = query.projection
+        self.logger.debug("Querying database: {}".format(statement))
+        async with self.conn.cursor() as cursor:
+            try:
+                await cursor.execute(statement, params)
+            except OperationalError as e:
+                if query.index in self.tables:
+                    raise
+                # nothing was ever persisted in this index
+                self.logger.debug("cannot retrieve from {}: {}".format(
+                                  query.index, e))
+                return []
+            rows = await cursor.fetchall()
+
+        return [dict(zip(fields, row)) for row in rows]
@@ -57,6 +57,7 @@ from plugins.connectors.fs_connector import FSConnector
 from plugins.connectors.redis_connector import RedisConnector
 from plugins.connectors.mysql_connector import MySQLConnector
 from plugins.connectors.sqlite_connector import SQLiteConnector
+from plugins.connectors.hash_set_connector import HashSetConnector
 from plugins.connectors.dev_null_connector import DevNullConnector
 from plugins.connectors.postgresql_connector import PostgreSQLConnector
 # =============================================================================
@@ -93,5 +94,6 @@ PLUGINS.register(Plugin.Category.DB_CONNECTOR, FSConnector)
 PLUGINS.register(Plugin.Category.DB_CONNECTOR, RedisConnector)
 PLUGINS.register(Plugin.Category.DB_CONNECTOR, MySQLConnector)
 PLUGINS.register(Plugin.Category.DB_CONNECTOR, SQLiteConnector)
+PLUGINS.register(Plugin.Category.DB_CONNECTOR, HashSetConnector)
 PLUGINS.register(Plugin.Category.DB_CONNECTOR, DevNullConnector)
 PLUGINS.register(Plugin.Category.DB_CONNECTOR, PostgreSQLConnector)
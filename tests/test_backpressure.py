@@ -0,0 +1,131 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_backpressure.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from asyncio import run
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from munch import Munch
+from plugins.plugins import PLUGINS
+from core.plugin.plugin import Plugin
+from core.dissection.dissector import Dissector
+from core.container.container import Container
+from core.orchestration.worker import Worker
+from core.orchestration.local_worker import LocalWorker
+from core.orchestration.orchestrator import Orchestrator
+from core.datashark import Datashark
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+CHILDREN = 5000
+MAX_WORKERS = 3
+MAX_QUEUED_TASKS = 32
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class FanOutDissector(Dissector):
+    '''Extracts CHILDREN containers from a *.fan container
+    '''
+    def supported_mime_types(self):
+        return ['*/*']
+
+    def can_dissect(self, container):
+        return container.path.suffix == '.fan'
+
+    def containers(self, container):
+        leaf = container.path.with_suffix('.leaf')
+        for k in range(CHILDREN):
+            yield Container(name='{}.leaf'.format(k),
+                            path=leaf,
+                            parent=container.uuid,
+                            original_path=leaf)
+
+class MemoryDatabase:
+    '''Keeps persisted objects in memory
+    '''
+    def __init__(self):
+        self.objects = []
+
+    async def persist(self, objects):
+        self.objects.append(objects)
+        return True
+
+class TestBackpressure(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        PLUGINS.register(Plugin.Category.DISSECTOR, FanOutDissector)
+
+    def _dissect(self, mode, workers=MAX_WORKERS, roots=1):
+        conf = Munch(max_workers=workers,
+                     worker_category=Worker.Category.LOCAL,
+                     local_worker_mode=mode,
+                     workers=[],
+                     check_black_or_white=False,
+                     dissect_and_examine=False,
+                     fused_pipeline=False,
+                     deduplicate=False,
+                     max_pending_tasks=1024,
+                     max_queued_tasks=MAX_QUEUED_TASKS,
+                     max_queued_results=MAX_QUEUED_TASKS)
+        dbs = [MemoryDatabase() for _ in range(6)]
+        with TemporaryDirectory() as tmpdir:
+            for k in range(roots):
+                root = Path(tmpdir).joinpath('root{}.fan'.format(k))
+                root.write_bytes(b'fan')
+                root.with_suffix('.leaf').write_bytes(b'leaf')
+            datashark = Datashark(conf)
+            datashark.orchestrator = Orchestrator(conf, *dbs)
+            run(datashark.dissect(Path(tmpdir), exclude=['*.leaf']))
+        return (datashark.orchestrator, dbs[1].objects)
+
+    def _check(self, mode, workers=MAX_WORKERS, roots=1):
+        orchestrator, containers = self._dissect(mode, workers, roots)
+        # roots and all their children were processed
+        self.assertEqual(len(containers), roots * (CHILDREN + 1))
+        # fan-out was suspended while tasks were queued, results which
+        # were already received when it was suspended add a few tasks
+        self.assertLessEqual(orchestrator.high_water['qin'],
+                             MAX_QUEUED_TASKS + workers)
+
+    def test_inline_fan_out_is_bounded(self):
+        self._check(LocalWorker.Mode.INLINE)
+
+    def test_process_fan_out_is_bounded(self):
+        self._check(LocalWorker.Mode.PROCESS)
+
+    def test_concurrent_fan_outs_are_bounded(self):
+        self._check(LocalWorker.Mode.INLINE, roots=2)
+        self._check(LocalWorker.Mode.PROCESS, roots=2)
+
+    def test_single_worker_fan_out_is_bounded(self):
+        # the only worker performs queued tasks instead of being suspended
+        self._check(LocalWorker.Mode.INLINE, workers=1)
+        self._check(LocalWorker.Mode.PROCESS, workers=1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_block_cache.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import urandom
+from pathlib import Path
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from helper import block_cache
+from helper.crypto import Crypto
+from helper.bin_file import BinFile
+from core.container.container import Container
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+BLOCK_SIZE = 4096
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class TestBlockCache(TestCase):
+    '''Block cache shall only retain blocks read by dissectors
+    '''
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'image.bin'
+        # smaller than max_read, whole file would fit in the cache
+        self.data = urandom(16 * BLOCK_SIZE + 123)
+        self.path.write_bytes(self.data)
+        block_cache.configure({'size': 64 * BLOCK_SIZE,
+                               'block_size': BLOCK_SIZE,
+                               'max_read': 1024 * 1024})
+
+    def tearDown(self):
+        block_cache.configure(None)
+        self.tmp.cleanup()
+
+    def test_cached_read(self):
+        with BinFile(self.path) as bf:
+            self.assertEqual(bf.read(16, 2 * BLOCK_SIZE + 10),
+                             self.data[2*BLOCK_SIZE+10:2*BLOCK_SIZE+26])
+            self.assertEqual(bf.read(16, 2 * BLOCK_SIZE),
+                             self.data[2*BLOCK_SIZE:2*BLOCK_SIZE+16])
+        cache = block_cache.block_cache()
+        self.assertEqual(len(cache.blocks), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_hashing_bypasses_cache(self):
+        with BinFile(self.path) as bf:
+            bf.read(512, 0)
+            bf.read(512, 5 * BLOCK_SIZE)
+        cache = block_cache.block_cache()
+        blocks = list(cache.blocks.keys())
+        stats = (cache.hits, cache.misses)
+
+        container = Container(path=self.path)
+        digest = Crypto.hash('SHA-256', container)
+
+        self.assertEqual(digest, sha256(self.data).hexdigest())
+        self.assertEqual(list(cache.blocks.keys()), blocks)
+        self.assertEqual((cache.hits, cache.misses), stats)
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_crypto.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import urandom
+from pathlib import Path
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from helper.crypto import MultiHasher
+from helper.bin_file import BinFile
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+BUFFER_SIZE = 4096
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class CountingBinFile(BinFile):
+    '''Counts positional reads
+    '''
+    reads = 0
+
+    def readinto(self, b, seek=None, cached=True):
+        self.reads += 1
+        return super().readinto(b, seek, cached)
+
+class TestMultiHasher(TestCase):
+    '''MultiHasher shall read files using large reads whatever their
+    expected size
+    '''
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'image.bin'
+        self.data = urandom(10 * BUFFER_SIZE + 123)
+        self.path.write_bytes(self.data)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _hash(self, size):
+        hasher = MultiHasher(['SHA-256'], buffer_size=BUFFER_SIZE)
+        with CountingBinFile(self.path) as bf:
+            hasher.update_from(bf, size)
+        self.assertEqual(hasher.hexdigests(), [sha256(self.data).hexdigest()])
+        self.assertEqual(hasher.processed, len(self.data))
+        return bf.reads
+
+    def test_known_size(self):
+        self.assertEqual(self._hash(len(self.data)), 12)
+
+    def test_unknown_size(self):
+        # block devices report a size of 0
+        self.assertEqual(self._hash(0), 12)
+
+    def test_grown_file(self):
+        # file grew after its size was read, reads are smaller but the
+        # digest covers the whole content
+        self.assertEqual(self._hash(2 * BUFFER_SIZE), 12)
+        self._hash(100)
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_hash_set.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from hashlib import sha1
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+from core.hash.hash_set import HashSet
+# =============================================================================
+#  FUNCTIONS
+# =============================================================================
+def _digests(start, stop):
+    return [sha1(str(k).encode()).hexdigest() for k in range(start, stop)]
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class TestHashSet(TestCase):
+    '''Hash set build and lookups
+    '''
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.source = self.dir / 'list.txt'
+        self.source.write_text('\n'.join(_digests(0, 100)) + '\n')
+        self.path = self.dir / 'list.hashset'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_and_lookup(self):
+        self.assertEqual(HashSet.build([self.source], self.path), 100)
+        hash_set = HashSet(self.path, 'sha1').load()
+        try:
+            self.assertEqual(len(hash_set), 100)
+            self.assertIn(_digests(42, 43)[0], hash_set)
+            self.assertNotIn(_digests(100, 101)[0], hash_set)
+        finally:
+            hash_set.close()
+
+    def test_interrupted_build_keeps_previous_hash_set(self):
+        HashSet.build([self.source], self.path)
+        before = self.path.read_bytes()
+
+        # build fails once records are written
+        with patch('core.hash.hash_set.TABLE') as table:
+            table.pack.side_effect = OSError("No space left on device")
+            with self.assertRaises(OSError):
+                HashSet.build([self.source], self.path)
+
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()),
+                         ['list.hashset', 'list.txt'])
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
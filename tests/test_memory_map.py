@@ -0,0 +1,157 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_memory_map.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import urandom
+from mmap import ALLOCATIONGRANULARITY
+from struct import unpack_from
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main, skipUnless
+from importlib.util import find_spec
+from helper.bin_file import BinFile
+from helper.memory_map import MemoryMap
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+SECTOR = 512
+HAS_NUMPY = find_spec('numpy') is not None
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class TestMemoryMap(TestCase):
+    '''Memory maps shall return slices of the file without copying it
+    '''
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'image.bin'
+        # not a multiple of the allocation granularity nor of a sector
+        self.data = urandom(3 * ALLOCATIONGRANULARITY + 1000)
+        self.path.write_bytes(self.data)
+        self.bf = BinFile(self.path)
+        self.bf.open()
+
+    def tearDown(self):
+        self.bf.close()
+        self.tmp.cleanup()
+
+    def test_unaligned_start(self):
+        start = ALLOCATIONGRANULARITY + 123
+        with self.bf.mmap(start, 1000) as mm:
+            self.assertEqual(mm._delta, 123)
+            self.assertEqual(bytes(mm.read_all()),
+                             self.data[start:start+1000])
+            self.assertEqual(bytes(mm.read_one(10)),
+                             self.data[start+10:start+11])
+
+    def test_region_past_eof(self):
+        start = len(self.data) - 100
+        with self.bf.mmap(start, 1000) as mm:
+            self.assertEqual(bytes(mm.read_all()), self.data[start:])
+            self.assertEqual(bytes(mm.read_one(99)), self.data[-1:])
+            self.assertEqual(bytes(mm.read_one(100)), b'')
+            self.assertIsNone(mm.read_one(1000))
+
+    def test_unit(self):
+        with self.bf.mmap(3, 10, unit=SECTOR) as mm:
+            self.assertEqual(bytes(mm.read_one(0)),
+                             self.data[3*SECTOR:4*SECTOR])
+            self.assertEqual(bytes(mm.read_one(9)),
+                             self.data[12*SECTOR:13*SECTOR])
+            self.assertEqual(len(mm.read_all()), 10 * SECTOR)
+        # last sector of the file is incomplete
+        last = len(self.data) // SECTOR
+        with self.bf.mmap(last, 2, unit=SECTOR) as mm:
+            self.assertEqual(bytes(mm.read_one(0)),
+                             self.data[last*SECTOR:])
+            self.assertEqual(bytes(mm.read_one(1)), b'')
+
+    def test_runs(self):
+        self.assertEqual(MemoryMap.runs([]), [])
+        self.assertEqual(MemoryMap.runs([5, 1, 2, 3, 3, 9]),
+                         [(1, 3), (5, 5), (9, 9)])
+        self.assertEqual(MemoryMap.runs([5, 1, 2, 3, 9], gap=1),
+                         [(1, 5), (9, 9)])
+        self.assertEqual(MemoryMap.runs([9, 1], gap=7), [(1, 9)])
+
+    def test_prefetch_bounds(self):
+        with self.bf.mmap(ALLOCATIONGRANULARITY + 1, 8, unit=SECTOR) as mm:
+            mm.prefetch(0, 7)
+            # past the end of the map and of the file
+            mm.prefetch(7, 1000)
+            mm.prefetch(1000, 2000)
+            mm.prefetch(5, 2)
+        with self.bf.mmap(len(self.data), 8) as mm:
+            mm.prefetch(0, 7)
+
+    def test_read_many_order(self):
+        indices = [7, 2, 200, 3, 2, 0]
+        with self.bf.mmap(1, 256, unit=SECTOR) as mm:
+            units = [bytes(unit) for unit in mm.read_many(indices, gap=4)]
+        self.assertEqual(units, [self.data[(1+i)*SECTOR:(2+i)*SECTOR]
+                                 for i in indices])
+
+    def test_empty_map(self):
+        for (start, size) in ((0, 0), (len(self.data) + 10, 16)):
+            with self.bf.mmap(start, size) as mm:
+                self.assertIsNone(mm._mm)
+                self.assertEqual(bytes(mm.read_all()), b'')
+                self.assertEqual(len(mm.read_array('I')), 0)
+                self.assertEqual(list(mm.read_many([])), [])
+                mm.prefetch(0, 15)
+
+    def test_close_with_live_slices(self):
+        mm = self.bf.mmap(0, 2, unit=SECTOR)
+        unit = mm.read_one(1)
+        mm.close()
+        self.assertIsNone(mm._mm)
+        self.assertEqual(bytes(mm.read_all()), b'')
+        # mapping is kept alive by the slice
+        self.assertEqual(bytes(unit), self.data[SECTOR:2*SECTOR])
+        unit.release()
+        mm.close()
+
+    def test_read_array(self):
+        with self.bf.mmap(4, 4 * 10 + 3) as mm:
+            items = mm.read_array('I')
+            self.assertEqual(len(items), 10)
+            self.assertEqual(items[9], unpack_from('I', self.data, 40)[0])
+            items.release()
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_read_ndarray(self):
+        with self.bf.mmap(4, 4 * 10 + 3) as mm:
+            array = mm.read_ndarray('<u4')
+            self.assertEqual(len(array), 10)
+            self.assertEqual(int(array[9]),
+                             unpack_from('<I', self.data, 40)[0])
+            self.assertFalse(array.flags.writeable)
+            del array
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_mysql_connector.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import environ
+from time import time
+from asyncio import run
+from unittest import TestCase, skipUnless, main
+from munch import Munch
+from core.db.query import DBQuery
+from core.db.object import DBObject
+try:
+    import pymysql
+    from plugins.connectors.mysql_connector import MySQLConnector
+except ImportError:
+    pymysql = None
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+# name of a database the tests may create tables in, connection parameters
+# are read from MySQL client environment variables, e.g.:
+#   MYSQL_HOST=localhost MYSQL_USER=datashark MYSQL_PWD=datashark \
+#   DATASHARK_TEST_MYSQL=datashark_test python -m pytest tests
+DATABASE = environ.get('DATASHARK_TEST_MYSQL')
+# persisted rows per second expected from a multi-worker run
+MIN_THROUGHPUT = 20000
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Record(DBObject):
+    '''Object using every DBObject data type and an indexed string field
+    '''
+    INDEX = 'datashark_test_record'
+    FIELDS = [
+        ('ident', DBObject.DataType.STRING),
+        ('name', DBObject.DataType.STRING),
+        ('label', DBObject.DataType.STRING),
+        ('count', DBObject.DataType.INT),
+        ('flag', DBObject.DataType.BOOL),
+        ('ratio', DBObject.DataType.FLOAT),
+        ('data', DBObject.DataType.BYTES)
+    ]
+    PRIMARY = 'ident'
+    INDEXES = ['name', 'count']
+
+    def __init__(self, ident, count, flag=False, ratio=None, data=None,
+                 label=None):
+        super().__init__()
+        self.ident = ident
+        self.count = count
+        self.flag = flag
+        self.ratio = ratio
+        self.data = data
+        self.label = label
+
+    def _source(self):
+        return {'ident': self.ident,
+                'name': 'name-{}'.format(self.ident),
+                'label': self.label,
+                'count': self.count,
+                'flag': self.flag,
+                'ratio': self.ratio,
+                'data': self.data}
+
+
+@skipUnless(DATABASE and pymysql, "DATASHARK_TEST_MYSQL is not set or "
+                                  "aiomysql/pymysql are missing")
+class TestMySQLConnector(TestCase):
+    '''MySQLConnector against a live server
+    '''
+    def setUp(self):
+        self.conf = Munch(host=environ.get('MYSQL_HOST', 'localhost'),
+                          port=int(environ.get('MYSQL_TCP_PORT', 3306)),
+                          database=DATABASE,
+                          user=environ.get('MYSQL_USER'),
+                          password=environ.get('MYSQL_PWD', ''),
+                          max_size=1)
+        self._query("DROP TABLE IF EXISTS {};".format(Record.INDEX))
+
+    def tearDown(self):
+        self._query("DROP TABLE IF EXISTS {};".format(Record.INDEX))
+
+    def _query(self, query, params=()):
+        conn = pymysql.connect(host=self.conf.host,
+                               port=self.conf.port,
+                               user=self.conf.user,
+                               password=self.conf.password,
+                               database=DATABASE,
+                               autocommit=True)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def _run(self, coroutine):
+        async def scenario():
+            connector = MySQLConnector(self.conf, False)
+            self.assertTrue(await connector.connect())
+            try:
+                return await coroutine(connector)
+            finally:
+                await connector.disconnect()
+        return run(scenario())
+
+    def test_persist_and_retrieve(self):
+        async def scenario(connector):
+            records = [Record('r{}'.format(k), k, k % 2 == 0, k / 4,
+                              bytes([k]) * 3, 'x' * 1000)
+                       for k in range(10)]
+            self.assertTrue(await connector.persist([r.to_db()
+                                                     for r in records]))
+            return (await connector.retrieve(DBQuery(Record)
+                                             .order_by('count')),
+                    await connector.retrieve(DBQuery(Record)
+                                             .where_in('ident', ['r1', 'r7'])
+                                             .select('count')
+                                             .order_by('count')),
+                    await connector.retrieve(DBQuery(Record)
+                                             .where(name='name-r4')
+                                             .select('ident')))
+
+        (rows, selected, named) = self._run(scenario)
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[5]['ident'], 'r5')
+        self.assertEqual(rows[5]['count'], 5)
+        self.assertFalse(rows[5]['flag'])
+        self.assertTrue(rows[4]['flag'])
+        self.assertEqual(rows[5]['ratio'], 1.25)
+        self.assertEqual(bytes(rows[5]['data']), b'\x05\x05\x05')
+        self.assertEqual(rows[5]['label'], 'x' * 1000)
+        self.assertEqual(selected, [{'count': 1}, {'count': 7}])
+        self.assertEqual(named, [{'ident': 'r4'}])
+
+        # indexed strings are stored as VARCHAR, others as TEXT
+        types = dict(self._query("SELECT column_name, data_type FROM "
+                                 "information_schema.columns WHERE "
+                                 "table_schema = %s AND table_name = %s;",
+                                 (DATABASE, Record.INDEX)))
+        types = {name.lower(): value.lower()
+                 for (name, value) in types.items()}
+        self.assertEqual(types['ident'], 'varchar')
+        self.assertEqual(types['name'], 'varchar')
+        self.assertEqual(types['label'], 'text')
+
+    def test_upsert(self):
+        async def scenario(connector):
+            await connector.persist([Record('a', 1).to_db(),
+                                     Record('b', 2).to_db()])
+            # same primary key twice in a batch: last version wins
+            await connector.persist([Record('a', 10, True).to_db(),
+                                     Record('a', 11, None, 0.5).to_db(),
+                                     Record('c', 3).to_db()])
+            return await connector.retrieve(DBQuery(Record).order_by('ident'))
+
+        rows = self._run(scenario)
+        self.assertEqual([(row['ident'], row['count']) for row in rows],
+                         [('a', 11), ('b', 2), ('c', 3)])
+        self.assertIsNone(rows[0]['flag'])
+        self.assertEqual(rows[0]['ratio'], 0.5)
+
+    def test_iterate_early_exit(self):
+        async def scenario(connector):
+            await connector.persist([Record('r{:05}'.format(k), k).to_db()
+                                     for k in range(5000)])
+            rows = connector.iterate(DBQuery(Record).order_by('count'))
+            async for row in rows:
+                first = row
+                break
+            await rows.aclose()
+            # single pooled connection: it must be usable again
+            return (first,
+                    await connector.retrieve(DBQuery(Record)
+                                             .where(ident='r04999')
+                                             .select('count')))
+
+        (first, last) = self._run(scenario)
+        self.assertEqual(first['ident'], 'r00000')
+        self.assertEqual(last, [{'count': 4999}])
+
+    def test_retrieve_missing_table(self):
+        async def scenario(connector):
+            return (await connector.retrieve(DBQuery(Record).where(ident='a')),
+                    [row async for row in connector.iterate(DBQuery(Record))])
+
+        self.assertEqual(self._run(scenario), ([], []))
+
+    def test_throughput(self):
+        async def scenario(connector):
+            batches = [[Record('r{}-{}'.format(b, k), k).to_db()
+                        for k in range(1000)] for b in range(50)]
+            start = time()
+            for batch in batches:
+                await connector.persist(batch)
+            return 50000 / (time() - start)
+
+        self.assertGreaterEqual(self._run(scenario), MIN_THROUGHPUT)
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
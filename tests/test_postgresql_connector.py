@@ -0,0 +1,209 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_postgresql_connector.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import environ
+from asyncio import run
+from unittest import TestCase, skipUnless, main
+from munch import Munch
+from core.db.query import DBQuery
+from core.db.object import DBObject
+try:
+    import psycopg2
+    from plugins.connectors.postgresql_connector import PostgreSQLConnector
+except ImportError:
+    psycopg2 = None
+# =============================================================================
+#  GLOBALS
+# =============================================================================
+# name of a database the tests may create tables in, connection parameters
+# are read from libpq environment variables, e.g.:
+#   PGHOST=localhost PGUSER=datashark PGPASSWORD=datashark \
+#   DATASHARK_TEST_POSTGRESQL=datashark_test python -m pytest tests
+DATABASE = environ.get('DATASHARK_TEST_POSTGRESQL')
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class Record(DBObject):
+    '''Object using every DBObject data type
+    '''
+    INDEX = 'datashark_test_record'
+    FIELDS = [
+        ('key', DBObject.DataType.STRING),
+        ('count', DBObject.DataType.INT),
+        ('flag', DBObject.DataType.BOOL),
+        ('ratio', DBObject.DataType.FLOAT),
+        ('data', DBObject.DataType.BYTES)
+    ]
+    PRIMARY = 'key'
+    INDEXES = ['count']
+
+    def __init__(self, key, count, flag=False, ratio=None, data=None):
+        super().__init__()
+        self.key = key
+        self.count = count
+        self.flag = flag
+        self.ratio = ratio
+        self.data = data
+
+    def _source(self):
+        return {'key': self.key,
+                'count': self.count,
+                'flag': self.flag,
+                'ratio': self.ratio,
+                'data': self.data}
+
+
+@skipUnless(DATABASE and psycopg2, "DATASHARK_TEST_POSTGRESQL is not set or "
+                                   "psycopg2/aiopg are missing")
+class TestPostgreSQLConnector(TestCase):
+    '''PostgreSQLConnector against a live server
+    '''
+    def setUp(self):
+        self.conf = Munch(host=environ.get('PGHOST', 'localhost'),
+                          port=int(environ.get('PGPORT', 5432)),
+                          database=DATABASE,
+                          user=environ.get('PGUSER'),
+                          password=environ.get('PGPASSWORD'),
+                          max_size=2)
+        self._drop()
+
+    def tearDown(self):
+        self._drop()
+
+    def _drop(self):
+        kwargs = {key: value for (key, value) in self.conf.items()
+                  if key in ('host', 'port', 'user', 'password')}
+        with psycopg2.connect(dbname=DATABASE, **kwargs) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DROP TABLE IF EXISTS "
+                               "{};".format(Record.INDEX))
+        conn.close()
+
+    def _run(self, coroutine):
+        async def scenario():
+            connector = PostgreSQLConnector(self.conf, False)
+            self.assertTrue(await connector.connect())
+            try:
+                return await coroutine(connector)
+            finally:
+                await connector.disconnect()
+        return run(scenario())
+
+    def test_persist_and_retrieve(self):
+        async def scenario(connector):
+            records = [Record('r{}'.format(k), k, k % 2 == 0, k / 4,
+                              bytes([k]) * 3) for k in range(10)]
+            self.assertTrue(await connector.persist([r.to_db()
+                                                     for r in records]))
+            return (await connector.retrieve(DBQuery(Record)
+                                             .order_by('count')),
+                    await connector.retrieve(DBQuery(Record)
+                                             .where_in('key', ['r1', 'r7'])
+                                             .select('count')
+                                             .order_by('count')),
+                    await connector.retrieve(DBQuery(Record)
+                                             .where_range('count', 3, 6)
+                                             .select('key')
+                                             .order_by('key')))
+
+        (rows, selected, ranged) = self._run(scenario)
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[5]['key'], 'r5')
+        self.assertEqual(rows[5]['count'], 5)
+        self.assertFalse(rows[5]['flag'])
+        self.assertEqual(rows[5]['ratio'], 1.25)
+        self.assertEqual(bytes(rows[5]['data']), b'\x05\x05\x05')
+        self.assertEqual(selected, [{'count': 1}, {'count': 7}])
+        self.assertEqual(ranged, [{'key': 'r3'}, {'key': 'r4'},
+                                  {'key': 'r5'}])
+
+    def test_upsert(self):
+        async def scenario(connector):
+            await connector.persist([Record('a', 1).to_db(),
+                                     Record('b', 2).to_db()])
+            # same primary key twice in a batch: last version wins
+            await connector.persist([Record('a', 10, True).to_db(),
+                                     Record('a', 11, None, 0.5).to_db(),
+                                     Record('c', 3).to_db()])
+            return await connector.retrieve(DBQuery(Record).order_by('key'))
+
+        rows = self._run(scenario)
+        self.assertEqual([(row['key'], row['count']) for row in rows],
+                         [('a', 11), ('b', 2), ('c', 3)])
+        self.assertIsNone(rows[0]['flag'])
+        self.assertEqual(rows[0]['ratio'], 0.5)
+
+    def test_iterate_early_exit(self):
+        async def scenario(connector):
+            await connector.persist([Record('r{:05}'.format(k), k).to_db()
+                                     for k in range(5000)])
+            rows = connector.iterate(DBQuery(Record).order_by('count'))
+            async for row in rows:
+                first = row
+                break
+            await rows.aclose()
+            # single pooled query connection: it must be usable again
+            return (first,
+                    await connector.retrieve(DBQuery(Record)
+                                             .select('key')
+                                             .order_by('count')))
+
+        (first, rows) = self._run(scenario)
+        self.assertEqual(first['key'], 'r00000')
+        # unbounded results are streamed
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual(rows[-1], {'key': 'r04999'})
+
+    def test_retrieve_many(self):
+        async def scenario(connector):
+            await connector.persist([Record('r{}'.format(k), k).to_db()
+                                     for k in range(100)])
+            queries = [DBQuery(Record).where(key='r{}'.format(k))
+                                      .select('count').limit(1)
+                       for k in range(0, 200, 10)]
+            return await connector.retrieve_many(queries)
+
+        # several query connections
+        self.conf.max_size = 5
+        results = self._run(scenario)
+        self.assertEqual(results[:10], [[{'count': k}]
+                                        for k in range(0, 100, 10)])
+        self.assertEqual(results[10:], [[]] * 10)
+
+    def test_retrieve_missing_table(self):
+        async def scenario(connector):
+            return (await connector.retrieve(DBQuery(Record).where(key='a')),
+                    await connector.retrieve(DBQuery(Record).where(key='a')
+                                                            .limit(1)),
+                    await connector.retrieve_many([DBQuery(Record)]))
+
+        self.assertEqual(self._run(scenario), ([], [], [[]]))
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()
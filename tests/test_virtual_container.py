@@ -0,0 +1,102 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#     file: test_virtual_container.py
+#     date: 2026-10-18
+#   author: koromodako
+#  purpose:
+#
+#  license:
+#    Datashark Forensic framework to process data containers.
+#    Copyright (C) 2018 koromodako
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# =============================================================================
+#  IMPORTS
+# =============================================================================
+from os import urandom
+from pickle import dumps, loads
+from pathlib import Path
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from helper import bin_file
+from helper.crypto import Crypto
+from core.container.container import Container
+from core.container.virtual_container import VirtualContainer
+# =============================================================================
+#  CLASSES
+# =============================================================================
+class TestVirtualContainer(TestCase):
+    '''Virtual containers read their parent through a shared file
+    '''
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        path = Path(self.tmp.name) / 'image.bin'
+        self.data = urandom(64 * 1024)
+        path.write_bytes(self.data)
+        self.image = Container(name=path.name, path=path, original_path=path)
+        bin_file._reset_shared()
+
+    def tearDown(self):
+        for bf in bin_file.SHARED.values():
+            bf.users = None
+            bf.close()
+        bin_file._reset_shared()
+        self.tmp.cleanup()
+
+    def test_children_share_parent_file(self):
+        children = [VirtualContainer('part{}'.format(k), self.image,
+                                     extents=[(k * 4096, 4096),
+                                              (None, 16)])
+                    for k in range(8)]
+        files = [child.bin_file() for child in children]
+        for bf in files:
+            self.assertTrue(bf.open())
+
+        self.assertEqual(len(bin_file.SHARED), 1)
+        shared = next(iter(bin_file.SHARED.values()))
+        self.assertEqual(shared.users, len(files))
+        for (k, bf) in enumerate(files):
+            self.assertEqual(bf.read(4096 + 16, 0),
+                             self.data[k*4096:(k+1)*4096] + bytes(16))
+
+        for bf in files:
+            bf.close()
+        self.assertEqual(shared.users, 0)
+        self.assertTrue(shared.is_valid())
+
+    def test_nested_child(self):
+        child = VirtualContainer('part', self.image,
+                                 extents=[(1024, 8192)])
+        grandchild = VirtualContainer('sub', child, extents=[(100, 200)])
+
+        self.assertEqual(Crypto.hash('SHA-256', grandchild),
+                         sha256(self.data[1124:1324]).hexdigest())
+        # survives being sent to another process
+        grandchild = loads(dumps(grandchild))
+        with grandchild.bin_file() as bf:
+            self.assertEqual(bf.read(), self.data[1124:1324])
+
+        self.assertEqual(len(bin_file.SHARED), 1)
+
+    def test_missing_parent(self):
+        self.image.path.unlink()
+        child = VirtualContainer('part', self.image, extents=[(0, 16)])
+        self.assertFalse(child.bin_file().open())
+# =============================================================================
+#  SCRIPT
+# =============================================================================
+if __name__ == '__main__':
+    main()